@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+'''Script for benchmarking the simulators.
+
+"run" runs every shipped machine on inputs of growing size, on the deterministic and on the nondeterministic
+simulator, and on the engine generated for it (see turing.jit) with the deterministic sizes, and appends the results to
+the history. The machines in PARALLEL are also run on the parallel nondeterministic simulator (see turing.parallel),
+with a process for every core, and its speedup over the serial simulator is printed. Every benchmark runs in a fresh
+process, which records the number of steps, the steps per second (the best of REPEATS runs), its peak memory and the
+time to parse the machine (from the text and from the cache). The start-up time of runtm is measured once per machine and simulator.
+
+"compare" compares two runs from the history (by default the last two), and fails if the throughput of any benchmark
+dropped by more than the threshold.
+'''
+
+
+import argparse
+import concurrent.futures
+import datetime
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+SRC_DIR = "."
+HISTORY = os.path.join("benchmarks", "history.json")
+RUNTM = os.path.join(SRC_DIR, "runtm.py")
+
+# the number of times each benchmark is run, of which the fastest counts
+REPEATS = 3
+# the default relative drop in steps per second at which compare fails
+THRESHOLD = 0.1
+
+# the simulator is imported from the source directory, also when this is run as a script
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+
+def paren(n: int) -> str:
+    return "(" * (n // 2) + ")" * (n // 2)
+
+
+def binadd(n: int) -> str:
+    # 1^a + 1^a = 0 1^a, least significant bit first
+    a = max((n - 3) // 3, 1)
+    return "1" * a + "#" + "1" * a + "#" + "0" + "1" * a
+
+
+def binaryunary(n: int) -> str:
+    return "1" * n
+
+
+def subword(n: int) -> str:
+    # the second word is a subword of the first
+    return "01" * (n // 3) + "#" + "01" * (n // 6)
+
+
+def repeat(n: int) -> str:
+    return "0110" * (n // 8) * 2
+
+
+def subsequence(n: int) -> str:
+    # every letter may be kept, so the frontier doubles with every cell
+    return "01" * (n // 2)
+
+
+# the words and the input sizes for the deterministic and nondeterministic simulator of every machine
+MACHINES = {
+    "paren.tm": (paren, [2000, 8000, 16000], [200, 400]),
+    "binadd.tm": (binadd, [1200, 4800, 9600], [60, 120]),
+    "binaryunary.tm": (binaryunary, [10, 12, 14], [7, 8]),
+    "subword.tm": (subword, [2400, 9600, 19200], [120, 240]),
+    "subword_fast.tm": (subword, [2400, 9600, 19200], [120, 240]),
+    "subword_2tape.tm": (subword, [2400, 9600, 19200], [120, 240]),
+    "repeat.tm": (repeat, [], [64, 128]),
+    "subsequence.tm": (subsequence, [], [14, 16, 18])
+}
+# the machines that generated engines do not run, as they have more than one tape
+MULTITAPE = {"subword_2tape.tm"}
+# the machines that are also run on the parallel simulator, with their nondeterministic sizes
+PARALLEL = {"subsequence.tm"}
+# the number of processes of the parallel simulator
+PROCESSES = max(os.cpu_count() or 1, 2)
+
+
+def find_benchmarks() -> list:
+    benchmarks = []
+    for tm_file, (word, deterministic_sizes, nondeterministic_sizes) in MACHINES.items():
+        jit_sizes = deterministic_sizes if tm_file not in MULTITAPE else []
+        parallel_sizes = nondeterministic_sizes if tm_file in PARALLEL else []
+        for simulator, sizes in (("dtm", deterministic_sizes), ("ntm", nondeterministic_sizes), ("jit", jit_sizes),
+                                 ("parallel", parallel_sizes)):
+            for n in sizes:
+                benchmarks.append((tm_file, simulator, n))
+    return benchmarks
+
+
+def benchmark_name(tm_file: str, simulator: str, n: int) -> str:
+    return "{} {} n={}".format(tm_file, simulator, n)
+
+
+def measure(benchmark: tuple) -> dict:
+    '''Run a benchmark, in a fresh process.
+
+    Arguments:
+        benchmark {tuple} -- the machine file, the simulator ("dtm", "ntm", "jit" or "parallel") and the input size
+
+    Returns:
+        dict -- the measurements
+    '''
+
+    from turing.parsing import parse_machine
+
+    tm_file, simulator, n = benchmark
+    deterministic = simulator in ("dtm", "jit")
+    options = {"processes": PROCESSES} if simulator == "parallel" else {}
+    start = time.perf_counter()
+    parse_machine(os.path.join(SRC_DIR, tm_file),
+                  deterministic=deterministic, use_cache=False)
+    parse_time = time.perf_counter() - start
+    # the first call compiles the machine into the cache if needed
+    parse_machine(os.path.join(SRC_DIR, tm_file), deterministic=deterministic)
+    start = time.perf_counter()
+    machine = parse_machine(os.path.join(
+        SRC_DIR, tm_file), deterministic=deterministic, jit=simulator == "jit", **options)
+    load_time = time.perf_counter() - start
+
+    word = list(MACHINES[tm_file][0](n))
+    # the first run generates the engine into the cache if needed
+    if simulator == "jit":
+        machine.process_input(word)
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = machine.process_input(word)
+        times.append(time.perf_counter() - start)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "num_steps": result.num_steps,
+        "accepted": result.accepted,
+        "time": min(times),
+        # the steps of the nondeterministic simulator are levels of the search
+        "steps_per_second": result.num_steps / min(times) if min(times) > 0 else math.inf,
+        # kilobytes on Linux, bytes on macOS
+        "peak_rss": peak_rss * (1 if sys.platform == "darwin" else 1024),
+        "parse_time": parse_time,
+        "load_time": load_time,
+        "processes": options.get("processes", 1)
+    }
+
+
+def measure_startup(tm_file: str, simulator: str) -> float:
+    '''Measure the time runtm takes for the empty tape, which is mostly start-up.
+    '''
+
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        flags = {"dtm": [], "ntm": ["-n"], "jit": ["-J"],
+                 "parallel": ["-n", "-p", str(PROCESSES)]}[simulator]
+        subprocess.run([sys.executable, RUNTM] + flags + [os.path.join(SRC_DIR, tm_file)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              cwd=SRC_DIR, check=True).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(filename: str) -> list:
+    if not os.path.exists(filename):
+        return []
+    with open(filename) as f:
+        return json.load(f)
+
+
+def run(args: argparse.Namespace):
+    benchmarks = [benchmark for benchmark in find_benchmarks()
+                  if args.machine is None or benchmark[0] in args.machine]
+    results = dict()
+    # a new process for every benchmark, so that the peak memory is its own; not a pool, whose daemonic workers cannot
+    # start the processes of the parallel simulator
+    for benchmark in benchmarks:
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            result = executor.submit(measure, benchmark).result()
+            name = benchmark_name(*benchmark)
+            results[name] = result
+            print("  {:32s} {:>12d} steps {:10.4f} s {:14.0f} steps/s {:8.1f} MB".format(
+                name, result["num_steps"], result["time"], result["steps_per_second"], result["peak_rss"] / 2 ** 20))
+    for name, result in results.items():
+        tm_file, simulator, n = name.split()
+        serial = results.get(" ".join((tm_file, "ntm", n)))
+        if simulator == "parallel" and serial is not None and result["time"] > 0:
+            print("  {:32s} {:8.2f}x the serial simulator with {} processes".format(
+                name, serial["time"] / result["time"], result["processes"]))
+    startup = dict()
+    for tm_file, simulator in sorted({benchmark[:2] for benchmark in benchmarks}):
+        name = "{} {}".format(tm_file, simulator)
+        startup[name] = measure_startup(tm_file, simulator)
+        print("  {:32s} {:8.1f} ms start-up".format(
+            name, startup[name] * 1e3))
+
+    history = load_history(args.history)
+    history.append({
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+        "startup": startup
+    })
+    with open(args.history, "w") as f:
+        json.dump(history, f, indent=4)
+        f.write("\n")
+    print("Appended run {} to {}".format(len(history) - 1, args.history))
+
+
+def compare(args: argparse.Namespace) -> bool:
+    history = load_history(args.history)
+    if len(history) < 2:
+        # the first run of a fresh clone has nothing to be compared to
+        print("the history has {} runs, so there is nothing to compare yet".format(
+            len(history)))
+        return True
+    try:
+        old, new = history[args.old], history[args.new]
+    except IndexError:
+        print("the history has {} runs".format(len(history)))
+        return False
+    print("Comparing run {} ({}) to run {} ({})...".format(
+        args.old, old["revision"], args.new, new["revision"]))
+    regressed = []
+    for name, result in new["benchmarks"].items():
+        if name not in old["benchmarks"]:
+            continue
+        before, after = old["benchmarks"][name]["steps_per_second"], result["steps_per_second"]
+        change = after / before - 1 if before > 0 else 0
+        status = "ok"
+        if change < -args.threshold:
+            status = "\033[91mREGRESSED\033[0m"
+            regressed.append(name)
+        print("  {:32s} {:14.0f} -> {:14.0f} steps/s {:+7.1%} {}".format(
+            name, before, after, change, status))
+    print()
+    print("{} benchmarks dropped by more than {:.0%}".format(
+        len(regressed), args.threshold))
+    return len(regressed) == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the simulators.")
+    parser.add_argument("--history", default=HISTORY,
+                        help="the file with the results of all runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser(
+        "run", help="run the benchmarks and add them to the history")
+    run_parser.add_argument("machine", nargs="*", default=None,
+                            help="only benchmark these machine files")
+    compare_parser = commands.add_parser(
+        "compare", help="compare two runs of the history")
+    compare_parser.add_argument("old", type=int, nargs="?", default=-2,
+                                help="the index of the old run (default: the second to last)")
+    compare_parser.add_argument("new", type=int, nargs="?", default=-1,
+                                help="the index of the new run (default: the last)")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=THRESHOLD,
+                                help="the relative drop in steps per second that fails the comparison")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if not args.machine:
+            args.machine = None
+        run(args)
+    else:
+        exit(0 if compare(args) else 1)
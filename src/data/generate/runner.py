@@ -1,39 +1,141 @@
 '''Decorator for running benchmarks on tape input generated by the underlying functions.
+
+The tapes are generated in this process, with the random module seeded for every (generator, length, trial), so every
+run generates the same tapes. The tapes are run on a pool of processes. The number of steps of every run is stored in
+a cache under the hashes of the machine file and of the tape, so that a new run (after it was interrupted, or after a
+machine changed) only runs what is not in the cache yet.
 '''
 
+import hashlib
 import itertools
+import multiprocessing
 import os
+import random
+import sqlite3
+import typing
 
 from turing.parsing import parse_machine
 
 from data import DATA_DIR
 
 NUM_ITERATIONS = 500
+CACHE_FILE = os.path.join(DATA_DIR, "cache.sqlite")
+# the number of tapes sent to a worker at once
+CHUNK_SIZE = 16
+# the number of results after which they are written to the cache
+COMMIT_INTERVAL = 1000
+
+# the machines of a worker process, by file name
+machines = dict()
+
+
+def run_tape(job: typing.Tuple[str, list]) -> int:
+    '''Run a tape in a worker process.
+
+    Arguments:
+        job {typing.Tuple[str, list]} -- the machine file and the tape
+
+    Returns:
+        int -- the number of steps
+    '''
+
+    tm_file, tape = job
+    if tm_file not in machines:
+        machines[tm_file] = parse_machine(tm_file)
+    return machines[tm_file].process_input(tape).num_steps
+
+
+def hash_tape(tape: list) -> str:
+    return hashlib.sha256("".join(tape).encode()).hexdigest()
+
+
+class ResultCache:
+    '''The number of steps of finished runs, by the hashes of the machine and the tape.
+    '''
+
+    def __init__(self, filename: str = CACHE_FILE):
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (machine TEXT, tape TEXT, num_steps INTEGER, PRIMARY KEY (machine, tape))")
+
+    def get(self, machine: str) -> typing.Dict[str, int]:
+        return dict(self.connection.execute("SELECT tape, num_steps FROM results WHERE machine = ?", (machine,)))
+
+    def put(self, machine: str, results: typing.List[typing.Tuple[str, int]]):
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                        [(machine, tape, num_steps) for tape, num_steps in results])
+
+    def close(self):
+        self.connection.close()
 
 
 def make_runner(*tm_files: str):
     '''Make the decorator.
     '''
 
-    machines = [(tm_file, parse_machine(tm_file)) for tm_file in tm_files]
-
     def decorator(trials: int, description: str, step: int = 1, iterations: int = NUM_ITERATIONS):
         def runner(func):
             if not os.path.isdir(DATA_DIR):
                 os.makedirs(DATA_DIR)
-            for tm_file, machine in machines:
-                tm = os.path.splitext(os.path.basename(tm_file))[0]
-                filename = os.path.join(
-                    DATA_DIR, "{}-{}.csv".format(os.path.basename(tm), func.__name__))
-                print("Generating {}...".format(filename))
-                with open(filename, "w", buffering=1) as f:
-                    f.write(r"# Result of running $M_\text{}$ \\ on {} \\ for {} trial{}".format(
-                        "{" + tm.replace("_", "\\_") + "}", description, trials, "" if trials == 1 else "s"))
-                    f.write("\nn,num_steps\n")
-                    for length in itertools.islice(itertools.count(step=step), iterations):
-                        for _ in range(trials):
-                            tape = func(length)
-                            f.write("{},{}\n".format(
-                                len(tape), machine.process_input(tape).num_steps))
+            tapes = []
+            for length in itertools.islice(itertools.count(step=step), iterations):
+                for trial in range(trials):
+                    random.seed("{}.{}:{}:{}".format(
+                        func.__module__, func.__name__, length, trial))
+                    tapes.append(func(length))
+            tape_hashes = [hash_tape(tape) for tape in tapes]
+            cache = ResultCache()
+            try:
+                for tm_file in tm_files:
+                    tm = os.path.splitext(os.path.basename(tm_file))[0]
+                    filename = os.path.join(
+                        DATA_DIR, "{}-{}.csv".format(os.path.basename(tm), func.__name__))
+                    with open(tm_file, "rb") as f:
+                        machine_hash = hashlib.sha256(f.read()).hexdigest()
+                    results = cache.get(machine_hash)
+                    missing = {tape_hash: tape for tape_hash, tape in zip(
+                        tape_hashes, tapes) if tape_hash not in results}
+                    print("Generating {} ({} of {} runs cached)...".format(
+                        filename, len(tapes) - len(missing), len(tapes)))
+                    run(tm_file, machine_hash, missing, results, cache)
+                    write_csv(filename, tm, description, trials, [
+                        (len(tape), results[tape_hash]) for tape, tape_hash in zip(tapes, tape_hashes)])
+            finally:
+                cache.close()
         return runner
     return decorator
+
+
+def run(tm_file: str, machine_hash: str, tapes: typing.Dict[str, list], results: typing.Dict[str, int], cache: ResultCache):
+    '''Run the tapes (by their hashes) on a pool of processes, adding the number of steps to results and the cache.
+    '''
+
+    if len(tapes) == 0:
+        return
+    finished = []
+    # forked, as the generators run when their module is imported
+    with multiprocessing.get_context("fork").Pool() as pool:
+        try:
+            for tape_hash, num_steps in zip(tapes, pool.imap(run_tape, [(tm_file, tape) for tape in tapes.values()], CHUNK_SIZE)):
+                results[tape_hash] = num_steps
+                finished.append((tape_hash, num_steps))
+                if len(finished) == COMMIT_INTERVAL:
+                    cache.put(machine_hash, finished)
+                    finished = []
+        finally:
+            # keep what is finished if the run is interrupted
+            cache.put(machine_hash, finished)
+
+
+def write_csv(filename: str, tm: str, description: str, trials: int, rows: typing.List[typing.Tuple[int, int]]):
+    '''Write the results of a benchmark, replacing the file only once it is complete.
+    '''
+
+    with open(filename + ".tmp", "w") as f:
+        f.write(r"# Result of running $M_\text{}$ \\ on {} \\ for {} trial{}".format(
+            "{" + tm.replace("_", "\\_") + "}", description, trials, "" if trials == 1 else "s"))
+        f.write("\nn,num_steps\n")
+        for length, num_steps in rows:
+            f.write("{},{}\n".format(length, num_steps))
+    os.replace(filename + ".tmp", filename)
@@ -1,12 +1,45 @@
 #!/usr/bin/env python3
 
 '''Main program entry.
+
+The exit code is 0 if the machine accepted, 1 if it did not, 2 on execution errors, 3 on input errors and 4 if the run
+was stopped before the machine halted (see the -m, -w and -l flags).
+
+With -j, the tapes are read from standard input as JSON jobs, and the results are written to standard output (see
+turing.batch). With -d SOCKET, a server that runs jobs on any machine listens on the Unix socket.
+
+With -O, the machine is optimized first (see turing.optimizer), which does not change the steps or the result of a run.
+With -J, a deterministic machine is run by an engine generated for it (see turing.jit), which takes the same steps.
+
+With -P, a nondeterministic machine records its branches, and if it accepts, its output tape is the tape of the
+accepting branch, whose choices of transition (counting from 0, in the order of the machine file) are printed to
+standard error. With -V, the breadth-first search of a nondeterministic machine steps wide levels as arrays (see
+NondeterministicTuringMachine.search_vectorized).
+
+With -r, the run is profiled and a report is printed to standard error; with -R FILE, the profile is written to the
+file as JSON (see turing.profiling). With -T FILE, the run of a deterministic machine is recorded in the file (see
+turing.trace).
+
+With -v, every configuration is printed. -W CELLS only shows the cells within that distance of the head, -k K only every
+k-th step (or level of the search), -S only the steps that change the state, and -F N only the first N configurations of
+each level; each of them implies -v (see turing.rendering).
 '''
 
+import mmap
 import sys
 import typing
 from turing.parsing import parse_machine
 from turing.error import ExecutionError
+from turing.lazy import LazyModule
+from turing.machine import exit_code
+from turing.rendering import Renderer
+import turing.tapes as tapes
+
+# only loaded by the runs that need them, to keep the start-up short
+json = LazyModule("json")
+signal = LazyModule("signal")
+batch = LazyModule("turing.batch")
+profiling = LazyModule("turing.profiling")
 
 
 def fail(code: int, message: str, error: typing.Union[Exception, str]):
@@ -23,47 +56,193 @@ def fail(code: int, message: str, error: typing.Union[Exception, str]):
     exit(code)
 
 
-def read_input_word(filename: str) -> list:
+def read_input_word(filename: str) -> typing.Union[mmap.mmap, bytes]:
     '''Reads the input word from a file.
 
     Arguments:
         filename {str} -- the name of the file
 
     Returns:
-        list -- the tape input
+        typing.Union[mmap.mmap, bytes] -- the contents of the file, mapped into memory (see turing.tapes)
     '''
 
     try:
-        with open(filename) as f:
-            return list(f.read().replace("\n", "").replace(" ", ""))
+        return tapes.open_tape(filename)
     except IOError as e:
         fail(3, "tape could not be opened", e)
 
 
+def write_profile(filename: str, summary: dict):
+    '''Writes a profile summary to a JSON file.
+    '''
+
+    try:
+        with open(filename, "w") as f:
+            json.dump(summary, f, indent=4)
+            f.write("\n")
+    except IOError as e:
+        fail(3, "profile could not be written", e)
+
+
 if __name__ == "__main__":
     args = sys.argv[1::]
 
-    # determine if -v and -n flags are set
-    verbose, deterministic = False, True
-    while len(args) > 0 and args[0] in ("-n", "-v"):
+    # determine if -v, -W, -k, -S, -F, -n, -t, -c, -p, -s, -m, -w, -l, -b, -O, -J, -P, -V, -j, -d, -r, -R and -T flags are set
+    verbose, deterministic, jobs, server, options = False, True, False, None, dict()
+    report, profile_file, trace_file, render_options = False, None, None, dict()
+    while len(args) > 0 and args[0] in ("-n", "-v", "-W", "-k", "-S", "-F", "-t", "-c", "-p", "-s", "-m", "-w", "-l", "-b", "-O", "-J", "-P", "-V", "-j", "-d", "-r", "-R", "-T"):
         if args[0] == "-n":
             deterministic = False
         if args[0] == "-v":
             verbose = True
+        if args[0] == "-W":
+            if len(args) < 2 or not args[1].isdigit():
+                fail(3, "input error", "-W requires a number of cells")
+            verbose, render_options["window"] = True, int(args[1])
+            args = args[1:]
+        if args[0] == "-k":
+            if len(args) < 2 or not args[1].isdigit() or int(args[1]) < 1:
+                fail(3, "input error", "-k requires a number of steps")
+            verbose, render_options["every"] = True, int(args[1])
+            args = args[1:]
+        if args[0] == "-S":
+            verbose, render_options["state_changes"] = True, True
+        if args[0] == "-F":
+            if len(args) < 2 or not args[1].isdigit():
+                fail(3, "input error", "-F requires a number of configurations")
+            verbose, render_options["max_configurations"] = True, int(args[1])
+            args = args[1:]
+        if args[0] == "-t":
+            options["two_way"] = True
+        if args[0] == "-c":
+            options["remember_visited"] = True
+        if args[0] == "-p":
+            if len(args) < 2 or not args[1].isdigit() or int(args[1]) < 1:
+                fail(3, "input error", "-p requires a number of processes")
+            options["processes"] = int(args[1])
+            args = args[1:]
+        if args[0] == "-s":
+            if len(args) < 2:
+                fail(3, "input error", "-s requires a search strategy")
+            options["strategy"] = args[1]
+            args = args[1:]
+        if args[0] == "-m":
+            if len(args) < 2 or not args[1].isdigit():
+                fail(3, "input error", "-m requires a number of steps")
+            options["max_steps"] = int(args[1])
+            args = args[1:]
+        if args[0] == "-w":
+            try:
+                options["timeout"] = float(args[1])
+            except (IndexError, ValueError):
+                fail(3, "input error", "-w requires a number of seconds")
+            args = args[1:]
+        if args[0] == "-l":
+            options["detect_loops"] = True
+        if args[0] == "-b":
+            if len(args) < 2 or not args[1].isdigit():
+                fail(3, "input error", "-b requires a block size")
+            options["block_size"] = int(args[1])
+            args = args[1:]
+        if args[0] == "-O":
+            options["optimize"] = True
+        if args[0] == "-J":
+            options["jit"] = True
+        if args[0] == "-P":
+            options["witness"] = True
+        if args[0] == "-V":
+            options["vectorized"] = True
+        if args[0] == "-j":
+            jobs = True
+        if args[0] == "-d":
+            if len(args) < 2:
+                fail(3, "input error", "-d requires a socket path")
+            server = args[1]
+            args = args[1:]
+        if args[0] == "-r":
+            report = True
+            options["profile"] = True
+        if args[0] == "-R":
+            if len(args) < 2:
+                fail(3, "input error", "-R requires a file name")
+            profile_file = args[1]
+            options["profile"] = True
+            args = args[1:]
+        if args[0] == "-T":
+            if len(args) < 2:
+                fail(3, "input error", "-T requires a file name")
+            trace_file = args[1]
+            args = args[1:]
         args = args[1:]
+
+    if server is not None:
+        # the jobs name their machines and options
+        try:
+            s = batch.Server(server)
+        except OSError as e:
+            fail(3, "input error", e)
+        with s:
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+            try:
+                s.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        exit(0)
+    if jobs and verbose:
+        fail(3, "input error", "-v, -W, -k, -S and -F cannot be used with -j")
+    if "every" in render_options and "state_changes" in render_options:
+        fail(3, "input error", "-k cannot be used with -S")
+    if jobs and "profile" in options:
+        fail(3, "input error", "-r and -R cannot be used with -j")
+    if trace_file is not None and (jobs or not deterministic):
+        fail(3, "input error", "-T requires a single run of a deterministic machine")
     if len(args) == 0:
         fail(3, "input error", "missing machine input")
+    for flag, option in (("-c", "remember_visited"), ("-p", "processes"), ("-s", "strategy"), ("-P", "witness"), ("-V", "vectorized")):
+        if deterministic and option in options:
+            fail(3, "input error",
+                 "{} requires a nondeterministic machine (-n)".format(flag))
+    for flag, option in (("-t", "two_way"), ("-l", "detect_loops"), ("-b", "block_size"), ("-J", "jit")):
+        if not deterministic and option in options:
+            fail(3, "input error",
+                 "{} requires a deterministic machine".format(flag))
+    if options.get("strategy") == "dfs" and "max_steps" not in options:
+        fail(3, "input error", "-s dfs requires a maximum number of steps (-m)")
 
     # parse machine file and tape word arguments
     machine_file = args[0]
-    input_word = read_input_word(args[1]) if len(args) >= 2 else []
+    input_word = read_input_word(args[1]) if len(args) >= 2 and not jobs else []
 
     # run the machine
     try:
-        machine = parse_machine(machine_file, deterministic=deterministic)
-        result = machine.process_input(input_word, verbose=verbose)
-        print(str(result))
-        exit(0 if result.accepted else 1)
+        machine = parse_machine(
+            machine_file, deterministic=deterministic, **options)
+        if jobs:
+            batch.process_stream(sys.stdin, sys.stdout, lambda job: machine)
+            exit(0)
+        if verbose:
+            verbose = Renderer(machine.description, **render_options)
+        if trace_file is None:
+            result = machine.process_input(input_word, verbose=verbose)
+        else:
+            try:
+                result = machine.process_input(
+                    input_word, verbose=verbose, trace=trace_file)
+            except OSError as e:
+                fail(3, "trace could not be written", e)
+        # the output tape is streamed, as it can be far longer than anything else
+        sys.stdout.flush()
+        result.write(sys.stdout.buffer, sys.stdout.encoding)
+        sys.stdout.buffer.flush()
+        if result.branch is not None:
+            print(" ".join(map(str, result.branch)), file=sys.stderr)
+        if result.profile is not None:
+            summary = profiling.summarize(result.profile, machine.description)
+            if report:
+                print(profiling.format_report(summary), file=sys.stderr)
+            if profile_file is not None:
+                write_profile(profile_file, summary)
+        exit(exit_code(result))
     except IOError:
         fail(3, "input error", "could not access machine description")
     except ExecutionError as e:
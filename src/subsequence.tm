@@ -0,0 +1,32 @@
+states 9
+A
+G
+L0
+L1
+L2
+L3
+L4
+Y +
+N -
+alphabet 6 0 1 X P Q Z
+A 0 G P R
+A 0 G Z R
+A 1 G Q R
+A 1 G Z R
+A _ N _ R
+G 0 G 0 R
+G 0 G X R
+G 1 G 1 R
+G 1 G X R
+G _ L0 _ L
+L0 X L0 X L
+L0 0 L1 0 L
+L1 X L1 X L
+L1 1 L2 1 L
+L2 X L2 X L
+L2 1 L3 1 L
+L3 X L3 X L
+L3 0 L4 0 L
+L4 X L4 X L
+L3 P Y P R
+L4 Z Y Z R
\ No newline at end of file
@@ -0,0 +1,67 @@
+tapes 2
+states 10
+A
+B
+V
+W
+X
+M
+K
+N
+Y +
+Z -
+alphabet 3 0 1 #
+A 0 _ B 0 # S R
+A 1 _ B 1 # S R
+A # _ B # # S R
+A _ _ B _ # S R
+B 0 _ B 0 0 R R
+B 1 _ B 1 1 R R
+B # _ V # _ R L
+V 0 0 V 0 0 R S
+V 0 1 V 0 1 R S
+V 0 # V 0 # R S
+V 1 0 V 1 0 R S
+V 1 1 V 1 1 R S
+V 1 # V 1 # R S
+V _ 0 W _ 0 L S
+V _ 1 W _ 1 L S
+V _ # W _ # L S
+W 0 0 W 0 0 L S
+W 0 1 W 0 1 L S
+W 0 # W 0 # L S
+W 1 0 W 1 0 L S
+W 1 1 W 1 1 L S
+W 1 # W 1 # L S
+W # 0 X # 0 R S
+W # 1 X # 1 R S
+W # # X # # R S
+X 0 0 X 0 0 S L
+X 0 1 X 0 1 S L
+X 1 0 X 1 0 S L
+X 1 1 X 1 1 S L
+X _ 0 X _ 0 S L
+X _ 1 X _ 1 S L
+X 0 # M 0 # S R
+X 1 # M 1 # S R
+X _ # M _ # S R
+M _ 0 Y _ 0 S S
+M _ 1 Y _ 1 S S
+M _ _ Y _ _ S S
+M 0 0 M 0 0 R R
+M 1 1 M 1 1 R R
+M 0 1 K 0 1 L L
+M 1 0 K 1 0 L L
+K 0 0 K 0 0 L L
+K 0 1 K 0 1 L L
+K 1 0 K 1 0 L L
+K 1 1 K 1 1 L L
+K # 0 N # 0 R R
+K # 1 N # 1 R R
+K # # N # # R R
+N 0 0 M 0 0 S R
+N 0 1 M 0 1 S R
+N 0 _ M 0 _ S R
+N 1 0 M 1 0 S R
+N 1 1 M 1 1 S R
+N 1 _ M 1 _ S R
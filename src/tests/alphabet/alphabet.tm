@@ -0,0 +1,1806 @@
+states 902
+A
+B0
+C0
+B1
+C1
+S1
+B2
+C2
+S2
+B3
+C3
+S3
+B4
+C4
+S4
+B5
+C5
+S5
+B6
+C6
+S6
+B7
+C7
+S7
+B8
+C8
+S8
+B9
+C9
+S9
+B10
+C10
+S10
+B11
+C11
+S11
+B12
+C12
+S12
+B13
+C13
+S13
+B14
+C14
+S14
+B15
+C15
+S15
+B16
+C16
+S16
+B17
+C17
+S17
+B18
+C18
+S18
+B19
+C19
+S19
+B20
+C20
+S20
+B21
+C21
+S21
+B22
+C22
+S22
+B23
+C23
+S23
+B24
+C24
+S24
+B25
+C25
+S25
+B26
+C26
+S26
+B27
+C27
+S27
+B28
+C28
+S28
+B29
+C29
+S29
+B30
+C30
+S30
+B31
+C31
+S31
+B32
+C32
+S32
+B33
+C33
+S33
+B34
+C34
+S34
+B35
+C35
+S35
+B36
+C36
+S36
+B37
+C37
+S37
+B38
+C38
+S38
+B39
+C39
+S39
+B40
+C40
+S40
+B41
+C41
+S41
+B42
+C42
+S42
+B43
+C43
+S43
+B44
+C44
+S44
+B45
+C45
+S45
+B46
+C46
+S46
+B47
+C47
+S47
+B48
+C48
+S48
+B49
+C49
+S49
+B50
+C50
+S50
+B51
+C51
+S51
+B52
+C52
+S52
+B53
+C53
+S53
+B54
+C54
+S54
+B55
+C55
+S55
+B56
+C56
+S56
+B57
+C57
+S57
+B58
+C58
+S58
+B59
+C59
+S59
+B60
+C60
+S60
+B61
+C61
+S61
+B62
+C62
+S62
+B63
+C63
+S63
+B64
+C64
+S64
+B65
+C65
+S65
+B66
+C66
+S66
+B67
+C67
+S67
+B68
+C68
+S68
+B69
+C69
+S69
+B70
+C70
+S70
+B71
+C71
+S71
+B72
+C72
+S72
+B73
+C73
+S73
+B74
+C74
+S74
+B75
+C75
+S75
+B76
+C76
+S76
+B77
+C77
+S77
+B78
+C78
+S78
+B79
+C79
+S79
+B80
+C80
+S80
+B81
+C81
+S81
+B82
+C82
+S82
+B83
+C83
+S83
+B84
+C84
+S84
+B85
+C85
+S85
+B86
+C86
+S86
+B87
+C87
+S87
+B88
+C88
+S88
+B89
+C89
+S89
+B90
+C90
+S90
+B91
+C91
+S91
+B92
+C92
+S92
+B93
+C93
+S93
+B94
+C94
+S94
+B95
+C95
+S95
+B96
+C96
+S96
+B97
+C97
+S97
+B98
+C98
+S98
+B99
+C99
+S99
+B100
+C100
+S100
+B101
+C101
+S101
+B102
+C102
+S102
+B103
+C103
+S103
+B104
+C104
+S104
+B105
+C105
+S105
+B106
+C106
+S106
+B107
+C107
+S107
+B108
+C108
+S108
+B109
+C109
+S109
+B110
+C110
+S110
+B111
+C111
+S111
+B112
+C112
+S112
+B113
+C113
+S113
+B114
+C114
+S114
+B115
+C115
+S115
+B116
+C116
+S116
+B117
+C117
+S117
+B118
+C118
+S118
+B119
+C119
+S119
+B120
+C120
+S120
+B121
+C121
+S121
+B122
+C122
+S122
+B123
+C123
+S123
+B124
+C124
+S124
+B125
+C125
+S125
+B126
+C126
+S126
+B127
+C127
+S127
+B128
+C128
+S128
+B129
+C129
+S129
+B130
+C130
+S130
+B131
+C131
+S131
+B132
+C132
+S132
+B133
+C133
+S133
+B134
+C134
+S134
+B135
+C135
+S135
+B136
+C136
+S136
+B137
+C137
+S137
+B138
+C138
+S138
+B139
+C139
+S139
+B140
+C140
+S140
+B141
+C141
+S141
+B142
+C142
+S142
+B143
+C143
+S143
+B144
+C144
+S144
+B145
+C145
+S145
+B146
+C146
+S146
+B147
+C147
+S147
+B148
+C148
+S148
+B149
+C149
+S149
+B150
+C150
+S150
+B151
+C151
+S151
+B152
+C152
+S152
+B153
+C153
+S153
+B154
+C154
+S154
+B155
+C155
+S155
+B156
+C156
+S156
+B157
+C157
+S157
+B158
+C158
+S158
+B159
+C159
+S159
+B160
+C160
+S160
+B161
+C161
+S161
+B162
+C162
+S162
+B163
+C163
+S163
+B164
+C164
+S164
+B165
+C165
+S165
+B166
+C166
+S166
+B167
+C167
+S167
+B168
+C168
+S168
+B169
+C169
+S169
+B170
+C170
+S170
+B171
+C171
+S171
+B172
+C172
+S172
+B173
+C173
+S173
+B174
+C174
+S174
+B175
+C175
+S175
+B176
+C176
+S176
+B177
+C177
+S177
+B178
+C178
+S178
+B179
+C179
+S179
+B180
+C180
+S180
+B181
+C181
+S181
+B182
+C182
+S182
+B183
+C183
+S183
+B184
+C184
+S184
+B185
+C185
+S185
+B186
+C186
+S186
+B187
+C187
+S187
+B188
+C188
+S188
+B189
+C189
+S189
+B190
+C190
+S190
+B191
+C191
+S191
+B192
+C192
+S192
+B193
+C193
+S193
+B194
+C194
+S194
+B195
+C195
+S195
+B196
+C196
+S196
+B197
+C197
+S197
+B198
+C198
+S198
+B199
+C199
+S199
+B200
+C200
+S200
+B201
+C201
+S201
+B202
+C202
+S202
+B203
+C203
+S203
+B204
+C204
+S204
+B205
+C205
+S205
+B206
+C206
+S206
+B207
+C207
+S207
+B208
+C208
+S208
+B209
+C209
+S209
+B210
+C210
+S210
+B211
+C211
+S211
+B212
+C212
+S212
+B213
+C213
+S213
+B214
+C214
+S214
+B215
+C215
+S215
+B216
+C216
+S216
+B217
+C217
+S217
+B218
+C218
+S218
+B219
+C219
+S219
+B220
+C220
+S220
+B221
+C221
+S221
+B222
+C222
+S222
+B223
+C223
+S223
+B224
+C224
+S224
+B225
+C225
+S225
+B226
+C226
+S226
+B227
+C227
+S227
+B228
+C228
+S228
+B229
+C229
+S229
+B230
+C230
+S230
+B231
+C231
+S231
+B232
+C232
+S232
+B233
+C233
+S233
+B234
+C234
+S234
+B235
+C235
+S235
+B236
+C236
+S236
+B237
+C237
+S237
+B238
+C238
+S238
+B239
+C239
+S239
+B240
+C240
+S240
+B241
+C241
+S241
+B242
+C242
+S242
+B243
+C243
+S243
+B244
+C244
+S244
+B245
+C245
+S245
+B246
+C246
+S246
+B247
+C247
+S247
+B248
+C248
+S248
+B249
+C249
+S249
+B250
+C250
+S250
+B251
+C251
+S251
+B252
+C252
+S252
+B253
+C253
+S253
+B254
+C254
+S254
+B255
+C255
+S255
+B256
+C256
+S256
+B257
+C257
+S257
+B258
+C258
+S258
+B259
+C259
+S259
+B260
+C260
+S260
+B261
+C261
+S261
+B262
+C262
+S262
+B263
+C263
+S263
+B264
+C264
+S264
+B265
+C265
+S265
+B266
+C266
+S266
+B267
+C267
+S267
+B268
+C268
+S268
+B269
+C269
+S269
+B270
+C270
+S270
+B271
+C271
+S271
+B272
+C272
+S272
+B273
+C273
+S273
+B274
+C274
+S274
+B275
+C275
+S275
+B276
+C276
+S276
+B277
+C277
+S277
+B278
+C278
+S278
+B279
+C279
+S279
+B280
+C280
+S280
+B281
+C281
+S281
+B282
+C282
+S282
+B283
+C283
+S283
+B284
+C284
+S284
+B285
+C285
+S285
+B286
+C286
+S286
+B287
+C287
+S287
+B288
+C288
+S288
+B289
+C289
+S289
+B290
+C290
+S290
+B291
+C291
+S291
+B292
+C292
+S292
+B293
+C293
+S293
+B294
+C294
+S294
+B295
+C295
+S295
+B296
+C296
+S296
+B297
+C297
+S297
+B298
+C298
+S298
+B299
+C299
+S299
+Y +
+N -
+alphabet 300 a X Ā ā Ă ă Ą ą Ć ć Ĉ ĉ Ċ ċ Č č Ď ď Đ đ Ē ē Ĕ ĕ Ė ė Ę ę Ě ě Ĝ ĝ Ğ ğ Ġ ġ Ģ ģ Ĥ ĥ Ħ ħ Ĩ ĩ Ī ī Ĭ ĭ Į į İ ı Ĳ ĳ Ĵ ĵ Ķ ķ ĸ Ĺ ĺ Ļ ļ Ľ ľ Ŀ ŀ Ł ł Ń ń Ņ ņ Ň ň ŉ Ŋ ŋ Ō ō Ŏ ŏ Ő ő Œ œ Ŕ ŕ Ŗ ŗ Ř ř Ś ś Ŝ ŝ Ş ş Š š Ţ ţ Ť ť Ŧ ŧ Ũ ũ Ū ū Ŭ ŭ Ů ů Ű ű Ų ų Ŵ ŵ Ŷ ŷ Ÿ Ź ź Ż ż Ž ž ſ ƀ Ɓ Ƃ ƃ Ƅ ƅ Ɔ Ƈ ƈ Ɖ Ɗ Ƌ ƌ ƍ Ǝ Ə Ɛ Ƒ ƒ Ɠ Ɣ ƕ Ɩ Ɨ Ƙ ƙ ƚ ƛ Ɯ Ɲ ƞ Ɵ Ơ ơ Ƣ ƣ Ƥ ƥ Ʀ Ƨ ƨ Ʃ ƪ ƫ Ƭ ƭ Ʈ Ư ư Ʊ Ʋ Ƴ ƴ Ƶ ƶ Ʒ Ƹ ƹ ƺ ƻ Ƽ ƽ ƾ ƿ ǀ ǁ ǂ ǃ Ǆ ǅ ǆ Ǉ ǈ ǉ Ǌ ǋ ǌ Ǎ ǎ Ǐ ǐ Ǒ ǒ Ǔ ǔ Ǖ ǖ Ǘ ǘ Ǚ ǚ Ǜ ǜ ǝ Ǟ ǟ Ǡ ǡ Ǣ ǣ Ǥ ǥ Ǧ ǧ Ǩ ǩ Ǫ ǫ Ǭ ǭ Ǯ ǯ ǰ Ǳ ǲ ǳ Ǵ ǵ Ƕ Ƿ Ǹ ǹ Ǻ ǻ Ǽ ǽ Ǿ ǿ Ȁ ȁ Ȃ ȃ Ȅ ȅ Ȇ ȇ Ȉ ȉ Ȋ ȋ Ȍ ȍ Ȏ ȏ Ȑ ȑ Ȓ ȓ Ȕ ȕ Ȗ ȗ Ș ș Ț ț Ȝ ȝ Ȟ ȟ Ƞ ȡ Ȣ ȣ Ȥ ȥ Ȧ ȧ Ȩ ȩ
+A a A a R
+A a A X R
+A _ B0 a R
+B0 _ C0 _ L
+C0 a S1 a R
+S1 _ B1 X R
+B1 _ C1 _ L
+C1 X S2 X R
+S2 _ B2 Ā R
+B2 _ C2 _ L
+C2 Ā S3 Ā R
+S3 _ B3 ā R
+B3 _ C3 _ L
+C3 ā S4 ā R
+S4 _ B4 Ă R
+B4 _ C4 _ L
+C4 Ă S5 Ă R
+S5 _ B5 ă R
+B5 _ C5 _ L
+C5 ă S6 ă R
+S6 _ B6 Ą R
+B6 _ C6 _ L
+C6 Ą S7 Ą R
+S7 _ B7 ą R
+B7 _ C7 _ L
+C7 ą S8 ą R
+S8 _ B8 Ć R
+B8 _ C8 _ L
+C8 Ć S9 Ć R
+S9 _ B9 ć R
+B9 _ C9 _ L
+C9 ć S10 ć R
+S10 _ B10 Ĉ R
+B10 _ C10 _ L
+C10 Ĉ S11 Ĉ R
+S11 _ B11 ĉ R
+B11 _ C11 _ L
+C11 ĉ S12 ĉ R
+S12 _ B12 Ċ R
+B12 _ C12 _ L
+C12 Ċ S13 Ċ R
+S13 _ B13 ċ R
+B13 _ C13 _ L
+C13 ċ S14 ċ R
+S14 _ B14 Č R
+B14 _ C14 _ L
+C14 Č S15 Č R
+S15 _ B15 č R
+B15 _ C15 _ L
+C15 č S16 č R
+S16 _ B16 Ď R
+B16 _ C16 _ L
+C16 Ď S17 Ď R
+S17 _ B17 ď R
+B17 _ C17 _ L
+C17 ď S18 ď R
+S18 _ B18 Đ R
+B18 _ C18 _ L
+C18 Đ S19 Đ R
+S19 _ B19 đ R
+B19 _ C19 _ L
+C19 đ S20 đ R
+S20 _ B20 Ē R
+B20 _ C20 _ L
+C20 Ē S21 Ē R
+S21 _ B21 ē R
+B21 _ C21 _ L
+C21 ē S22 ē R
+S22 _ B22 Ĕ R
+B22 _ C22 _ L
+C22 Ĕ S23 Ĕ R
+S23 _ B23 ĕ R
+B23 _ C23 _ L
+C23 ĕ S24 ĕ R
+S24 _ B24 Ė R
+B24 _ C24 _ L
+C24 Ė S25 Ė R
+S25 _ B25 ė R
+B25 _ C25 _ L
+C25 ė S26 ė R
+S26 _ B26 Ę R
+B26 _ C26 _ L
+C26 Ę S27 Ę R
+S27 _ B27 ę R
+B27 _ C27 _ L
+C27 ę S28 ę R
+S28 _ B28 Ě R
+B28 _ C28 _ L
+C28 Ě S29 Ě R
+S29 _ B29 ě R
+B29 _ C29 _ L
+C29 ě S30 ě R
+S30 _ B30 Ĝ R
+B30 _ C30 _ L
+C30 Ĝ S31 Ĝ R
+S31 _ B31 ĝ R
+B31 _ C31 _ L
+C31 ĝ S32 ĝ R
+S32 _ B32 Ğ R
+B32 _ C32 _ L
+C32 Ğ S33 Ğ R
+S33 _ B33 ğ R
+B33 _ C33 _ L
+C33 ğ S34 ğ R
+S34 _ B34 Ġ R
+B34 _ C34 _ L
+C34 Ġ S35 Ġ R
+S35 _ B35 ġ R
+B35 _ C35 _ L
+C35 ġ S36 ġ R
+S36 _ B36 Ģ R
+B36 _ C36 _ L
+C36 Ģ S37 Ģ R
+S37 _ B37 ģ R
+B37 _ C37 _ L
+C37 ģ S38 ģ R
+S38 _ B38 Ĥ R
+B38 _ C38 _ L
+C38 Ĥ S39 Ĥ R
+S39 _ B39 ĥ R
+B39 _ C39 _ L
+C39 ĥ S40 ĥ R
+S40 _ B40 Ħ R
+B40 _ C40 _ L
+C40 Ħ S41 Ħ R
+S41 _ B41 ħ R
+B41 _ C41 _ L
+C41 ħ S42 ħ R
+S42 _ B42 Ĩ R
+B42 _ C42 _ L
+C42 Ĩ S43 Ĩ R
+S43 _ B43 ĩ R
+B43 _ C43 _ L
+C43 ĩ S44 ĩ R
+S44 _ B44 Ī R
+B44 _ C44 _ L
+C44 Ī S45 Ī R
+S45 _ B45 ī R
+B45 _ C45 _ L
+C45 ī S46 ī R
+S46 _ B46 Ĭ R
+B46 _ C46 _ L
+C46 Ĭ S47 Ĭ R
+S47 _ B47 ĭ R
+B47 _ C47 _ L
+C47 ĭ S48 ĭ R
+S48 _ B48 Į R
+B48 _ C48 _ L
+C48 Į S49 Į R
+S49 _ B49 į R
+B49 _ C49 _ L
+C49 į S50 į R
+S50 _ B50 İ R
+B50 _ C50 _ L
+C50 İ S51 İ R
+S51 _ B51 ı R
+B51 _ C51 _ L
+C51 ı S52 ı R
+S52 _ B52 Ĳ R
+B52 _ C52 _ L
+C52 Ĳ S53 Ĳ R
+S53 _ B53 ĳ R
+B53 _ C53 _ L
+C53 ĳ S54 ĳ R
+S54 _ B54 Ĵ R
+B54 _ C54 _ L
+C54 Ĵ S55 Ĵ R
+S55 _ B55 ĵ R
+B55 _ C55 _ L
+C55 ĵ S56 ĵ R
+S56 _ B56 Ķ R
+B56 _ C56 _ L
+C56 Ķ S57 Ķ R
+S57 _ B57 ķ R
+B57 _ C57 _ L
+C57 ķ S58 ķ R
+S58 _ B58 ĸ R
+B58 _ C58 _ L
+C58 ĸ S59 ĸ R
+S59 _ B59 Ĺ R
+B59 _ C59 _ L
+C59 Ĺ S60 Ĺ R
+S60 _ B60 ĺ R
+B60 _ C60 _ L
+C60 ĺ S61 ĺ R
+S61 _ B61 Ļ R
+B61 _ C61 _ L
+C61 Ļ S62 Ļ R
+S62 _ B62 ļ R
+B62 _ C62 _ L
+C62 ļ S63 ļ R
+S63 _ B63 Ľ R
+B63 _ C63 _ L
+C63 Ľ S64 Ľ R
+S64 _ B64 ľ R
+B64 _ C64 _ L
+C64 ľ S65 ľ R
+S65 _ B65 Ŀ R
+B65 _ C65 _ L
+C65 Ŀ S66 Ŀ R
+S66 _ B66 ŀ R
+B66 _ C66 _ L
+C66 ŀ S67 ŀ R
+S67 _ B67 Ł R
+B67 _ C67 _ L
+C67 Ł S68 Ł R
+S68 _ B68 ł R
+B68 _ C68 _ L
+C68 ł S69 ł R
+S69 _ B69 Ń R
+B69 _ C69 _ L
+C69 Ń S70 Ń R
+S70 _ B70 ń R
+B70 _ C70 _ L
+C70 ń S71 ń R
+S71 _ B71 Ņ R
+B71 _ C71 _ L
+C71 Ņ S72 Ņ R
+S72 _ B72 ņ R
+B72 _ C72 _ L
+C72 ņ S73 ņ R
+S73 _ B73 Ň R
+B73 _ C73 _ L
+C73 Ň S74 Ň R
+S74 _ B74 ň R
+B74 _ C74 _ L
+C74 ň S75 ň R
+S75 _ B75 ŉ R
+B75 _ C75 _ L
+C75 ŉ S76 ŉ R
+S76 _ B76 Ŋ R
+B76 _ C76 _ L
+C76 Ŋ S77 Ŋ R
+S77 _ B77 ŋ R
+B77 _ C77 _ L
+C77 ŋ S78 ŋ R
+S78 _ B78 Ō R
+B78 _ C78 _ L
+C78 Ō S79 Ō R
+S79 _ B79 ō R
+B79 _ C79 _ L
+C79 ō S80 ō R
+S80 _ B80 Ŏ R
+B80 _ C80 _ L
+C80 Ŏ S81 Ŏ R
+S81 _ B81 ŏ R
+B81 _ C81 _ L
+C81 ŏ S82 ŏ R
+S82 _ B82 Ő R
+B82 _ C82 _ L
+C82 Ő S83 Ő R
+S83 _ B83 ő R
+B83 _ C83 _ L
+C83 ő S84 ő R
+S84 _ B84 Œ R
+B84 _ C84 _ L
+C84 Œ S85 Œ R
+S85 _ B85 œ R
+B85 _ C85 _ L
+C85 œ S86 œ R
+S86 _ B86 Ŕ R
+B86 _ C86 _ L
+C86 Ŕ S87 Ŕ R
+S87 _ B87 ŕ R
+B87 _ C87 _ L
+C87 ŕ S88 ŕ R
+S88 _ B88 Ŗ R
+B88 _ C88 _ L
+C88 Ŗ S89 Ŗ R
+S89 _ B89 ŗ R
+B89 _ C89 _ L
+C89 ŗ S90 ŗ R
+S90 _ B90 Ř R
+B90 _ C90 _ L
+C90 Ř S91 Ř R
+S91 _ B91 ř R
+B91 _ C91 _ L
+C91 ř S92 ř R
+S92 _ B92 Ś R
+B92 _ C92 _ L
+C92 Ś S93 Ś R
+S93 _ B93 ś R
+B93 _ C93 _ L
+C93 ś S94 ś R
+S94 _ B94 Ŝ R
+B94 _ C94 _ L
+C94 Ŝ S95 Ŝ R
+S95 _ B95 ŝ R
+B95 _ C95 _ L
+C95 ŝ S96 ŝ R
+S96 _ B96 Ş R
+B96 _ C96 _ L
+C96 Ş S97 Ş R
+S97 _ B97 ş R
+B97 _ C97 _ L
+C97 ş S98 ş R
+S98 _ B98 Š R
+B98 _ C98 _ L
+C98 Š S99 Š R
+S99 _ B99 š R
+B99 _ C99 _ L
+C99 š S100 š R
+S100 _ B100 Ţ R
+B100 _ C100 _ L
+C100 Ţ S101 Ţ R
+S101 _ B101 ţ R
+B101 _ C101 _ L
+C101 ţ S102 ţ R
+S102 _ B102 Ť R
+B102 _ C102 _ L
+C102 Ť S103 Ť R
+S103 _ B103 ť R
+B103 _ C103 _ L
+C103 ť S104 ť R
+S104 _ B104 Ŧ R
+B104 _ C104 _ L
+C104 Ŧ S105 Ŧ R
+S105 _ B105 ŧ R
+B105 _ C105 _ L
+C105 ŧ S106 ŧ R
+S106 _ B106 Ũ R
+B106 _ C106 _ L
+C106 Ũ S107 Ũ R
+S107 _ B107 ũ R
+B107 _ C107 _ L
+C107 ũ S108 ũ R
+S108 _ B108 Ū R
+B108 _ C108 _ L
+C108 Ū S109 Ū R
+S109 _ B109 ū R
+B109 _ C109 _ L
+C109 ū S110 ū R
+S110 _ B110 Ŭ R
+B110 _ C110 _ L
+C110 Ŭ S111 Ŭ R
+S111 _ B111 ŭ R
+B111 _ C111 _ L
+C111 ŭ S112 ŭ R
+S112 _ B112 Ů R
+B112 _ C112 _ L
+C112 Ů S113 Ů R
+S113 _ B113 ů R
+B113 _ C113 _ L
+C113 ů S114 ů R
+S114 _ B114 Ű R
+B114 _ C114 _ L
+C114 Ű S115 Ű R
+S115 _ B115 ű R
+B115 _ C115 _ L
+C115 ű S116 ű R
+S116 _ B116 Ų R
+B116 _ C116 _ L
+C116 Ų S117 Ų R
+S117 _ B117 ų R
+B117 _ C117 _ L
+C117 ų S118 ų R
+S118 _ B118 Ŵ R
+B118 _ C118 _ L
+C118 Ŵ S119 Ŵ R
+S119 _ B119 ŵ R
+B119 _ C119 _ L
+C119 ŵ S120 ŵ R
+S120 _ B120 Ŷ R
+B120 _ C120 _ L
+C120 Ŷ S121 Ŷ R
+S121 _ B121 ŷ R
+B121 _ C121 _ L
+C121 ŷ S122 ŷ R
+S122 _ B122 Ÿ R
+B122 _ C122 _ L
+C122 Ÿ S123 Ÿ R
+S123 _ B123 Ź R
+B123 _ C123 _ L
+C123 Ź S124 Ź R
+S124 _ B124 ź R
+B124 _ C124 _ L
+C124 ź S125 ź R
+S125 _ B125 Ż R
+B125 _ C125 _ L
+C125 Ż S126 Ż R
+S126 _ B126 ż R
+B126 _ C126 _ L
+C126 ż S127 ż R
+S127 _ B127 Ž R
+B127 _ C127 _ L
+C127 Ž S128 Ž R
+S128 _ B128 ž R
+B128 _ C128 _ L
+C128 ž S129 ž R
+S129 _ B129 ſ R
+B129 _ C129 _ L
+C129 ſ S130 ſ R
+S130 _ B130 ƀ R
+B130 _ C130 _ L
+C130 ƀ S131 ƀ R
+S131 _ B131 Ɓ R
+B131 _ C131 _ L
+C131 Ɓ S132 Ɓ R
+S132 _ B132 Ƃ R
+B132 _ C132 _ L
+C132 Ƃ S133 Ƃ R
+S133 _ B133 ƃ R
+B133 _ C133 _ L
+C133 ƃ S134 ƃ R
+S134 _ B134 Ƅ R
+B134 _ C134 _ L
+C134 Ƅ S135 Ƅ R
+S135 _ B135 ƅ R
+B135 _ C135 _ L
+C135 ƅ S136 ƅ R
+S136 _ B136 Ɔ R
+B136 _ C136 _ L
+C136 Ɔ S137 Ɔ R
+S137 _ B137 Ƈ R
+B137 _ C137 _ L
+C137 Ƈ S138 Ƈ R
+S138 _ B138 ƈ R
+B138 _ C138 _ L
+C138 ƈ S139 ƈ R
+S139 _ B139 Ɖ R
+B139 _ C139 _ L
+C139 Ɖ S140 Ɖ R
+S140 _ B140 Ɗ R
+B140 _ C140 _ L
+C140 Ɗ S141 Ɗ R
+S141 _ B141 Ƌ R
+B141 _ C141 _ L
+C141 Ƌ S142 Ƌ R
+S142 _ B142 ƌ R
+B142 _ C142 _ L
+C142 ƌ S143 ƌ R
+S143 _ B143 ƍ R
+B143 _ C143 _ L
+C143 ƍ S144 ƍ R
+S144 _ B144 Ǝ R
+B144 _ C144 _ L
+C144 Ǝ S145 Ǝ R
+S145 _ B145 Ə R
+B145 _ C145 _ L
+C145 Ə S146 Ə R
+S146 _ B146 Ɛ R
+B146 _ C146 _ L
+C146 Ɛ S147 Ɛ R
+S147 _ B147 Ƒ R
+B147 _ C147 _ L
+C147 Ƒ S148 Ƒ R
+S148 _ B148 ƒ R
+B148 _ C148 _ L
+C148 ƒ S149 ƒ R
+S149 _ B149 Ɠ R
+B149 _ C149 _ L
+C149 Ɠ S150 Ɠ R
+S150 _ B150 Ɣ R
+B150 _ C150 _ L
+C150 Ɣ S151 Ɣ R
+S151 _ B151 ƕ R
+B151 _ C151 _ L
+C151 ƕ S152 ƕ R
+S152 _ B152 Ɩ R
+B152 _ C152 _ L
+C152 Ɩ S153 Ɩ R
+S153 _ B153 Ɨ R
+B153 _ C153 _ L
+C153 Ɨ S154 Ɨ R
+S154 _ B154 Ƙ R
+B154 _ C154 _ L
+C154 Ƙ S155 Ƙ R
+S155 _ B155 ƙ R
+B155 _ C155 _ L
+C155 ƙ S156 ƙ R
+S156 _ B156 ƚ R
+B156 _ C156 _ L
+C156 ƚ S157 ƚ R
+S157 _ B157 ƛ R
+B157 _ C157 _ L
+C157 ƛ S158 ƛ R
+S158 _ B158 Ɯ R
+B158 _ C158 _ L
+C158 Ɯ S159 Ɯ R
+S159 _ B159 Ɲ R
+B159 _ C159 _ L
+C159 Ɲ S160 Ɲ R
+S160 _ B160 ƞ R
+B160 _ C160 _ L
+C160 ƞ S161 ƞ R
+S161 _ B161 Ɵ R
+B161 _ C161 _ L
+C161 Ɵ S162 Ɵ R
+S162 _ B162 Ơ R
+B162 _ C162 _ L
+C162 Ơ S163 Ơ R
+S163 _ B163 ơ R
+B163 _ C163 _ L
+C163 ơ S164 ơ R
+S164 _ B164 Ƣ R
+B164 _ C164 _ L
+C164 Ƣ S165 Ƣ R
+S165 _ B165 ƣ R
+B165 _ C165 _ L
+C165 ƣ S166 ƣ R
+S166 _ B166 Ƥ R
+B166 _ C166 _ L
+C166 Ƥ S167 Ƥ R
+S167 _ B167 ƥ R
+B167 _ C167 _ L
+C167 ƥ S168 ƥ R
+S168 _ B168 Ʀ R
+B168 _ C168 _ L
+C168 Ʀ S169 Ʀ R
+S169 _ B169 Ƨ R
+B169 _ C169 _ L
+C169 Ƨ S170 Ƨ R
+S170 _ B170 ƨ R
+B170 _ C170 _ L
+C170 ƨ S171 ƨ R
+S171 _ B171 Ʃ R
+B171 _ C171 _ L
+C171 Ʃ S172 Ʃ R
+S172 _ B172 ƪ R
+B172 _ C172 _ L
+C172 ƪ S173 ƪ R
+S173 _ B173 ƫ R
+B173 _ C173 _ L
+C173 ƫ S174 ƫ R
+S174 _ B174 Ƭ R
+B174 _ C174 _ L
+C174 Ƭ S175 Ƭ R
+S175 _ B175 ƭ R
+B175 _ C175 _ L
+C175 ƭ S176 ƭ R
+S176 _ B176 Ʈ R
+B176 _ C176 _ L
+C176 Ʈ S177 Ʈ R
+S177 _ B177 Ư R
+B177 _ C177 _ L
+C177 Ư S178 Ư R
+S178 _ B178 ư R
+B178 _ C178 _ L
+C178 ư S179 ư R
+S179 _ B179 Ʊ R
+B179 _ C179 _ L
+C179 Ʊ S180 Ʊ R
+S180 _ B180 Ʋ R
+B180 _ C180 _ L
+C180 Ʋ S181 Ʋ R
+S181 _ B181 Ƴ R
+B181 _ C181 _ L
+C181 Ƴ S182 Ƴ R
+S182 _ B182 ƴ R
+B182 _ C182 _ L
+C182 ƴ S183 ƴ R
+S183 _ B183 Ƶ R
+B183 _ C183 _ L
+C183 Ƶ S184 Ƶ R
+S184 _ B184 ƶ R
+B184 _ C184 _ L
+C184 ƶ S185 ƶ R
+S185 _ B185 Ʒ R
+B185 _ C185 _ L
+C185 Ʒ S186 Ʒ R
+S186 _ B186 Ƹ R
+B186 _ C186 _ L
+C186 Ƹ S187 Ƹ R
+S187 _ B187 ƹ R
+B187 _ C187 _ L
+C187 ƹ S188 ƹ R
+S188 _ B188 ƺ R
+B188 _ C188 _ L
+C188 ƺ S189 ƺ R
+S189 _ B189 ƻ R
+B189 _ C189 _ L
+C189 ƻ S190 ƻ R
+S190 _ B190 Ƽ R
+B190 _ C190 _ L
+C190 Ƽ S191 Ƽ R
+S191 _ B191 ƽ R
+B191 _ C191 _ L
+C191 ƽ S192 ƽ R
+S192 _ B192 ƾ R
+B192 _ C192 _ L
+C192 ƾ S193 ƾ R
+S193 _ B193 ƿ R
+B193 _ C193 _ L
+C193 ƿ S194 ƿ R
+S194 _ B194 ǀ R
+B194 _ C194 _ L
+C194 ǀ S195 ǀ R
+S195 _ B195 ǁ R
+B195 _ C195 _ L
+C195 ǁ S196 ǁ R
+S196 _ B196 ǂ R
+B196 _ C196 _ L
+C196 ǂ S197 ǂ R
+S197 _ B197 ǃ R
+B197 _ C197 _ L
+C197 ǃ S198 ǃ R
+S198 _ B198 Ǆ R
+B198 _ C198 _ L
+C198 Ǆ S199 Ǆ R
+S199 _ B199 ǅ R
+B199 _ C199 _ L
+C199 ǅ S200 ǅ R
+S200 _ B200 ǆ R
+B200 _ C200 _ L
+C200 ǆ S201 ǆ R
+S201 _ B201 Ǉ R
+B201 _ C201 _ L
+C201 Ǉ S202 Ǉ R
+S202 _ B202 ǈ R
+B202 _ C202 _ L
+C202 ǈ S203 ǈ R
+S203 _ B203 ǉ R
+B203 _ C203 _ L
+C203 ǉ S204 ǉ R
+S204 _ B204 Ǌ R
+B204 _ C204 _ L
+C204 Ǌ S205 Ǌ R
+S205 _ B205 ǋ R
+B205 _ C205 _ L
+C205 ǋ S206 ǋ R
+S206 _ B206 ǌ R
+B206 _ C206 _ L
+C206 ǌ S207 ǌ R
+S207 _ B207 Ǎ R
+B207 _ C207 _ L
+C207 Ǎ S208 Ǎ R
+S208 _ B208 ǎ R
+B208 _ C208 _ L
+C208 ǎ S209 ǎ R
+S209 _ B209 Ǐ R
+B209 _ C209 _ L
+C209 Ǐ S210 Ǐ R
+S210 _ B210 ǐ R
+B210 _ C210 _ L
+C210 ǐ S211 ǐ R
+S211 _ B211 Ǒ R
+B211 _ C211 _ L
+C211 Ǒ S212 Ǒ R
+S212 _ B212 ǒ R
+B212 _ C212 _ L
+C212 ǒ S213 ǒ R
+S213 _ B213 Ǔ R
+B213 _ C213 _ L
+C213 Ǔ S214 Ǔ R
+S214 _ B214 ǔ R
+B214 _ C214 _ L
+C214 ǔ S215 ǔ R
+S215 _ B215 Ǖ R
+B215 _ C215 _ L
+C215 Ǖ S216 Ǖ R
+S216 _ B216 ǖ R
+B216 _ C216 _ L
+C216 ǖ S217 ǖ R
+S217 _ B217 Ǘ R
+B217 _ C217 _ L
+C217 Ǘ S218 Ǘ R
+S218 _ B218 ǘ R
+B218 _ C218 _ L
+C218 ǘ S219 ǘ R
+S219 _ B219 Ǚ R
+B219 _ C219 _ L
+C219 Ǚ S220 Ǚ R
+S220 _ B220 ǚ R
+B220 _ C220 _ L
+C220 ǚ S221 ǚ R
+S221 _ B221 Ǜ R
+B221 _ C221 _ L
+C221 Ǜ S222 Ǜ R
+S222 _ B222 ǜ R
+B222 _ C222 _ L
+C222 ǜ S223 ǜ R
+S223 _ B223 ǝ R
+B223 _ C223 _ L
+C223 ǝ S224 ǝ R
+S224 _ B224 Ǟ R
+B224 _ C224 _ L
+C224 Ǟ S225 Ǟ R
+S225 _ B225 ǟ R
+B225 _ C225 _ L
+C225 ǟ S226 ǟ R
+S226 _ B226 Ǡ R
+B226 _ C226 _ L
+C226 Ǡ S227 Ǡ R
+S227 _ B227 ǡ R
+B227 _ C227 _ L
+C227 ǡ S228 ǡ R
+S228 _ B228 Ǣ R
+B228 _ C228 _ L
+C228 Ǣ S229 Ǣ R
+S229 _ B229 ǣ R
+B229 _ C229 _ L
+C229 ǣ S230 ǣ R
+S230 _ B230 Ǥ R
+B230 _ C230 _ L
+C230 Ǥ S231 Ǥ R
+S231 _ B231 ǥ R
+B231 _ C231 _ L
+C231 ǥ S232 ǥ R
+S232 _ B232 Ǧ R
+B232 _ C232 _ L
+C232 Ǧ S233 Ǧ R
+S233 _ B233 ǧ R
+B233 _ C233 _ L
+C233 ǧ S234 ǧ R
+S234 _ B234 Ǩ R
+B234 _ C234 _ L
+C234 Ǩ S235 Ǩ R
+S235 _ B235 ǩ R
+B235 _ C235 _ L
+C235 ǩ S236 ǩ R
+S236 _ B236 Ǫ R
+B236 _ C236 _ L
+C236 Ǫ S237 Ǫ R
+S237 _ B237 ǫ R
+B237 _ C237 _ L
+C237 ǫ S238 ǫ R
+S238 _ B238 Ǭ R
+B238 _ C238 _ L
+C238 Ǭ S239 Ǭ R
+S239 _ B239 ǭ R
+B239 _ C239 _ L
+C239 ǭ S240 ǭ R
+S240 _ B240 Ǯ R
+B240 _ C240 _ L
+C240 Ǯ S241 Ǯ R
+S241 _ B241 ǯ R
+B241 _ C241 _ L
+C241 ǯ S242 ǯ R
+S242 _ B242 ǰ R
+B242 _ C242 _ L
+C242 ǰ S243 ǰ R
+S243 _ B243 Ǳ R
+B243 _ C243 _ L
+C243 Ǳ S244 Ǳ R
+S244 _ B244 ǲ R
+B244 _ C244 _ L
+C244 ǲ S245 ǲ R
+S245 _ B245 ǳ R
+B245 _ C245 _ L
+C245 ǳ S246 ǳ R
+S246 _ B246 Ǵ R
+B246 _ C246 _ L
+C246 Ǵ S247 Ǵ R
+S247 _ B247 ǵ R
+B247 _ C247 _ L
+C247 ǵ S248 ǵ R
+S248 _ B248 Ƕ R
+B248 _ C248 _ L
+C248 Ƕ S249 Ƕ R
+S249 _ B249 Ƿ R
+B249 _ C249 _ L
+C249 Ƿ S250 Ƿ R
+S250 _ B250 Ǹ R
+B250 _ C250 _ L
+C250 Ǹ S251 Ǹ R
+S251 _ B251 ǹ R
+B251 _ C251 _ L
+C251 ǹ S252 ǹ R
+S252 _ B252 Ǻ R
+B252 _ C252 _ L
+C252 Ǻ S253 Ǻ R
+S253 _ B253 ǻ R
+B253 _ C253 _ L
+C253 ǻ S254 ǻ R
+S254 _ B254 Ǽ R
+B254 _ C254 _ L
+C254 Ǽ S255 Ǽ R
+S255 _ B255 ǽ R
+B255 _ C255 _ L
+C255 ǽ S256 ǽ R
+S256 _ B256 Ǿ R
+B256 _ C256 _ L
+C256 Ǿ S257 Ǿ R
+S257 _ B257 ǿ R
+B257 _ C257 _ L
+C257 ǿ S258 ǿ R
+S258 _ B258 Ȁ R
+B258 _ C258 _ L
+C258 Ȁ S259 Ȁ R
+S259 _ B259 ȁ R
+B259 _ C259 _ L
+C259 ȁ S260 ȁ R
+S260 _ B260 Ȃ R
+B260 _ C260 _ L
+C260 Ȃ S261 Ȃ R
+S261 _ B261 ȃ R
+B261 _ C261 _ L
+C261 ȃ S262 ȃ R
+S262 _ B262 Ȅ R
+B262 _ C262 _ L
+C262 Ȅ S263 Ȅ R
+S263 _ B263 ȅ R
+B263 _ C263 _ L
+C263 ȅ S264 ȅ R
+S264 _ B264 Ȇ R
+B264 _ C264 _ L
+C264 Ȇ S265 Ȇ R
+S265 _ B265 ȇ R
+B265 _ C265 _ L
+C265 ȇ S266 ȇ R
+S266 _ B266 Ȉ R
+B266 _ C266 _ L
+C266 Ȉ S267 Ȉ R
+S267 _ B267 ȉ R
+B267 _ C267 _ L
+C267 ȉ S268 ȉ R
+S268 _ B268 Ȋ R
+B268 _ C268 _ L
+C268 Ȋ S269 Ȋ R
+S269 _ B269 ȋ R
+B269 _ C269 _ L
+C269 ȋ S270 ȋ R
+S270 _ B270 Ȍ R
+B270 _ C270 _ L
+C270 Ȍ S271 Ȍ R
+S271 _ B271 ȍ R
+B271 _ C271 _ L
+C271 ȍ S272 ȍ R
+S272 _ B272 Ȏ R
+B272 _ C272 _ L
+C272 Ȏ S273 Ȏ R
+S273 _ B273 ȏ R
+B273 _ C273 _ L
+C273 ȏ S274 ȏ R
+S274 _ B274 Ȑ R
+B274 _ C274 _ L
+C274 Ȑ S275 Ȑ R
+S275 _ B275 ȑ R
+B275 _ C275 _ L
+C275 ȑ S276 ȑ R
+S276 _ B276 Ȓ R
+B276 _ C276 _ L
+C276 Ȓ S277 Ȓ R
+S277 _ B277 ȓ R
+B277 _ C277 _ L
+C277 ȓ S278 ȓ R
+S278 _ B278 Ȕ R
+B278 _ C278 _ L
+C278 Ȕ S279 Ȕ R
+S279 _ B279 ȕ R
+B279 _ C279 _ L
+C279 ȕ S280 ȕ R
+S280 _ B280 Ȗ R
+B280 _ C280 _ L
+C280 Ȗ S281 Ȗ R
+S281 _ B281 ȗ R
+B281 _ C281 _ L
+C281 ȗ S282 ȗ R
+S282 _ B282 Ș R
+B282 _ C282 _ L
+C282 Ș S283 Ș R
+S283 _ B283 ș R
+B283 _ C283 _ L
+C283 ș S284 ș R
+S284 _ B284 Ț R
+B284 _ C284 _ L
+C284 Ț S285 Ț R
+S285 _ B285 ț R
+B285 _ C285 _ L
+C285 ț S286 ț R
+S286 _ B286 Ȝ R
+B286 _ C286 _ L
+C286 Ȝ S287 Ȝ R
+S287 _ B287 ȝ R
+B287 _ C287 _ L
+C287 ȝ S288 ȝ R
+S288 _ B288 Ȟ R
+B288 _ C288 _ L
+C288 Ȟ S289 Ȟ R
+S289 _ B289 ȟ R
+B289 _ C289 _ L
+C289 ȟ S290 ȟ R
+S290 _ B290 Ƞ R
+B290 _ C290 _ L
+C290 Ƞ S291 Ƞ R
+S291 _ B291 ȡ R
+B291 _ C291 _ L
+C291 ȡ S292 ȡ R
+S292 _ B292 Ȣ R
+B292 _ C292 _ L
+C292 Ȣ S293 Ȣ R
+S293 _ B293 ȣ R
+B293 _ C293 _ L
+C293 ȣ S294 ȣ R
+S294 _ B294 Ȥ R
+B294 _ C294 _ L
+C294 Ȥ S295 Ȥ R
+S295 _ B295 ȥ R
+B295 _ C295 _ L
+C295 ȥ S296 ȥ R
+S296 _ B296 Ȧ R
+B296 _ C296 _ L
+C296 Ȧ S297 Ȧ R
+S297 _ B297 ȧ R
+B297 _ C297 _ L
+C297 ȧ S298 ȧ R
+S298 _ B298 Ȩ R
+B298 _ C298 _ L
+C298 Ȩ S299 Ȩ R
+S299 _ B299 ȩ R
+B299 _ C299 _ L
+C299 ȩ Y ȩ R
\ No newline at end of file
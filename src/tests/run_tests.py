@@ -1,52 +1,286 @@
 #!/usr/bin/env python3
 
 '''Script for running the automated tests.
+
+Every tape in tests/<name>/accept and tests/<name>/reject is run on every <name>*.tm machine (and every machine in
+tests/<name>), and has to be accepted or rejected respectively (with the exit codes of runtm). If there is a .tapeout file next to the tape, the output tape
+has to match it too. The tests are spread over a pool of processes, each of which loads every machine once and runs it
+in-process.
+
+Each test is also run on the other engines for its machine (see DETERMINISTIC_ENGINES and NONDETERMINISTIC_ENGINES),
+such as the generated engines, the macro machine, process_batch and every search strategy, which have to take the same number of
+steps, reach the same verdict and leave the same output tape.
+
+The number of steps of every test is compared to the baseline (written with --update-baseline), and the tests that take
+more steps are reported as regressions. As times depend on the machine, they are only compared to the times of an
+earlier run on the same machine, which --update-baseline keeps in a local file next to the baseline, and a test only
+counts as slower if it takes notably more time.
 '''
 
 
-import subprocess
+import argparse
+import json
 import os
+import subprocess
+import sys
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor
 from glob import glob
 
 TEST_DIR = "tests"
 SRC_DIR = "."
-RUNTM = os.path.join(SRC_DIR, "runtm")
+BASELINE = os.path.join(TEST_DIR, "baseline.json")
+TIMES = os.path.join(TEST_DIR, "times.json")
 
 TEST_TYPES = {
     "accept": 0,
     "reject": 1
 }
 
+# a test is slower if it takes this many times as long as in the earlier run, and at least MIN_TIME_REGRESSION seconds more
+TIME_TOLERANCE = 1.5
+MIN_TIME_REGRESSION = 0.01
+
+# the most steps of a test that is run on the nondeterministic engines, which is also the depth bound of "dfs"
+MAX_NONDETERMINISTIC_STEPS = 20000
+
 NULL = open(os.devnull, "w")
 
-print("Running make...")
-subprocess.run(["make", "-C", SRC_DIR], stdout=NULL)
-
-num_tests = 0
-passed_tests = 0
-
-for tm in os.listdir(TEST_DIR):
-    for tmfile in glob(os.path.join(SRC_DIR, tm + "*.tm")):
-        print("Running {} tests on {}...".format(tm, tmfile))
-        for test_type, returncode in TEST_TYPES.items():
-            for tape in sorted(glob(os.path.join(TEST_DIR, tm, test_type, "*.tape"))):
-                result = subprocess.run(
-                    [RUNTM, tmfile, tape], stdout=subprocess.PIPE)
-                passed = result.returncode == returncode
-                reason = "incorrect return code"
-                if passed:
-                    if os.path.exists(tape + "out"):
-                        with open(tape + "out") as f:
-                            passed = result.stdout.decode(
-                                "utf-8").strip().split("\n")[-1].strip() == f.read().strip()
-                            reason = "incorrect tape output"
-                if passed:
-                    print("  \033[92mPASS\033[0m {}".format(tape))
-                    passed_tests += 1
-                else:
-                    print("  \033[91mFAIL\033[0m {} ({})".format(tape, reason))
-                num_tests += 1
-
-print()
-print("Summary:")
-print("  {} out of {} tests passed".format(passed_tests, num_tests))
+# the simulator is imported from the source directory, also when this is run as a script
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+# the engines every test is run on, with their options for parse_machine and the most steps of a test they are run on
+# (as the slower ones would take long); a test is run on the first engine for its machine, and the others have to take
+# the same number of steps, reach the same verdict and, if both have one, leave the same output tape
+DETERMINISTIC_ENGINES = [
+    ("dtm", {}, None),
+    ("blocks", {"block_size": 3}, 10 ** 6),
+    ("optimized", {"optimize": True}, None),
+    ("jit", {"jit": True}, None),
+    ("jit-python", {"jit": True, "jit_compiled": False}, 10 ** 6),
+    # run with process_batch, as a batch of one tape
+    ("batch", {}, 2 * 10 ** 4)
+]
+# deterministic machines are run on these too, one level per step
+NONDETERMINISTIC_ENGINES = [
+    ("bfs", {}, MAX_NONDETERMINISTIC_STEPS),
+    ("visited", {"remember_visited": True}, MAX_NONDETERMINISTIC_STEPS),
+    ("parallel", {"processes": 2}, MAX_NONDETERMINISTIC_STEPS),
+    ("dfs", {"strategy": "dfs", "max_steps": MAX_NONDETERMINISTIC_STEPS},
+     MAX_NONDETERMINISTIC_STEPS),
+    ("iddfs", {"strategy": "iddfs"}, MAX_NONDETERMINISTIC_STEPS),
+    ("witness", {"witness": True}, MAX_NONDETERMINISTIC_STEPS),
+    ("vectorized", {"vectorized": True}, MAX_NONDETERMINISTIC_STEPS)
+]
+# the engines that only run single-tape machines
+SINGLE_TAPE_ENGINES = {"blocks", "jit", "jit-python", "batch",
+                       "parallel", "dfs", "iddfs", "witness", "vectorized"}
+# the machines that are only run on the nondeterministic engines
+NONDETERMINISTIC_MACHINES = {"subsequence.tm", "alphabet.tm"}
+
+# the machines of a worker process, by file name and engine
+machines = dict()
+
+
+def find_tests() -> list:
+    tests = []
+    for tm in sorted(os.listdir(TEST_DIR)):
+        # machines that are only there to be tested are kept with their tests
+        for tmfile in sorted(glob(os.path.join(SRC_DIR, tm + "*.tm"))) + sorted(glob(os.path.join(TEST_DIR, tm, "*.tm"))):
+            for test_type, returncode in TEST_TYPES.items():
+                for tape in sorted(glob(os.path.join(TEST_DIR, tm, test_type, "*.tape"))):
+                    tests.append((tmfile, tape, returncode))
+    return tests
+
+
+def compared_engines(tmfile: str, num_tapes: int, num_steps: int) -> list:
+    # the engines the result of a test is compared to, as (name, deterministic, options) tuples
+    if os.path.basename(tmfile) in NONDETERMINISTIC_MACHINES:
+        engines = [(False,) + engine for engine in NONDETERMINISTIC_ENGINES[1:]]
+    else:
+        engines = [(True,) + engine for engine in DETERMINISTIC_ENGINES[1:]] + \
+            [(False,) + engine for engine in NONDETERMINISTIC_ENGINES]
+    return [(name, deterministic, options) for deterministic, name, options, max_steps in engines
+            if (max_steps is None or num_steps <= max_steps) and (num_tapes == 1 or name not in SINGLE_TAPE_ENGINES)]
+
+
+def load_machine(tmfile: str, engine: str, deterministic: bool, options: dict):
+    from turing.parsing import parse_machine
+
+    if (tmfile, engine) not in machines:
+        machines[tmfile, engine] = parse_machine(
+            tmfile, deterministic=deterministic, **options)
+    return machines[tmfile, engine]
+
+
+def process(machine, engine: str, word: list):
+    # the result of an engine on an input word
+    if engine != "batch":
+        return machine.process_input(word)
+    from turing.machine import TuringMachineResult
+
+    results, output_tapes = machine.process_batch([word], output_tapes=True)
+    accepted, num_steps, stopped = results[0]
+    return TuringMachineResult(int(num_steps), bool(accepted), output_tapes[0], stopped)
+
+
+def compare_results(engine: str, result, expected) -> typing.Union[str, None]:
+    # why the result of an engine differs from the expected one, if it does
+    if result.num_steps != expected.num_steps:
+        return "{}: {} steps instead of {}".format(engine, result.num_steps, expected.num_steps)
+    if result.verdict != expected.verdict:
+        return "{}: {} instead of {}".format(engine, result.verdict, expected.verdict)
+    if result.tape is not None and expected.tape is not None and result.tape_text != expected.tape_text:
+        return "{}: different output tape".format(engine)
+    return None
+
+
+def run_test(test: tuple) -> dict:
+    '''Run a test in a worker process, on the first engine of its machine, and compare the other engines to that.
+
+    Arguments:
+        test {tuple} -- the machine file, the tape file and the expected exit code
+
+    Returns:
+        dict -- whether the test passed, the reason if it did not, and the number of steps and time of the run on the
+            first engine
+    '''
+
+    # imported here, as the extension is only built once the script runs; the compiled simulator is loaded up front,
+    # so that loading it is not timed as part of the first test of a worker
+    from turing.error import ExecutionError
+    import turing.batch as batch
+    import turing.optimisations
+
+    tmfile, tape, returncode = test
+    outcome = {"passed": False, "reason": "incorrect return code",
+               "num_steps": None, "time": None}
+    deterministic = os.path.basename(tmfile) not in NONDETERMINISTIC_MACHINES
+    engine, options, _ = (DETERMINISTIC_ENGINES if deterministic else NONDETERMINISTIC_ENGINES)[0]
+    try:
+        with open(tape) as f:
+            word = batch.read_tape(f.read())
+        machine = load_machine(tmfile, engine, deterministic, options)
+        start = time.perf_counter()
+        result = machine.process_input(word)
+        outcome["time"] = time.perf_counter() - start
+        outcome["num_steps"] = result.num_steps
+        code, output = batch.exit_code(result), str(result)
+    except IOError:
+        code, output = 3, ""
+    except ExecutionError:
+        code, output = 2, ""
+    outcome["passed"] = code == returncode
+    if outcome["passed"] and os.path.exists(tape + "out"):
+        with open(tape + "out") as f:
+            outcome["passed"] = output.strip().split(
+                "\n")[-1].strip() == f.read().strip()
+            outcome["reason"] = "incorrect tape output"
+    if not outcome["passed"] or code > 1:
+        return outcome
+    for other, other_deterministic, other_options in compared_engines(tmfile, machine.description.num_tapes, result.num_steps):
+        try:
+            mismatch = compare_results(other, process(load_machine(
+                tmfile, other, other_deterministic, other_options), other, word), result)
+        except ExecutionError as error:
+            mismatch = "{}: {}".format(other, error)
+        if mismatch is not None:
+            outcome["passed"] = False
+            outcome["reason"] = mismatch
+            break
+    return outcome
+
+
+def find_regressions(outcome: dict, baseline: dict, times: dict) -> list:
+    if outcome["num_steps"] is None:
+        return []
+    regressions = []
+    if baseline is not None and outcome["num_steps"] > baseline["num_steps"]:
+        regressions.append("{} steps instead of {}".format(
+            outcome["num_steps"], baseline["num_steps"]))
+    if times is not None and outcome["time"] > TIME_TOLERANCE * times["time"] and outcome["time"] - times["time"] >= MIN_TIME_REGRESSION:
+        regressions.append("{:.1f} ms instead of {:.1f} ms".format(
+            outcome["time"] * 1e3, times["time"] * 1e3))
+    return regressions
+
+
+def load_json(filename: str) -> dict:
+    if not os.path.exists(filename):
+        return dict()
+    with open(filename) as f:
+        return json.load(f)
+
+
+def write_json(filename: str, data: dict):
+    with open(filename, "w") as f:
+        json.dump(data, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the automated tests.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="the number of worker processes")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="the file with the baseline steps")
+    parser.add_argument("--times", default=TIMES,
+                        help="the file with the times of an earlier run on this machine")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the steps of this run as the baseline, and its times as the times of this machine")
+    args = parser.parse_args()
+
+    print("Building...")
+    subprocess.run(["make", "-C", SRC_DIR, "build"], stdout=NULL)
+
+    baseline = load_json(args.baseline)
+    times = load_json(args.times)
+
+    tests = find_tests()
+    num_tests = len(tests)
+    passed_tests = 0
+    regressed_tests = []
+    new_baseline = dict()
+    new_times = dict()
+    total_time = 0
+    tmfile = None
+    start = time.perf_counter()
+    # the workers of an executor may start processes of their own, for the parallel search
+    with ProcessPoolExecutor(max(args.jobs, 1)) as executor:
+        for test, outcome in zip(tests, executor.map(run_test, tests)):
+            if test[0] != tmfile:
+                tmfile = test[0]
+                print("Running {} tests on {}...".format(
+                    os.path.basename(os.path.dirname(os.path.dirname(test[1]))), tmfile))
+            name = "{} {}".format(os.path.normpath(test[0]), os.path.normpath(test[1]))
+            details = ""
+            if outcome["num_steps"] is not None:
+                details = " ({} steps, {:.1f} ms)".format(
+                    outcome["num_steps"], outcome["time"] * 1e3)
+                new_baseline[name] = {"num_steps": outcome["num_steps"]}
+                new_times[name] = {"time": outcome["time"]}
+                total_time += outcome["time"]
+            if outcome["passed"]:
+                print("  \033[92mPASS\033[0m {}{}".format(test[1], details))
+                passed_tests += 1
+            else:
+                print("  \033[91mFAIL\033[0m {} ({}){}".format(
+                    test[1], outcome["reason"], details))
+            regressions = find_regressions(
+                outcome, baseline.get(name), times.get(name))
+            if regressions:
+                print("  \033[93mSLOW\033[0m {} ({})".format(
+                    test[1], ", ".join(regressions)))
+                regressed_tests.append(name)
+
+    if args.update_baseline:
+        write_json(args.baseline, new_baseline)
+        write_json(args.times, new_times)
+
+    print()
+    print("Summary:")
+    print("  {} out of {} tests passed".format(passed_tests, num_tests))
+    print("  {} tests regressed against the baseline".format(len(regressed_tests)))
+    print("  {:.2f} s simulating, {:.2f} s in total".format(
+        total_time, time.perf_counter() - start))
+    exit(0 if passed_tests == num_tests else 1)
@@ -0,0 +1,212 @@
+'''Run many tapes in one process, so that the start-up (Python, NumPy and parsing the machine) is paid only once.
+
+Jobs and results are newline-delimited JSON objects, and the results are written in the order of the jobs. A job holds
+the input word as "tape" and optionally an "id", which is copied into its result. A result holds the "exit" code that
+runtm.py would have returned, and either "accepted", "num_steps", "tape" and "stopped" as in TuringMachineResult, or an
+"error" message.
+
+The server additionally keeps the machines of earlier jobs, so each job sent to it also names its "machine" file and
+can set "nondeterministic" and the simulator "options" (the keyword arguments of parse_machine in SERVER_OPTIONS). The
+options that choose where files are written, or how many processes are started, are left to whoever starts the server.
+'''
+
+
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+import typing
+from turing.error import ExecutionError
+from turing.machine import exit_code
+from turing.parsing import parse_machine
+
+# the options a job sent to the server may set, with the type of their values and whether they apply to deterministic
+# and to nondeterministic machines
+SERVER_OPTIONS = {
+    "optimize": (bool, True, True),
+    "max_steps": (int, True, True),
+    "timeout": (float, True, True),
+    "jit": (bool, True, False),
+    "two_way": (bool, True, False),
+    "detect_loops": (bool, True, False),
+    "block_size": (int, True, False),
+    "scan_loops": (bool, True, False),
+    "deduplicate": (bool, False, True),
+    "remember_visited": (bool, False, True),
+    "strategy": (str, False, True),
+    "vectorized": (bool, False, True)
+}
+
+
+def read_tape(word: str) -> list:
+    '''Turn an input word into a tape the way runtm.py reads tape files, ignoring whitespace.
+    '''
+
+    return list(word.replace("\n", "").replace(" ", ""))
+
+
+def check_options(options: dict, deterministic: bool):
+    '''Check that the options of a job sent to the server are in SERVER_OPTIONS, apply to its kind of machine and have
+    values of the right type. The values themselves are checked by the simulator.
+
+    Raises:
+        ExecutionError -- naming the first option that is not accepted
+    '''
+
+    for name, value in sorted(options.items()):
+        if name not in SERVER_OPTIONS:
+            raise ExecutionError("option {} is not accepted by the server".format(name))
+        kind, for_deterministic, for_nondeterministic = SERVER_OPTIONS[name]
+        if not (for_deterministic if deterministic else for_nondeterministic):
+            raise ExecutionError("option {} does not apply to {}deterministic machines".format(
+                name, "" if deterministic else "non"))
+        # JSON numbers without a fraction are ints, and bool is a subclass of int
+        if isinstance(value, bool) != (kind is bool) or not isinstance(value, (int, float) if kind is float else kind):
+            raise ExecutionError("option {} must be of type {}, not {}".format(
+                name, kind.__name__, json.dumps(value)))
+        if kind in (int, float) and value < 0:
+            raise ExecutionError("option {} must not be negative, not {}".format(name, json.dumps(value)))
+
+
+def run_job(job: dict, get_machine: typing.Callable[[dict], typing.Any]) -> dict:
+    '''Run a single job.
+
+    Arguments:
+        job {dict} -- the job
+        get_machine {typing.Callable[[dict], typing.Any]} -- gives the simulator to run the job on
+
+    Returns:
+        dict -- the result
+    '''
+
+    if not isinstance(job, dict) or not isinstance(job.get("tape"), str):
+        return {"exit": 3, "error": "a job needs a tape"}
+    response = {"id": job["id"]} if "id" in job else {}
+    try:
+        result = get_machine(job).process_input(read_tape(job["tape"]))
+    except IOError:
+        response.update(exit=3, error="could not access machine description")
+    except ExecutionError as e:
+        response.update(exit=2, error=str(e))
+    else:
+        response.update(exit=exit_code(result), accepted=result.accepted, num_steps=result.num_steps,
+                        tape=result.tape_text, stopped=result.stopped)
+    return response
+
+
+def process_stream(lines: typing.Iterable[str], output: typing.TextIO, get_machine: typing.Callable[[dict], typing.Any]):
+    '''Run the jobs from lines of JSON, writing each result as soon as it is known.
+    '''
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError:
+            response = {"exit": 3, "error": "a job must be a JSON object"}
+        else:
+            response = run_job(job, get_machine)
+        output.write(json.dumps(response) + "\n")
+        output.flush()
+
+
+class MachineCache:
+    '''The machines of the server, by file, kind and options. A machine is parsed again when its file changes.
+    '''
+
+    def __init__(self):
+        self.machines = dict()
+        self.lock = threading.Lock()
+
+    def __call__(self, job: dict):
+        path = job.get("machine")
+        if not isinstance(path, str):
+            raise ExecutionError("a job needs a machine")
+        deterministic = not job.get("nondeterministic", False)
+        options = job.get("options", dict())
+        if not isinstance(options, dict):
+            raise ExecutionError("the options must be a JSON object")
+        check_options(options, deterministic)
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, deterministic, json.dumps(options, sort_keys=True))
+        with self.lock:
+            version, machine = self.machines.get(key, (None, None))
+            if version != (stat.st_mtime_ns, stat.st_size):
+                machine = parse_machine(
+                    path, deterministic=deterministic, **options)
+                self.machines[key] = ((stat.st_mtime_ns, stat.st_size), machine)
+        return machine
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        lines = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        output = io.TextIOWrapper(
+            self.wfile, encoding="utf-8", write_through=True)
+        try:
+            process_stream(lines, output, self.server.machines)
+        except ConnectionError:
+            # the client went away
+            pass
+        finally:
+            lines.detach()
+            output.detach()
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    '''A server on a Unix socket that runs the jobs of every connection on the machines it keeps.
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        if os.path.exists(path) and not is_listening(path):
+            # left behind by a server that did not shut down
+            os.unlink(path)
+        # only set once the socket is bound, so that a failed server does not remove the socket of another one
+        self.path = None
+        super().__init__(path, JobHandler)
+        self.path = path
+        self.machines = MachineCache()
+
+    def server_close(self):
+        super().server_close()
+        if self.path is not None:
+            os.unlink(self.path)
+
+
+class Client:
+    '''A connection to a Server.
+    '''
+
+    def __init__(self, path: str):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile("rw", encoding="utf-8")
+
+    def run(self, job: dict) -> dict:
+        '''Run a job on the server and wait for its result.
+        '''
+
+        self.file.write(json.dumps(job) + "\n")
+        self.file.flush()
+        return json.loads(self.file.readline())
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+def is_listening(path: str) -> bool:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        connection.close()
@@ -0,0 +1,120 @@
+'''Cache compiled machine descriptions, so that machine files do not have to be parsed on every run.
+
+A compiled machine is a HEADER, followed by the dense transition table (see TuringMachineDescriptionBuilder) and the
+alphabet and state names. It is stored under the hash of the machine file, so a cached machine is always up to date
+with the file it was compiled from. Loading maps the file into memory and views the table in place, without loading
+NumPy.
+'''
+
+
+import array
+import hashlib
+import math
+import mmap
+import os
+import struct
+import typing
+from turing.description import TuringMachineDescription, TABLE_TYPECODE
+from turing.lazy import LazyModule
+
+tempfile = LazyModule("tempfile")
+
+# bump whenever the layout changes, so older files are compiled again
+VERSION = 2
+# magic, version, deterministic, number of states, rows per state (letters to the power of the tapes), choices and
+# tapes, accept and reject states, and the sizes of the alphabet and state names in bytes; 44 bytes keep the table
+# aligned to its 4-byte entries
+HEADER = struct.Struct("<4s10I")
+MAGIC = b"TMC\0"
+# the directory to cache compiled machines in, instead of CACHE_DIRECTORY next to the machine file
+CACHE_ENVIRONMENT_VARIABLE = "TURING_CACHE_DIR"
+CACHE_DIRECTORY = "__tmcache__"
+
+
+def cache_directory(machine_file: str) -> str:
+    '''Get the directory the machines of a file are cached in: CACHE_DIRECTORY next to it, unless the
+    CACHE_ENVIRONMENT_VARIABLE is set.
+    '''
+
+    return os.environ.get(CACHE_ENVIRONMENT_VARIABLE) or os.path.join(
+        os.path.dirname(os.path.abspath(machine_file)), CACHE_DIRECTORY)
+
+
+def cache_path(machine_file: str, source: bytes, deterministic: bool, optimized: bool = False) -> str:
+    '''Get the file a machine is cached in.
+
+    Arguments:
+        machine_file {str} -- the name of the *.tm file
+        source {bytes} -- its contents
+        deterministic {bool} -- whether the machine is compiled for the deterministic simulator
+
+    Keyword Arguments:
+        optimized {bool} -- whether the machine is optimized (see turing.optimizer) (default: {False})
+
+    Returns:
+        str -- the name of the compiled file
+    '''
+
+    name = "{}.{}{}.tmc".format(hashlib.sha256(source).hexdigest(),
+                                "dtm" if deterministic else "ntm", ".opt" if optimized else "")
+    return os.path.join(cache_directory(machine_file), name)
+
+
+def save_description(path: str, description: TuringMachineDescription, deterministic: bool):
+    '''Write a compiled machine. The file is replaced atomically, so concurrent runs never see a partial file.
+    '''
+
+    shape = description.shape
+    num_choices = shape[2] if not deterministic else 1
+    alphabet = description.alphabet.encode()
+    states = "\n".join(description.states).encode()
+    header = HEADER.pack(MAGIC, VERSION, deterministic, shape[0], shape[1], num_choices, description.num_tapes,
+                         description.accepting, description.rejecting, len(alphabet), len(states))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(header)
+            f.write(description.entries)
+            f.write(alphabet)
+            f.write(states)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load_description(path: str, deterministic: bool) -> typing.Union[TuringMachineDescription, None]:
+    '''Read a compiled machine, if it exists and was written by this version.
+
+    The entries of the table are a copy-on-write view of the mapped file, so nothing is copied until it is modified. The description
+    has no transitions dictionary, as the simulators only use the table.
+
+    Returns:
+        typing.Union[TuringMachineDescription, None] -- the description, or None if there is no usable compiled file
+    '''
+
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < HEADER.size:
+        return None
+    magic, version, compiled_deterministic, num_states, num_rows, num_choices, num_tapes, accepting, rejecting, \
+        alphabet_size, states_size = HEADER.unpack_from(buffer)
+    width = 2 * num_tapes + 1
+    shape = (num_states, num_rows, width) if deterministic else (
+        num_states, num_rows, num_choices, width)
+    itemsize = array.array(TABLE_TYPECODE).itemsize
+    table_size = math.prod(shape) * itemsize
+    if magic != MAGIC or version != VERSION or compiled_deterministic != deterministic or \
+            len(buffer) != HEADER.size + table_size + alphabet_size + states_size:
+        return None
+    entries = memoryview(buffer)[HEADER.size:HEADER.size +
+                                 table_size].cast(TABLE_TYPECODE)
+    names = HEADER.size + table_size
+    alphabet = buffer[names:names + alphabet_size].decode()
+    states = buffer[names + alphabet_size:names +
+                    alphabet_size + states_size].decode().split("\n")
+    return TuringMachineDescription(alphabet, states, None, accepting, rejecting, entries, shape)
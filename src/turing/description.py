@@ -2,29 +2,112 @@
 '''
 
 
+from __future__ import annotations
 from abc import ABC, abstractmethod
 from turing.error import assert_property
-import turing.optimisations as optimisations
+from turing.lazy import LazyModule
+import array
+import math
 import typing
-import numpy as np
 
+np = LazyModule("numpy")
+optimisations = LazyModule("turing.optimisations")
 
-class TuringMachineDescription(typing.NamedTuple):
-    alphabet: str
-    states: list
-    transitions: dict
-    accepting: int
-    rejecting: int
+# the array typecode of the entries of the transition table, which are optimisations.LETTER
+TABLE_TYPECODE = "I"
+# optimisations.NO_TRANSITION, which is known here without loading NumPy
+NO_TRANSITION = 2 ** 32 - 1
+# the moves of the heads of a multi-tape machine, by their number in the table (optimisations.STAY being the last);
+# single-tape machines only move left or right
+MOVES = "LRS"
+# optimisations.MAX_TAPES
+MAX_TAPES = 16
+# the most entries of the dense table of a multi-tape machine, which grows with the number of letters to the power of
+# the number of tapes
+MAX_TABLE_SIZE = 1 << 26
+
+
+class TuringMachineDescription:
+    '''The compiled properties of a Turing machine.
+
+    The dense transition table is kept as the flat sequence of its entries in row-major order, and only viewed as an
+    array of the given shape (which loads NumPy) once table is first read.
+
+    A machine with k tapes has a row of the table for every k letters under its heads, and its entries hold the output
+    and the move of every tape (see TuringMachineDescriptionBuilder.compile_table).
+    '''
+
+    def __init__(self, alphabet: str, states: list, transitions: dict, accepting: int, rejecting: int, entries: typing.Sequence[int], shape: tuple):
+        '''Create a description.
+
+        Arguments:
+            alphabet {str} -- the letters, starting with the blank
+            states {list} -- the names of the states, starting with the initial one
+            transitions {dict} -- the transitions by state and letter number, or None for descriptions loaded from
+                turing.cache, which only have the table
+            accepting {int} -- the accepting state
+            rejecting {int} -- the rejecting state
+            entries {typing.Sequence[int]} -- the entries of the table, as a writable buffer of TABLE_TYPECODE items
+            shape {tuple} -- the shape of the table
+        '''
+
+        assert_property(len(entries) == math.prod(shape),
+                        "the table does not have the given shape")
+        self.alphabet = alphabet
+        self.states = states
+        self.transitions = transitions
+        self.accepting = accepting
+        self.rejecting = rejecting
+        self.entries = entries
+        self.shape = shape
+        # every entry holds the next state, and the output and move of every tape
+        self.num_tapes = (shape[-1] - 1) // 2
+        self._table = None
+
+    @property
+    def table(self) -> np.ndarray:
+        if self._table is None:
+            self._table = np.frombuffer(
+                self.entries, dtype=optimisations.LETTER).reshape(self.shape)
+        return self._table
+
+    def __reduce__(self):
+        # the entries may be a view of a mapped file, which cannot be pickled
+        entries = array.array(TABLE_TYPECODE)
+        entries.frombytes(memoryview(self.entries).cast("B"))
+        return TuringMachineDescription, (self.alphabet, self.states, self.transitions, self.accepting, self.rejecting,
+                                          entries, self.shape)
+
+
+def table_row(tape_input: typing.Union[int, tuple], num_letters: int) -> int:
+    # the letters under the heads of a multi-tape machine are the digits of its row, the first tape the most significant
+    if not isinstance(tape_input, tuple):
+        return tape_input
+    row = 0
+    for letter in tape_input:
+        row = row * num_letters + letter
+    return row
+
+
+def table_entry(transition: tuple) -> list:
+    # (to_state, tape_output, move_right), or (to_state, tape_outputs, moves) of a multi-tape machine
+    to_state, tape_output, move = transition
+    if not isinstance(tape_output, tuple):
+        return [to_state, tape_output, 1 if move else 0]
+    return [to_state] + [field for output_and_move in zip(tape_output, move) for field in output_and_move]
 
 
 class TuringMachineDescriptionBuilder:
-    def __init__(self, deterministic: bool = True):
+    def __init__(self, deterministic: bool = True, num_tapes: int = 1):
+        assert_property(0 < num_tapes <= MAX_TAPES,
+                        "the number of tapes must be between 1 and {}".format(MAX_TAPES))
         self.alphabet = set()
         self.states = dict()
         self.initial = None
         self.accepting = None
         self.rejecting = None
         self.deterministic = deterministic
+        self.num_tapes = num_tapes
 
     def add_letter(self, letter: str):
         assert_property(letter not in self.alphabet,
@@ -60,26 +143,52 @@ class TuringMachineDescriptionBuilder:
         self.rejecting = state
 
     def add_transition(self, from_state: str, tape_input: str, to_state: str, tape_output: str, move_right: bool):
+        assert_property(self.num_tapes == 1,
+                        "the transitions of a multi-tape machine need a letter for every tape")
+        self.verify_transition(from_state, to_state, (tape_input,), (tape_output,))
+        self.store_transition(from_state, tape_input,
+                              (to_state, tape_output, move_right))
+
+    def add_multitape_transition(self, from_state: str, tape_inputs: tuple, to_state: str, tape_outputs: tuple, moves: tuple):
+        '''Add a transition of a multi-tape machine.
+
+        Arguments:
+            from_state {str} -- the state
+            tape_inputs {tuple} -- the letter under the head of every tape
+            to_state {str} -- the next state
+            tape_outputs {tuple} -- the letter written on every tape
+            moves {tuple} -- the move of every head, as its number in MOVES
+        '''
+
+        assert_property(len(tape_inputs) == len(tape_outputs) == len(moves) == self.num_tapes,
+                        "the transition needs a letter and a move for each of the {} tapes".format(self.num_tapes))
+        assert_property(all(0 <= move < len(MOVES) for move in moves),
+                        "the moves must be one of {}".format(", ".join(MOVES)))
+        self.verify_transition(from_state, to_state, tape_inputs, tape_outputs)
+        self.store_transition(from_state, tuple(tape_inputs),
+                              (to_state, tuple(tape_outputs), tuple(moves)))
+
+    def verify_transition(self, from_state: str, to_state: str, tape_inputs: tuple, tape_outputs: tuple):
         assert_property(from_state in self.states,
                         "from state {} is not a valid state".format(from_state))
         assert_property(to_state in self.states,
                         "to state {} is not a valid state".format(to_state))
         assert_property(from_state not in (self.accepting, self.rejecting),
                         "the accept and reject states may not have outgoing transitions")
-        assert_property(tape_input in self.alphabet or tape_input ==
-                        "_", "tape input must be in the alphabet")
-        assert_property(tape_output in self.alphabet or tape_output ==
-                        "_", "tape output must be in alphabet")
+        assert_property(all(tape_input in self.alphabet or tape_input == "_" for tape_input in tape_inputs),
+                        "tape input must be in the alphabet")
+        assert_property(all(tape_output in self.alphabet or tape_output == "_" for tape_output in tape_outputs),
+                        "tape output must be in alphabet")
+
+    def store_transition(self, from_state: str, tape_input: typing.Union[str, tuple], transition: tuple):
         if self.deterministic:
             assert_property(
                 tape_input not in self.states[from_state], "transitions cannot be defined multiple times")
-            self.states[from_state][tape_input] = (
-                to_state, tape_output, move_right)
+            self.states[from_state][tape_input] = transition
         else:
             if tape_input not in self.states[from_state]:
                 self.states[from_state][tape_input] = list()
-            self.states[from_state][tape_input].append(
-                (to_state, tape_output, move_right))
+            self.states[from_state][tape_input].append(transition)
 
     def verify_validity(self):
         assert_property(self.accepting != None, "accept state must be defined")
@@ -94,6 +203,9 @@ class TuringMachineDescriptionBuilder:
         '''
 
         self.verify_validity()
+        if self.deterministic:
+            assert_property(len(self.alphabet) < 256,
+                            "the alphabet may contain at most 255 letters")
         alphabet = "_" + "".join(self.alphabet)
         states_dict = {self.initial: 0}
         states = [self.initial]
@@ -101,26 +213,100 @@ class TuringMachineDescriptionBuilder:
             if state != self.initial:
                 states_dict[state] = len(states)
                 states.append(state)
+        assert_property(len(states) * len(alphabet) ** self.num_tapes * (2 * self.num_tapes + 1) <= MAX_TABLE_SIZE,
+                        "the transition table of the machine would have more than {} entries".format(MAX_TABLE_SIZE))
+
+        def letters(tape_letters: typing.Union[str, tuple]) -> typing.Union[int, tuple]:
+            if isinstance(tape_letters, tuple):
+                return tuple(alphabet.index(letter) for letter in tape_letters)
+            return alphabet.index(tape_letters)
+
         if self.deterministic:
             transitions = {
                 states_dict[state]: {
-                    alphabet.index(input_letter): (
+                    letters(input_letter): (
                         states_dict[to_state],
-                        alphabet.index(tape_output),
+                        letters(tape_output),
                         move_right
                     ) for input_letter, (to_state, tape_output, move_right) in input_letters.items()
                 } for state, input_letters in self.states.items()}
+            entries, shape = self.compile_table(
+                transitions, len(states), len(alphabet), self.num_tapes)
         else:
             transitions = {
                 states_dict[state]: {
-                    alphabet.index(input_letter): np.array([
-                        [
+                    letters(input_letter): [
+                        (
                             states_dict[to_state],
-                            alphabet.index(tape_output),
-                            1 if move_right else 0
-                        ] for (to_state, tape_output, move_right) in transitions
-                    ], dtype=optimisations.LETTER) for input_letter, transitions in input_letters.items()
+                            letters(tape_output),
+                            move_right if isinstance(move_right, tuple) else 1 if move_right else 0
+                        ) for (to_state, tape_output, move_right) in transitions
+                    ] for input_letter, transitions in input_letters.items()
                 } for state, input_letters in self.states.items()}
+            entries, shape = self.compile_nondeterministic_table(
+                transitions, len(states), len(alphabet), self.num_tapes)
         accepting = states_dict[self.accepting]
         rejecting = states_dict[self.rejecting]
-        return TuringMachineDescription(alphabet, states, transitions, accepting, rejecting)
+        return TuringMachineDescription(alphabet, states, transitions, accepting, rejecting, entries, shape)
+
+    @staticmethod
+    def compile_table(transitions: dict, num_states: int, num_letters: int, num_tapes: int = 1) -> typing.Tuple[array.array, tuple]:
+        '''Compile deterministic transitions into a dense table indexed by state and letter.
+
+        The table of a multi-tape machine is indexed by state and the letters under all heads instead, as the digits of
+        a number in base num_letters (the first tape being the most significant), and its entries hold the output and
+        move of every tape in turn.
+
+        Arguments:
+            transitions {dict} -- the transitions by state and letter number (or tuple of letter numbers)
+            num_states {int} -- the number of states
+            num_letters {int} -- the number of letters (including the blank)
+
+        Keyword Arguments:
+            num_tapes {int} -- the number of tapes (default: {1})
+
+        Returns:
+            typing.Tuple[array.array, tuple] -- the flat (to_state, tape_output, move_right) entries, or
+                (to_state, tape_output_1, move_1, ..., tape_output_k, move_k) with moves numbered as in MOVES, with
+                NO_TRANSITION as to_state if undefined, and the shape of the table
+        '''
+
+        width = 2 * num_tapes + 1
+        num_rows = num_letters ** num_tapes
+        entries = array.array(TABLE_TYPECODE, [NO_TRANSITION] + [0] * (width - 1)) * (num_states * num_rows)
+        for state, input_letters in transitions.items():
+            for input_letter, transition in input_letters.items():
+                i = (state * num_rows + table_row(input_letter, num_letters)) * width
+                entries[i:i + width] = array.array(TABLE_TYPECODE, table_entry(transition))
+        return entries, (num_states, num_rows, width)
+
+    @staticmethod
+    def compile_nondeterministic_table(transitions: dict, num_states: int, num_letters: int, num_tapes: int = 1) -> typing.Tuple[array.array, tuple]:
+        '''Compile nondeterministic transitions into a dense table indexed by state, letter and choice, with the rows
+        and entries of multi-tape machines as in compile_table.
+
+        Arguments:
+            transitions {dict} -- the lists of transitions by state and letter number (or tuple of letter numbers)
+            num_states {int} -- the number of states
+            num_letters {int} -- the number of letters (including the blank)
+
+        Keyword Arguments:
+            num_tapes {int} -- the number of tapes (default: {1})
+
+        Returns:
+            typing.Tuple[array.array, tuple] -- the flat entries in the order in which they were defined, padded with
+                NO_TRANSITION as to_state up to the largest number of choices, and the shape of the table
+        '''
+
+        width = 2 * num_tapes + 1
+        num_rows = num_letters ** num_tapes
+        num_choices = max([len(choices) for input_letters in transitions.values()
+                           for choices in input_letters.values()], default=1)
+        entries = array.array(TABLE_TYPECODE, [NO_TRANSITION] + [0] * (width - 1)) * (
+            num_states * num_rows * num_choices)
+        for state, input_letters in transitions.items():
+            for input_letter, choices in input_letters.items():
+                i = (state * num_rows + table_row(input_letter, num_letters)) * num_choices * width
+                entries[i:i + width * len(choices)] = array.array(TABLE_TYPECODE,
+                                                                  [field for choice in choices for field in table_entry(choice)])
+        return entries, (num_states, num_rows, num_choices, width)
@@ -0,0 +1,301 @@
+'''Generate a simulator for each deterministic machine.
+
+The interpreter in optimisations.run_deterministic looks up every step in the transition table. The engine generated
+here has the table built into its code instead: every state is a label with a switch on the letter under the head,
+and every transition writes its letter, moves, counts its step and jumps straight to the label of its next state. It
+is written as C inside a Cython module and built with the same Cython toolchain as setup.py, or, if that is not
+available, as Python source.
+
+Engines are cached under the hash of the table, like compiled machines (see turing.cache), so later runs of the same
+machine load the built module instead of generating it again. An engine runs single-tape machines on a bytearray, and
+takes exactly the same steps as optimisations.run_deterministic.
+'''
+
+
+import contextlib
+import hashlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import typing
+from turing.description import TuringMachineDescription, NO_TRANSITION
+from turing.error import assert_property
+from turing.lazy import LazyModule
+
+tempfile = LazyModule("tempfile")
+
+# bump whenever the generated code changes, so older engines are generated again
+VERSION = 1
+# why an engine returned: its head left the bytearray (and it is to be called again once it was grown), it halted, or
+# it reached the step limit
+GROW = 0
+ACCEPTED = 1
+REJECTED = 2
+LIMIT = 3
+
+C_TEMPLATE = '''\
+# cython: language_level=3
+
+cdef extern from *:
+    """
+    static int tm_run(unsigned char *cells, Py_ssize_t size, int two_way, long long max_steps, unsigned int *state,
+                      Py_ssize_t *position, Py_ssize_t *lowest, long long *num_steps) {{
+        Py_ssize_t p = *position;
+        Py_ssize_t low = *lowest;
+        long long n = *num_steps;
+        int status;
+        switch (*state) {{
+{entry}
+        }}
+{states}
+    done:
+        *position = p;
+        *lowest = low;
+        *num_steps = n;
+        return status;
+    }}
+    """
+    int tm_run(unsigned char *cells, Py_ssize_t size, int two_way, long long max_steps, unsigned int *state,
+               Py_ssize_t *position, Py_ssize_t *lowest, long long *num_steps) nogil
+
+
+def run(unsigned char[::1] cells not None, unsigned int state, Py_ssize_t position, Py_ssize_t lowest,
+        long long num_steps, long long max_steps, bint two_way):
+    cdef unsigned char* first = &cells[0]
+    cdef int status
+    with nogil:
+        status = tm_run(first, cells.shape[0], two_way, max_steps, &state, &position, &lowest, &num_steps)
+    return status, state, position, lowest, num_steps
+'''
+
+PYTHON_TEMPLATE = '''\
+def run(cells, state, position, lowest, num_steps, max_steps, two_way):
+    size = len(cells)
+    while True:
+{states}
+'''
+
+
+def machine_hash(description: TuringMachineDescription) -> str:
+    '''Hash everything the engine of a machine is generated from.
+    '''
+
+    digest = hashlib.sha256("{} {} {} {}".format(
+        VERSION, description.shape, description.accepting, description.rejecting).encode())
+    digest.update(description.entries.tobytes())
+    return digest.hexdigest()
+
+
+def transitions(description: TuringMachineDescription) -> typing.Iterator[typing.Tuple[int, int, int, int, int]]:
+    # (state, letter, to_state, output, move_right) for every defined entry of the table
+    entries = description.entries
+    num_states, num_letters = description.shape[:2]
+    for state in range(num_states):
+        for letter in range(num_letters):
+            i = (state * num_letters + letter) * 3
+            if entries[i] != NO_TRANSITION:
+                yield state, letter, entries[i], entries[i + 1], entries[i + 2]
+
+
+def generate_c(description: TuringMachineDescription) -> str:
+    '''Generate the Cython module of the engine of a machine, whose run function is a C function with a label for every
+    state.
+    '''
+
+    halting = {description.accepting: ACCEPTED,
+               description.rejecting: REJECTED}
+    cases = [[] for _ in range(description.shape[0])]
+    for state, letter, to_state, output, move_right in transitions(description):
+        code = ["case {}:".format(letter)]
+        if output != letter:
+            code.append("cells[p] = {};".format(output))
+        if move_right:
+            code.append("p++;")
+        else:
+            code.append(
+                "if (p > 0) { p--; if (p < low) low = p; } else if (two_way) { p = low = -1; }")
+        if to_state in halting:
+            code.append("*state = {}; status = {}; goto done;".format(
+                to_state, halting[to_state]))
+        else:
+            code.append(
+                "if (n == max_steps) {{ *state = {}; status = {}; goto done; }}".format(to_state, LIMIT))
+            code.append("n++;")
+            code.append("if ({}) {{ *state = {}; status = {}; goto done; }}".format(
+                "p == size" if move_right else "p < 0", to_state, GROW))
+            code.append("goto s{};".format(to_state))
+        cases[state].append(" ".join(code))
+    entry = "\n".join("        case {0}: goto s{0};".format(state)
+                      for state in range(len(cases)))
+    states = []
+    for state, state_cases in enumerate(cases):
+        states.append("    s{}:".format(state))
+        states.append("        switch (cells[p]) {")
+        states.extend("        " + case for case in state_cases)
+        states.append(
+            "        default: *state = {}; status = {}; goto done;".format(state, REJECTED))
+        states.append("        }")
+    return C_TEMPLATE.format(entry=entry, states="\n".join(states))
+
+
+def generate_python(description: TuringMachineDescription) -> str:
+    '''Generate the Python source of the engine of a machine. Each state is a loop that runs as long as the machine
+    stays in it, with a branch for every letter.
+    '''
+
+    halting = {description.accepting: ACCEPTED,
+               description.rejecting: REJECTED}
+    cases = [[] for _ in range(description.shape[0])]
+    for state, letter, to_state, output, move_right in transitions(description):
+        code = ["if letter == {}:".format(letter)]
+        if output != letter:
+            code.append("    cells[position] = {}".format(output))
+        if move_right:
+            code.append("    position += 1")
+        else:
+            code += ["    if position > 0:",
+                     "        position -= 1",
+                     "        if position < lowest:",
+                     "            lowest = position",
+                     "    elif two_way:",
+                     "        position = lowest = -1"]
+        result = "{}, position, lowest, num_steps".format(to_state)
+        if to_state in halting:
+            code.append("    return {}, {}".format(
+                halting[to_state], result))
+        else:
+            code += ["    if num_steps == max_steps:",
+                     "        return {}, {}".format(LIMIT, result),
+                     "    num_steps += 1",
+                     "    if {}:".format(
+                         "position == size" if move_right else "position < 0"),
+                     "        return {}, {}".format(GROW, result)]
+            code += ["    continue"] if to_state == state else [
+                "    state = {}".format(to_state), "    break"]
+        cases[state].append(code)
+    lines = []
+    for state, state_cases in enumerate(cases):
+        lines.append("{} state == {}:".format(
+            "if" if state == 0 else "elif", state))
+        lines.append("    while True:")
+        lines.append("        letter = cells[position]")
+        for code in state_cases:
+            lines.extend("        " + line for line in code)
+        lines.append("        return {}, {}, position, lowest, num_steps".format(
+            REJECTED, state))
+    return PYTHON_TEMPLATE.format(states="\n".join("        " + line for line in lines))
+
+
+def load_module(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_extension(name: str, source: str, path: str):
+    '''Build a Cython module with the settings of setup.py, and move it to path.
+    '''
+
+    from Cython.Build import cythonize
+    from setuptools import Distribution, Extension
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(path)) as build_directory:
+        pyx = os.path.join(build_directory, name + ".pyx")
+        with open(pyx, "w") as f:
+            f.write(source)
+        # the build reports its progress on standard output, which is where runtm writes its results
+        with contextlib.redirect_stdout(sys.stderr):
+            extensions = cythonize([Extension(name, sources=[pyx])], compiler_directives={"language_level": 3},
+                                   build_dir=build_directory, quiet=True)
+            command = Distribution({"ext_modules": extensions}).get_command_obj("build_ext")
+            command.build_lib = build_directory
+            command.build_temp = build_directory
+            command.ensure_finalized()
+            command.run()
+        os.replace(command.get_ext_fullpath(name), path)
+
+
+def write_source(source: str, path: str):
+    # replaced atomically, as turing.cache.save_description
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(descriptor, "w") as f:
+            f.write(source)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load_engine(description: TuringMachineDescription, directory: str, compiled: bool = True) -> typing.Callable:
+    '''Load the engine of a single-tape deterministic machine from the cache, and generate it there if it is not yet.
+
+    Arguments:
+        description {TuringMachineDescription} -- the description
+        directory {str} -- the directory to cache engines in
+
+    Keyword Arguments:
+        compiled {bool} -- whether to build the engine as a Cython module; if that fails (for example because Cython or
+            a C compiler is missing), or if this is not set, the engine is Python source (default: {True})
+
+    Returns:
+        typing.Callable -- the run function of the engine, for run
+    '''
+
+    assert_property(description.num_tapes == 1 and len(description.shape) == 3,
+                    "engines can only be generated for single-tape deterministic machines")
+    name = "tmjit_" + machine_hash(description)[:32]
+    os.makedirs(directory, exist_ok=True)
+    extension_path = os.path.join(
+        directory, name + importlib.machinery.EXTENSION_SUFFIXES[0])
+    python_path = os.path.join(directory, name + ".py")
+    if compiled:
+        if not os.path.exists(extension_path):
+            try:
+                build_extension(name, generate_c(description), extension_path)
+            except Exception:
+                # the Python engine is only slower
+                pass
+        if os.path.exists(extension_path):
+            return load_module(name, extension_path).run
+    if not os.path.exists(python_path):
+        write_source(generate_python(description), python_path)
+    return load_module(name, python_path).run
+
+
+def run(engine: typing.Callable, cells: bytearray, two_way: bool = False, max_steps: int = -1) -> typing.Tuple[int, bool, bool, bytearray]:
+    '''Run an engine on a tape until it halts or reaches the step limit, growing the tape as the head leaves it.
+
+    Arguments:
+        engine {typing.Callable} -- the run function of load_engine
+        cells {bytearray} -- the numbers of the letters of the input word, which are overwritten by the run
+
+    Keyword Arguments:
+        two_way {bool} -- whether the tape is infinite in both directions (default: {False})
+        max_steps {int} -- the step limit, or -1 (default: {-1})
+
+    Returns:
+        typing.Tuple[int, bool, bool, bytearray] -- the number of steps, whether the machine accepted, whether it
+            reached the step limit, and the cells from the lowest visited one onwards
+    '''
+
+    state, position, lowest, num_steps = 0, 0, 0, 0
+    while True:
+        status, state, position, lowest, num_steps = engine(
+            cells, state, position, lowest, num_steps, max_steps, two_way)
+        if status != GROW:
+            break
+        if position < 0:
+            grown = len(cells)
+            cells[:0] = bytes(grown)
+            position += grown
+            lowest += grown
+        else:
+            cells.extend(bytes(len(cells)))
+    # a head that halts just left of the tape has visited a blank cell there
+    if lowest < 0:
+        cells[:0] = bytes(-lowest)
+        lowest = 0
+    return num_steps, status == ACCEPTED, status == LIMIT, cells[lowest:]
@@ -0,0 +1,21 @@
+'''Import heavy modules on first use.
+
+NumPy and the compiled simulators take most of the start-up time of runtm, but short deterministic runs need neither
+(see DeterministicTuringMachine.process_input). The modules of the package refer to them through a LazyModule, which
+imports the module the first time one of its attributes is read.
+'''
+
+
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    '''A stand-in for a module that is imported when first used. Afterwards it holds the attributes of the module, so
+    reading them is as fast as from the module itself.
+    '''
+
+    def __getattr__(self, attribute: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attribute)
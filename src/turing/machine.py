@@ -2,23 +2,63 @@
 '''
 
 
+from __future__ import annotations
 import typing
 import sys
 import itertools
 import os
-import numpy as np
+import time
 from abc import ABC, abstractmethod
-from turing.description import TuringMachineDescription
+from turing.description import TuringMachineDescription, NO_TRANSITION
 from turing.error import assert_property, TuringMachineError
-import turing.optimisations as optimisations
+from turing.lazy import LazyModule
+from turing.rendering import Renderer
+from turing.trace import TraceWriter
+import turing.tapes as tapes
+
+np = LazyModule("numpy")
+optimisations = LazyModule("turing.optimisations")
+optimizer = LazyModule("turing.optimizer")
+jit = LazyModule("turing.jit")
+parallel = LazyModule("turing.parallel")
+
+# the result of each input in DeterministicTuringMachine.process_batch, as a NumPy dtype
+BATCH_RESULT = [("accepted", "?"), ("num_steps", "i8"), ("stopped", "O")]
+# until the compiled simulator is loaded, inputs up to this many letters are first run on a bytearray, which is faster
+# than loading it for short runs
+MAX_SMALL_INPUT = 1024
+# the number of steps after which a run on a bytearray is given up and restarted on the compiled simulator; at about
+# 200 ns per step, this bounds the time lost to about half the time it takes to load NumPy and the compiled simulator
+MAX_SMALL_STEPS = 1 << 17
+# the width of a level of the breadth-first search from which it is searched with arrays, if it is vectorized
+MIN_VECTORIZED_FRONTIER = 1024
 
 
 class TuringMachineResult:
-    def __init__(self, num_steps: int, accepted: bool, tape: typing.Union[typing.List[str], None]):
+    def __init__(self, num_steps: int, accepted: bool, tape: typing.Union[typing.List[str], tapes.OutputTape, None], stopped: str = None, profile: optimisations.Profile = None, branch: typing.List[int] = None):
+        '''Create the result of a run.
+
+        Arguments:
+            num_steps {int} -- the number of steps
+            accepted {bool} -- whether the machine accepted
+            tape {typing.Union[typing.List[str], tapes.OutputTape, None]} -- the output tape, if there is one, as a
+                list of letters or as the numbers of its letters, which are only turned into text when needed
+
+        Keyword Arguments:
+            stopped {str} -- why the run stopped before the machine halted (optimisations.STEP_LIMIT, TIME_LIMIT or
+                LOOP), in which case the result is undecided (default: {None})
+            profile {optimisations.Profile} -- the counters of the run, if it was profiled (default: {None})
+            branch {typing.List[int]} -- the choices of transition along the accepting branch of a nondeterministic
+                machine, if it was recorded (default: {None})
+        '''
+
         self.num_steps = num_steps
         self.accepted = accepted
-        if tape is None:
-            self.tape = None
+        self.stopped = stopped
+        self.profile = profile
+        self.branch = branch
+        if tape is None or isinstance(tape, tapes.OutputTape):
+            self.tape = tape
         else:
             for i, letter in enumerate(reversed(tape)):
                 if letter != "_":
@@ -27,16 +67,49 @@ class TuringMachineResult:
             if self.tape == []:
                 self.tape = ["_"]
 
+    @property
+    def halted(self) -> bool:
+        return self.stopped is None
+
+    @property
+    def tape_text(self) -> typing.Union[str, None]:
+        if self.tape is None:
+            return None
+        return self.tape.text() if isinstance(self.tape, tapes.OutputTape) else "".join(self.tape)
+
+    @property
+    def verdict(self) -> str:
+        return self.stopped if self.stopped is not None else "accepted" if self.accepted else "not accepted"
+
     def __str__(self):
-        return ("accepted" if self.accepted else "not accepted") + os.linesep + str(self.num_steps) + ((os.linesep + "".join(self.tape)) if self.tape is not None else "")
+        return self.verdict + os.linesep + str(self.num_steps) + ((os.linesep + self.tape_text) if self.tape is not None else "")
+
+    def write(self, f: typing.BinaryIO, encoding: str = "utf-8"):
+        '''Write the result as str does, followed by a newline, streaming the output tape instead of building its text.
+        '''
+
+        f.write((self.verdict + os.linesep + str(self.num_steps)).encode(encoding))
+        if isinstance(self.tape, tapes.OutputTape):
+            f.write(os.linesep.encode(encoding))
+            self.tape.write(f, encoding)
+        elif self.tape is not None:
+            f.write((os.linesep + "".join(self.tape)).encode(encoding))
+        f.write(b"\n")
+
+
+def exit_code(result: TuringMachineResult) -> int:
+    '''Get the exit code of runtm.py for a result.
+    '''
+
+    return 4 if not result.halted else 0 if result.accepted else 1
 
 
 class DeterministicTuringMachineConfiguration:
     state: int
-    tape: np.array
+    tape: optimisations.Tape
     position: int
 
-    def __init__(self, state: int, tape: np.array, position: int):
+    def __init__(self, state: int, tape: optimisations.Tape, position: int):
         self.state = state
         self.tape = tape
         self.position = position
@@ -44,47 +117,345 @@ class DeterministicTuringMachineConfiguration:
 
 class DeterministicTuringMachine:
 
-    def __init__(self, description: TuringMachineDescription):
+    def __init__(self, description: TuringMachineDescription, two_way: bool = False, max_steps: int = None, timeout: float = None, detect_loops: bool = False, block_size: int = None, cache_size: int = None, profile: bool = False, scan_loops: bool = False, jit_directory: str = None, jit_compiled: bool = True):
+        '''Create a deterministic Turing machine simulator.
+
+        Arguments:
+            description {TuringMachineDescription} -- the machine description
+
+        Keyword Arguments:
+            two_way {bool} -- whether the tape is infinite in both directions instead of starting at the first input
+                letter (default: {False})
+            max_steps {int} -- the number of steps after which a run is stopped as undecided (default: {None})
+            timeout {float} -- the number of seconds after which a run is stopped as undecided (default: {None})
+            detect_loops {bool} -- whether to stop a run as soon as a configuration repeats (default: {False})
+            block_size {int} -- if set, runs are simulated on blocks of this many cells with optimisations.MacroMachine,
+                which crosses long runs of identical blocks in one go (default: {None})
+            cache_size {int} -- the number of block transitions the macro machine remembers; the cache is kept across
+                runs (default: {None}, which is optimisations.DEFAULT_CACHE_SIZE)
+            profile {bool} -- whether to count the transitions and head positions of every run in an
+                optimisations.Profile, which is returned with its result (default: {False})
+            scan_loops {bool} -- whether to cross the scans of single-tape machines (see turing.optimizer.scan_table)
+                in one go, when the steps are neither shown, traced, profiled nor checked for loops; every cell still
+                counts as a step (default: {False})
+            jit_directory {str} -- if set, single-tape runs that are neither shown, traced, profiled, timed nor
+                checked for loops are simulated by an engine generated for the machine (see turing.jit), which is
+                cached in this directory (default: {None})
+            jit_compiled {bool} -- whether the engine is built as a Cython module rather than as Python source (see
+                turing.jit.load_engine) (default: {True})
+        '''
+
+        if block_size is not None:
+            assert_property(0 < block_size <= optimisations.MAX_BLOCK_SIZE,
+                            "the block size must be between 1 and {}".format(optimisations.MAX_BLOCK_SIZE))
+        assert_property(block_size is None or not detect_loops,
+                        "loops cannot be detected when simulating blocks")
+        assert_property(block_size is None or not profile,
+                        "runs cannot be profiled when simulating blocks")
+        assert_property(description.num_tapes == 1 or (block_size is None and not detect_loops and not profile),
+                        "multi-tape machines cannot be simulated on blocks, checked for loops or profiled")
         self.description = description
+        self.two_way = two_way
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.detect_loops = detect_loops
+        self.profile = profile
+        self.scan_loops = scan_loops
+        self.macro_machine = None if block_size is None else optimisations.MacroMachine(
+            description.table, description.accepting, description.rejecting, block_size,
+            optimisations.DEFAULT_CACHE_SIZE if cache_size is None else cache_size)
+        # the flat transition table of run_small, and the table with the scans marked, once they are needed
+        self.small_table = None
+        self.scan_table = None
+        self.jit_directory = jit_directory
+        self.jit_compiled = jit_compiled
+        # the run function of the generated engine, once it is needed
+        self.engine = None
+
+    def process_input(self, input: typing.Union[list, typing.ByteString], verbose: typing.Union[bool, Renderer] = False, trace: str = None) -> TuringMachineResult:
+        '''Run the machine on an input word.
 
-    def process_input(self, input: list, verbose: bool = False) -> TuringMachineResult:
-        if len(input) == 0:
+        Arguments:
+            input {typing.Union[list, typing.ByteString]} -- the input word, as a list of letters or as the contents of
+                a tape file (see turing.tapes)
+
+        Keyword Arguments:
+            verbose {typing.Union[bool, Renderer]} -- whether to print every configuration, or the rendering.Renderer
+                that prints them (default: {False})
+            trace {str} -- the file to record the run in, to be replayed with turing.trace.Trace; runs cannot be
+                both verbose or profiled and traced (default: {None})
+
+        The input is written on the first tape of a multi-tape machine, and the other tapes start blank. Their runs
+        cannot be verbose or traced.
+
+        Returns:
+            TuringMachineResult -- the result
+        '''
+
+        encoded = not isinstance(input, list)
+        if not encoded and len(input) == 0:
             input = ["_"]
+        letters = None
+        plain = not verbose and trace is None and not self.profile and not self.detect_loops and \
+            self.timeout is None and self.macro_machine is None and self.description.num_tapes == 1
+        if plain and self.jit_directory is not None:
+            return self.run_jit(bytearray(tapes.decode_letters(input, self.description.alphabet) if encoded else
+                                          self.encode(input)))
+        if plain and len(input) <= MAX_SMALL_INPUT and optimisations.__name__ not in sys.modules:
+            letters = tapes.decode_letters(
+                input, self.description.alphabet) if encoded else self.encode(input)
+            result = self.run_small(bytearray(letters))
+            if result is not None:
+                return result
+        if encoded and letters is None:
+            tape = tapes.read_tape(
+                input, self.description.alphabet, self.two_way)
+        else:
+            tape = optimisations.Tape(self.encode(input) if letters is None else letters,
+                                      two_way=self.two_way)
+        deadline = -1 if self.timeout is None else time.monotonic() + self.timeout
+        if self.description.num_tapes > 1:
+            assert_property(not verbose and trace is None,
+                            "runs of multi-tape machines cannot be verbose or traced")
+            return self.run_multitape(tape, deadline)
+        if trace is not None:
+            assert_property(not verbose and not self.profile,
+                            "verbose or profiled runs cannot be traced")
+            with TraceWriter(trace, self.description, self.two_way) as writer:
+                writer.write_checkpoint(0, 0, tape)
+                num_steps, accepted, stopped = optimisations.run_deterministic(
+                    self.description.table, tape, self.description.accepting, self.description.rejecting,
+                    -1 if self.max_steps is None else self.max_steps, deadline, self.detect_loops, trace=writer)
+            return TuringMachineResult(num_steps, accepted, tapes.OutputTape(tape.to_array(), self.description.alphabet), stopped)
+        profile = optimisations.Profile(
+            *self.description.table.shape[:2]) if self.profile else None
+        if not verbose and self.macro_machine is not None:
+            num_steps, accepted, stopped = self.macro_machine.run(
+                tape, -1 if self.max_steps is None else self.max_steps, deadline)
+            return TuringMachineResult(num_steps, accepted, tapes.OutputTape(tape.to_array(), self.description.alphabet), stopped)
+        if not verbose:
+            scan = self.scan_loops and profile is None and not self.detect_loops
+            if scan and self.scan_table is None:
+                self.scan_table = optimizer.scan_table(self.description)
+            num_steps, accepted, stopped = optimisations.run_deterministic(
+                self.scan_table if scan else self.description.table, tape, self.description.accepting,
+                self.description.rejecting, -1 if self.max_steps is None else self.max_steps, deadline,
+                self.detect_loops, profile, scan=scan)
+            return TuringMachineResult(num_steps, accepted, tapes.OutputTape(tape.to_array(), self.description.alphabet), stopped, profile)
+        renderer = verbose if isinstance(
+            verbose, Renderer) else Renderer(self.description)
+        configuration = DeterministicTuringMachineConfiguration(0, tape, 0)
+        num_steps = 0
+        # Brent's algorithm, see optimisations.run_deterministic
+        snapshot, snapshot_step, snapshot_interval = self.snapshot(
+            configuration), 0, 1
+        renderer.show_tape(0, configuration.state,
+                           configuration.tape, configuration.position)
+        try:
+            while True:
+                self.perform_step(configuration, profile)
+                if profile is not None:
+                    profile.max_tape_length = len(configuration.tape)
+                halted = configuration.state in (
+                    self.description.accepting, self.description.rejecting)
+                stopped = None
+                if halted:
+                    pass
+                elif num_steps == self.max_steps:
+                    stopped = optimisations.STEP_LIMIT
+                elif self.detect_loops and self.snapshot(configuration) == snapshot:
+                    stopped = optimisations.LOOP
+                elif deadline >= 0 and time.monotonic() > deadline:
+                    stopped = optimisations.TIME_LIMIT
+                # the last configuration is shown even if it is not sampled
+                renderer.show_tape(num_steps + 1, configuration.state, configuration.tape, configuration.position,
+                                   halted or stopped is not None)
+                if halted:
+                    return TuringMachineResult(num_steps, configuration.state == self.description.accepting, tapes.OutputTape(configuration.tape.to_array(), self.description.alphabet), profile=profile)
+                if stopped is not None:
+                    return TuringMachineResult(num_steps + (stopped != optimisations.STEP_LIMIT), False, tapes.OutputTape(configuration.tape.to_array(), self.description.alphabet), stopped, profile)
+                num_steps += 1
+                if self.detect_loops and num_steps - snapshot_step == snapshot_interval:
+                    snapshot, snapshot_step, snapshot_interval = self.snapshot(
+                        configuration), num_steps, snapshot_interval * 2
+        finally:
+            renderer.flush()
+
+    def encode(self, input: list) -> typing.List[int]:
         try:
-            tape = np.array([self.description.alphabet.index(x)
-                             for x in input], dtype=np.uint8)
+            return [self.description.alphabet.index(x) for x in input]
         except ValueError:
             raise TuringMachineError("input contains invalid characters")
-        configuration = DeterministicTuringMachineConfiguration(0, tape, 0)
-        num_steps = 0
-        if verbose:
-            self.print_configuration(configuration)
+
+    def run_small(self, cells: bytearray) -> typing.Union[TuringMachineResult, None]:
+        '''Run the machine on a bytearray in pure Python, step by step as optimisations.run_deterministic. This avoids
+        loading NumPy and the compiled simulator, which takes longer than a short run.
+
+        Arguments:
+            cells {bytearray} -- the numbers of the letters of the input word, which are overwritten by the run
+
+        Returns:
+            typing.Union[TuringMachineResult, None] -- the result, or None if the machine did not halt within
+                MAX_SMALL_STEPS steps
+        '''
+
+        alphabet = self.description.alphabet
+        if self.small_table is None:
+            self.small_table = self.description.entries.tolist()
+        table = self.small_table
+        num_letters = self.description.shape[1]
+        accepting, rejecting = self.description.accepting, self.description.rejecting
+        two_way = self.two_way
+        max_steps = -1 if self.max_steps is None else self.max_steps
+        # cell i of the tape is cells[i + origin]
+        origin, lowest, highest = 0, 0, len(cells) - 1
+        state, position, num_steps = 0, 0, 0
+        stopped = None
         while True:
-            self.perform_step(configuration)
-            if verbose:
-                self.print_configuration(configuration)
-            if configuration.state == self.description.accepting:
-                return TuringMachineResult(num_steps, True, [self.description.alphabet[x] for x in configuration.tape])
-            if configuration.state == self.description.rejecting:
-                return TuringMachineResult(num_steps, False, [self.description.alphabet[x] for x in configuration.tape])
+            i = (state * num_letters + cells[position + origin]) * 3
+            to_state = table[i]
+            if to_state == NO_TRANSITION:
+                state = rejecting
+                break
+            cells[position + origin] = table[i + 1]
+            if table[i + 2]:
+                position += 1
+                if position + origin == len(cells):
+                    cells.extend(bytes(len(cells)))
+                if position > highest:
+                    highest = position
+            elif position > 0 or two_way:
+                position -= 1
+                if position + origin < 0:
+                    origin += len(cells)
+                    cells[:0] = bytes(len(cells))
+                if position < lowest:
+                    lowest = position
+            state = to_state
+            if state == accepting or state == rejecting:
+                break
+            if num_steps == max_steps:
+                stopped = optimisations.STEP_LIMIT
+                break
+            if num_steps == MAX_SMALL_STEPS:
+                return None
             num_steps += 1
+        return TuringMachineResult(num_steps, state == accepting, tapes.OutputTape(cells[lowest + origin:highest + origin + 1], alphabet), stopped)
 
-    def perform_step(self, configuration: DeterministicTuringMachineConfiguration):
+    def run_jit(self, cells: bytearray) -> TuringMachineResult:
+        '''Run the machine on a bytearray with its generated engine (see turing.jit), which takes the same steps as
+        optimisations.run_deterministic.
+        '''
+
+        if self.engine is None:
+            self.engine = jit.load_engine(
+                self.description, self.jit_directory, self.jit_compiled)
+        num_steps, accepted, limited, cells = jit.run(
+            self.engine, cells, self.two_way, -1 if self.max_steps is None else self.max_steps)
+        return TuringMachineResult(num_steps, accepted, tapes.OutputTape(cells, self.description.alphabet),
+                                   optimisations.STEP_LIMIT if limited else None)
+
+    def run_multitape(self, tape: optimisations.Tape, deadline: float) -> TuringMachineResult:
+        '''Run a multi-tape machine with optimisations.run_multitape on the input tape and blank other tapes. The output
+        tape of the result is the first tape.
+        '''
+
+        other_tapes = [optimisations.Tape([], two_way=self.two_way)
+                       for _ in range(self.description.num_tapes - 1)]
+        num_steps, accepted, stopped = optimisations.run_multitape(
+            self.description.table, [tape] + other_tapes, len(self.description.alphabet), self.description.accepting,
+            self.description.rejecting, -1 if self.max_steps is None else self.max_steps, deadline)
+        return TuringMachineResult(num_steps, accepted, tapes.OutputTape(tape.to_array(), self.description.alphabet), stopped)
+
+    def process_batch(self, inputs: typing.List[list], output_tapes: bool = False) -> typing.Union[np.ndarray, typing.Tuple[np.ndarray, typing.List[typing.List[str]]]]:
+        '''Run the machine on many inputs at once.
+
+        The tapes are the rows of one matrix, and the states and head positions of the rows that are still running are
+        kept in vectors, so each step is a few array operations over the dense transition table for the whole batch.
+        All running rows have taken the same number of steps. This pays off for many short runs; long runs are faster
+        one at a time with process_input. Only one-way tapes are supported. The rows that are still running when the step
+        limit is reached or the timeout passes are stopped as undecided, with the number of steps they took by then, as
+        in process_input.
+
+        Arguments:
+            inputs {typing.List[list]} -- the input words
+
+        Keyword Arguments:
+            output_tapes {bool} -- whether to also return the output tapes (default: {False})
+
+        Returns:
+            np.ndarray -- a BATCH_RESULT record (accepted, num_steps, stopped) per input, and the output tapes as in
+                TuringMachineResult if output_tapes is set
+        '''
+
+        assert_property(not self.two_way,
+                        "batches can only be run on one-way tapes")
+        assert_property(self.description.num_tapes == 1,
+                        "batches can only be run on single-tape machines")
+        letters = {letter: i for i, letter in enumerate(
+            self.description.alphabet)}
+        width = 2 * max([len(input) for input in inputs] + [1])
+        matrix = np.zeros((len(inputs), width), dtype=optimisations.SYMBOL)
+        try:
+            for i, input in enumerate(inputs):
+                matrix[i, :len(input)] = [letters[x] for x in input]
+        except KeyError:
+            raise TuringMachineError("input contains invalid characters")
+        results = np.zeros(len(inputs), dtype=BATCH_RESULT)
+        results["stopped"] = None
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        rows = np.arange(len(inputs))
+        state = np.zeros(len(inputs), dtype=np.intp)
+        position = np.zeros(len(inputs), dtype=np.intp)
+        num_steps = 0
+        while True:
+            to_state, tape_output, move_right = self.description.table[state, matrix[rows, position]].T
+            defined = to_state != optimisations.NO_TRANSITION
+            matrix[rows[defined], position[defined]] = tape_output[defined]
+            position = np.where(move_right == 1, position + 1,
+                                np.maximum(position - 1, 0))
+            state = np.where(defined, to_state, self.description.rejecting)
+            halted = (state == self.description.accepting) | (
+                state == self.description.rejecting)
+            results["accepted"][rows[halted]] = state[halted] == self.description.accepting
+            results["num_steps"][rows[halted]] = num_steps
+            running = ~halted
+            rows, state, position = rows[running], state[running], position[running]
+            if rows.size == 0:
+                break
+            if position.max() == matrix.shape[1]:
+                matrix = np.concatenate((matrix, np.zeros_like(matrix)), axis=1)
+            # the limits are checked as in optimisations.run_deterministic
+            stopped = None
+            if num_steps == self.max_steps:
+                stopped = optimisations.STEP_LIMIT
+            else:
+                num_steps += 1
+                if deadline is not None and time.monotonic() > deadline:
+                    stopped = optimisations.TIME_LIMIT
+            if stopped is not None:
+                results["num_steps"][rows] = num_steps
+                results["stopped"][rows] = stopped
+                break
+        if not output_tapes:
+            return results
+        return results, [list(tapes.OutputTape(tape, self.description.alphabet))
+                         for tape in matrix]
+
+    def perform_step(self, configuration: DeterministicTuringMachineConfiguration, profile: optimisations.Profile = None):
         # read
         tape_input = configuration.tape[configuration.position]
-        state = self.description.transitions[configuration.state]
-        if tape_input in state:
-            to_state, tape_output, move_right = state[tape_input]
+        to_state, tape_output, move_right = self.description.table[configuration.state, tape_input]
+        if to_state != optimisations.NO_TRANSITION:
+            if profile is not None:
+                profile.record(configuration.state, tape_input,
+                               configuration.position)
             # write
             configuration.tape[configuration.position] = tape_output
             # move head
-            if move_right:
-                configuration.position += 1
-                if configuration.position == len(configuration.tape):
-                    configuration.tape.resize(
-                        configuration.position + 1, refcheck=False)
-            elif configuration.position > 0:
-                configuration.position -= 1
+            configuration.position = configuration.tape.move(
+                configuration.position, move_right)
             # change state
             configuration.state = to_state
         else:
@@ -93,57 +464,305 @@ class DeterministicTuringMachine:
             # go to rejecting state
             configuration.state = self.description.rejecting
 
-    def print_configuration(self, configuration: DeterministicTuringMachineConfiguration):
-        print(" {:5s} ".format(
-            self.description.states[configuration.state]), end="")
-        for i, letter in enumerate(configuration.tape):
-            if i == configuration.position:
-                print('\033[91m', end="")
-            print(self.description.alphabet[letter], end=" ")
-            if i == configuration.position:
-                print('\033[0m', end="")
-        print()
+    def snapshot(self, configuration: DeterministicTuringMachineConfiguration) -> tuple:
+        tape = configuration.tape.to_array()
+        nonblank = np.flatnonzero(tape)
+        if len(nonblank) == 0:
+            return configuration.state, configuration.position, 0, b""
+        return (configuration.state, configuration.position, configuration.tape.lowest + nonblank[0],
+                tape[nonblank[0]:nonblank[-1] + 1].tobytes())
 
 
 class NondeterministicTuringMachine:
 
+    # breadth-first search, depth-first search and iterative deepening
+    STRATEGIES = ("bfs", "dfs", "iddfs")
+
     class AcceptException(Exception):
         def __init__(self, configuration: DeterministicTuringMachineConfiguration):
             self.configuration = configuration
 
-    def __init__(self, description: TuringMachineDescription):
-        self.description = description
+    def __init__(self, description: TuringMachineDescription, deduplicate: bool = True, remember_visited: bool = False, processes: int = 1, strategy: str = "bfs", max_steps: int = None, timeout: float = None, profile: bool = False, witness: bool = False, vectorized: bool = False):
+        '''Create a nondeterministic Turing machine simulator.
 
-    def process_input(self, input: list, verbose: bool = False) -> TuringMachineResult:
-        if len(input) == 0:
-            input = ["_"]
-        try:
-            tape = [self.description.alphabet.index(x) for x in input]
-        except ValueError:
-            raise TuringMachineError("input contains invalid characters")
-        configurations = [optimisations.create_initial_configuration(
-            tape, self.description.accepting, self.description.rejecting)]
-        num_steps = 0
+        The breadth-first search keeps all configurations of a level. The depth-first search and iterative deepening
+        backtrack on a single tape instead, so they only need memory proportional to the depth. All strategies report
+        the depth of the shallowest accepting branch as the number of steps. Multi-tape machines are only searched
+        breadth-first, on a single process, without profiling.
+
+        Arguments:
+            description {TuringMachineDescription} -- the machine description
+
+        Keyword Arguments:
+            deduplicate {bool} -- whether to merge identical configurations within a level (default: {True})
+            remember_visited {bool} -- whether to also drop configurations that were already reached on an earlier
+                level, so that a machine whose branches only loop is rejected instead of running forever
+                (default: {False})
+            processes {int} -- the number of processes that expand the frontier once it is wide enough
+                (default: {1})
+            strategy {str} -- one of STRATEGIES; the options above only apply to "bfs" (default: {"bfs"})
+            max_steps {int} -- the depth beyond which branches are not followed; if no branch accepted by then, the run
+                is stopped as undecided; "dfs" requires it, as it would follow an endless branch forever
+                (default: {None})
+            timeout {float} -- the number of seconds after which a run is stopped as undecided (default: {None})
+            profile {bool} -- whether to count the expanded configurations of every run, and the width of each level, in
+                an optimisations.Profile, which is returned with its result (default: {False})
+            witness {bool} -- whether to record the parent and the choice of transition of every configuration in an
+                optimisations.Witness, so that an accepting run returns the choices of its branch and its output tape;
+                this takes six bytes per configuration, and only applies to single-tape breadth-first searches on a
+                single process (default: {False})
+            vectorized {bool} -- whether runs that are not verbose keep the frontier in arrays once it is wide, and
+                step each level with a few array operations (see search_vectorized), unless visited configurations are
+                remembered; this only applies to single-tape breadth-first searches on a single process, which are
+                neither profiled nor recorded (default: {False})
+        '''
+
+        assert_property(strategy in self.STRATEGIES,
+                        "the strategy must be one of {}".format(", ".join(self.STRATEGIES)))
+        assert_property(strategy != "dfs" or max_steps is not None,
+                        "the depth-first search requires a maximum number of steps")
+        assert_property(processes == 1 or not profile,
+                        "runs cannot be profiled on multiple processes")
+        assert_property(description.num_tapes == 1 or (strategy == "bfs" and processes == 1 and not profile),
+                        "multi-tape machines can only be searched breadth-first on a single process, without profiling")
+        assert_property(not witness or (strategy == "bfs" and processes == 1 and description.num_tapes == 1),
+                        "branches can only be recorded in breadth-first searches of single-tape machines on a single "
+                        "process")
+        assert_property(not vectorized or (strategy == "bfs" and processes == 1 and description.num_tapes == 1 and
+                                           not profile and not witness),
+                        "only single-tape breadth-first searches on a single process, which are neither profiled nor "
+                        "recorded, can be vectorized")
+        self.description = description
+        self.deduplicate = deduplicate or remember_visited
+        self.remember_visited = remember_visited
+        self.processes = processes
+        self.strategy = strategy
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.profile = profile
+        self.witness = witness
+        self.vectorized = vectorized
 
-        def get_next_configurations(configuration: np.ndarray):
-            state, tape_input = optimisations.read_state(configuration)
+    def process_input(self, input: typing.Union[list, typing.ByteString], verbose: typing.Union[bool, Renderer] = False) -> TuringMachineResult:
+        if not isinstance(input, list):
+            tape = tapes.decode_letters(input, self.description.alphabet)
+        else:
+            if len(input) == 0:
+                input = ["_"]
             try:
-                transitions = self.description.transitions[state][tape_input]
-                return optimisations.apply_transitions(configuration, transitions)
-            except KeyError:
-                return []
+                tape = [self.description.alphabet.index(x) for x in input]
+            except ValueError:
+                raise TuringMachineError("input contains invalid characters")
+        deadline = -1 if self.timeout is None else time.monotonic() + self.timeout
+        profile = optimisations.Profile(
+            *self.description.table.shape[:2]) if self.profile else None
+        if self.strategy != "bfs":
+            return self.search_depth_first(tape, deadline, profile)
+        if self.description.num_tapes > 1:
+            assert_property(not verbose,
+                            "runs of multi-tape machines cannot be verbose")
+            configurations = [optimisations.create_initial_multitape_configuration(
+                tape, self.description.num_tapes)]
+        else:
+            configurations = [
+                optimisations.create_initial_configuration(tape)]
+        num_steps = 0
+        visited = set()
+        witness = optimisations.Witness() if self.witness else None
+        renderer = None
+        if verbose:
+            renderer = verbose if isinstance(
+                verbose, Renderer) else Renderer(self.description)
 
         while True:
-            if verbose:
-                [optimisations.print_configuration(
-                    c, self.description.alphabet, self.description.states) for c in configurations]
-                print()
+            if renderer is not None:
+                renderer.show_frontier(num_steps, configurations)
+                renderer.flush()
+            elif self.processes > 1 and len(configurations) >= parallel.MIN_FRONTIER:
+                num_steps, accepted, stopped = parallel.process_frontier(
+                    self, configurations, num_steps, deadline)
+                return TuringMachineResult(num_steps, accepted, None, stopped)
+            elif self.vectorized and not self.remember_visited and len(configurations) >= MIN_VECTORIZED_FRONTIER:
+                result, configurations, num_steps = self.search_vectorized(
+                    configurations, num_steps, deadline)
+                if result is not None:
+                    return result
+            if not self.remember_visited:
+                visited.clear()
+            if profile is not None:
+                profile.count_configurations(configurations)
             try:
-                new_configurations = list(itertools.chain.from_iterable(
-                    get_next_configurations(c) for c in configurations))
-            except optimisations.Accept:
-                return TuringMachineResult(num_steps, True, None)
-            configurations = new_configurations
+                configurations = self.expand(
+                    configurations, visited, witness)
+            except optimisations.Accept as accept:
+                if witness is None:
+                    return TuringMachineResult(num_steps, True, None, profile=profile)
+                return self.accepting_branch(tape, witness.branch(accept.index, accept.choice), num_steps, profile)
             if len(configurations) == 0:
-                return TuringMachineResult(num_steps, False, None)
+                return TuringMachineResult(num_steps, False, None, profile=profile)
+            if num_steps == self.max_steps:
+                return TuringMachineResult(num_steps, False, None, optimisations.STEP_LIMIT, profile)
+            num_steps += 1
+            if deadline >= 0 and time.monotonic() > deadline:
+                return TuringMachineResult(num_steps, False, None, optimisations.TIME_LIMIT, profile)
+
+    def search_depth_first(self, tape: typing.List[int], deadline: float = -1, profile: optimisations.Profile = None) -> TuringMachineResult:
+        '''Run the depth-first search or iterative deepening on the input tape (as letter numbers).
+
+        Iterative deepening doubles the depth bound on every round. As the depth-first search only looks for shallower
+        accepting branches once it has found one, it returns the shallowest accepting branch within the bound, and the
+        previous rounds have ruled out anything shallower.
+        '''
+
+        if self.strategy == "dfs":
+            bounds = [self.max_steps]
+        else:
+            bounds = (2 ** i for i in itertools.count())
+            if self.max_steps is not None:
+                bounds = itertools.chain(itertools.takewhile(
+                    lambda bound: bound < self.max_steps, bounds), [self.max_steps])
+        for bound in bounds:
+            shallowest, deepest, cut, timed_out = optimisations.search_depth_first(
+                self.description.table, tape, self.description.accepting, self.description.rejecting,
+                -1 if bound is None else bound, deadline, profile)
+            if timed_out:
+                return TuringMachineResult(deepest, False, None, optimisations.TIME_LIMIT, profile)
+            if shallowest >= 0:
+                return TuringMachineResult(shallowest, True, None, profile=profile)
+            if not cut:
+                return TuringMachineResult(deepest, False, None, profile=profile)
+        return TuringMachineResult(self.max_steps, False, None, optimisations.STEP_LIMIT, profile)
+
+    def search_vectorized(self, configurations: typing.List[optimisations.Configuration], num_steps: int, deadline: float = -1) -> typing.Tuple[typing.Union[TuringMachineResult, None], typing.List[optimisations.Configuration], int]:
+        '''Continue the breadth-first search from a wide level, with the frontier as arrays.
+
+        The states and head positions of a level are vectors, and its tapes are the rows of one matrix, padded with
+        blanks. A level is expanded by reading the entries of every configuration from the dense table at once, and
+        repeating the rows of the configurations for each of their transitions. Identical configurations are merged by
+        their rows, so this takes the same steps as the search over Configuration objects. As the cost of a level is
+        mostly fixed, this only pays off for wide frontiers, so once a level is narrower than a quarter of
+        MIN_VECTORIZED_FRONTIER, it is handed back. Configurations are only merged within a level.
+
+        Arguments:
+            configurations {typing.List[optimisations.Configuration]} -- the level
+            num_steps {int} -- its number of steps
+
+        Returns:
+            tuple -- the result, or None and the level and its number of steps if the frontier became narrow
+        '''
+
+        table = self.description.table
+        accepting, rejecting = self.description.accepting, self.description.rejecting
+        # the alphabet of a nondeterministic machine may have more letters than fit in a byte
+        dtype = optimisations.SYMBOL if len(
+            self.description.alphabet) <= 256 else optimisations.LETTER
+        states, positions, matrix = self.frontier_arrays(
+            configurations, dtype)
+        while True:
+            entries = table[states, matrix[np.arange(len(states)), positions]]
+            to_states = entries[:, :, 0]
+            if (to_states == accepting).any():
+                return TuringMachineResult(num_steps, True, None), None, num_steps
+            # the padding of the dense table is NO_TRANSITION, which is neither accepting nor rejecting
+            parents, choices = np.nonzero(
+                (to_states != optimisations.NO_TRANSITION) & (to_states != rejecting))
+            transitions = entries[parents, choices]
+            states = transitions[:, 0].astype(np.intp)
+            matrix = matrix[parents]
+            matrix[np.arange(len(parents)), positions[parents]] = transitions[:, 1]
+            positions = np.where(transitions[:, 2] == 1, positions[parents] + 1,
+                                 np.maximum(positions[parents] - 1, 0))
+            if len(positions) > 0 and positions.max() == matrix.shape[1]:
+                matrix = np.concatenate(
+                    (matrix, np.zeros_like(matrix)), axis=1)
+            if self.deduplicate and len(states) > 1:
+                _, first = np.unique(self.level_keys(
+                    states, positions, matrix), return_index=True)
+                first.sort()
+                states, positions, matrix = states[first], positions[first], matrix[first]
+            if len(states) == 0:
+                return TuringMachineResult(num_steps, False, None), None, num_steps
+            if num_steps == self.max_steps:
+                return TuringMachineResult(num_steps, False, None, optimisations.STEP_LIMIT), None, num_steps
             num_steps += 1
+            if deadline >= 0 and time.monotonic() > deadline:
+                return TuringMachineResult(num_steps, False, None, optimisations.TIME_LIMIT), None, num_steps
+            if len(states) < MIN_VECTORIZED_FRONTIER // 4:
+                header = np.stack((states, positions, np.full(len(states), matrix.shape[1])), axis=1)
+                return None, optimisations.decode_configurations(header.astype(optimisations.LETTER),
+                                                                 matrix.astype(optimisations.LETTER).ravel()), num_steps
+
+    @staticmethod
+    def frontier_arrays(configurations: typing.List[optimisations.Configuration], dtype: np.dtype) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # the states, head positions and tape matrix (of dtype) of search_vectorized, with room for the head to move
+        # right
+        header, cells = optimisations.encode_configurations(configurations)
+        lengths = header[:, 2].astype(np.intp)
+        width = 2 * int(lengths.max())
+        starts = np.cumsum(lengths) - lengths
+        matrix = np.zeros((len(configurations), width), dtype=dtype)
+        matrix[np.repeat(np.arange(len(configurations)), lengths),
+               np.arange(len(cells)) - np.repeat(starts, lengths)] = cells
+        return header[:, 0].astype(np.intp), header[:, 1].astype(np.intp), matrix
+
+    @staticmethod
+    def level_keys(states: np.ndarray, positions: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        # a configuration of search_vectorized as a single byte string: its state, head position and tape
+        cells = matrix.view(np.uint8)
+        keys = np.empty((len(states), 8 + cells.shape[1]), dtype=np.uint8)
+        keys[:, :4] = states.astype("<u4")[:, None].view(np.uint8)
+        keys[:, 4:8] = positions.astype("<u4")[:, None].view(np.uint8)
+        keys[:, 8:] = cells
+        return keys.view(np.dtype((np.void, keys.shape[1]))).ravel()
+
+    def accepting_branch(self, tape: typing.List[int], branch: typing.List[int], num_steps: int, profile: optimisations.Profile = None) -> TuringMachineResult:
+        '''Get the result of a run whose accepting branch was recorded, with the final tape of the branch, which is
+        found by taking its choices again from the input tape (as letter numbers).
+        '''
+
+        configuration = optimisations.follow_branch(optimisations.create_initial_configuration(tape),
+                                                    self.description.table, branch)
+        # the alphabet of a nondeterministic machine may have more letters than fit in a byte
+        cells = np.array(configuration.tape, dtype=optimisations.LETTER)
+        return TuringMachineResult(num_steps, True, tapes.OutputTape(cells, self.description.alphabet), profile=profile, branch=branch)
+
+    def next_configurations(self, configuration: optimisations.Configuration) -> typing.Iterable[optimisations.Configuration]:
+        state, tape_input = optimisations.read_state(configuration)
+        return optimisations.apply_transitions(configuration, self.description.table[state, tape_input], self.description.accepting, self.description.rejecting)
+
+    def expand(self, configurations: typing.List[optimisations.Configuration], visited: set, witness: optimisations.Witness = None) -> typing.List[optimisations.Configuration]:
+        '''Compute the next level of the breadth-first search, raising optimisations.Accept if a branch accepts.
+
+        Arguments:
+            configurations {typing.List[optimisations.Configuration]} -- the current level (of tuples of the state
+                and a Configuration per tape for multi-tape machines, see
+                optimisations.create_initial_multitape_configuration)
+            visited {set} -- the configurations that were already reached (on this level, or on all levels if
+                remember_visited is set), updated in place
+
+        Keyword Arguments:
+            witness {optimisations.Witness} -- the witness to add the parents and choices of the next level to, for
+                single-tape machines (default: {None})
+
+        Returns:
+            typing.List[optimisations.Configuration] -- the next level
+        '''
+
+        if self.description.num_tapes > 1:
+            new_configurations = optimisations.expand_multitape_configurations(
+                configurations, self.description.table, len(self.description.alphabet), self.description.accepting,
+                self.description.rejecting)
+        else:
+            new_configurations = optimisations.expand_configurations(
+                configurations, self.description.table, self.description.accepting, self.description.rejecting,
+                witness)
+        if witness is not None and (self.remember_visited or (self.deduplicate and len(new_configurations) > 1)):
+            # the dropped configurations are dropped from the witness too
+            kept = [i for i, c in enumerate(new_configurations)
+                    if not (c in visited or visited.add(c))]
+            witness.keep(kept)
+            new_configurations = [new_configurations[i] for i in kept]
+        elif self.remember_visited or (self.deduplicate and len(new_configurations) > 1):
+            new_configurations = [c for c in new_configurations
+                                  if not (c in visited or visited.add(c))]
+        return new_configurations
@@ -1,17 +1,16 @@
 '''Optimisations to improve the efficiency of the Turing machines. This code interfaces with C to make it faster.
 
-Note that each configuration is a numpy array such that:
-
-    configuration[0] contains the current position on the tape (as an offset)
-    configuration[1] contains the current state number
-    configuration[2] is the number of the accepting state
-    configuration[3] is the number of the rejecting state
-    configuration[4] and onwards contains the actual tape
+Configurations of the nondeterministic machine are zippers: the letter under the head, plus the cells to its left and
+to its right as immutable linked lists (the nearest cell first). Sibling configurations share all the cells they have
+in common, so branching costs O(1) regardless of the length of the tape. The right list never ends in blanks, which
+makes configurations that only differ in trailing blanks equal.
 
 Notice also that all states and letters are just numbers (they were converted in the DescriptionBuilder).
 '''
 
 import cython
+import functools
+import time
 import numpy as np
 cimport numpy as np
 
@@ -19,54 +18,1427 @@ LETTER = np.uint32
 ctypedef np.uint32_t LETTER_t
 
 class Accept(Exception):
-    pass
+    '''Raised when a branch accepts. expand_configurations gives it the index of the configuration in its level and
+    the choice of its transition that accepted.
+    '''
 
-def create_initial_configuration(tape, accepting, rejecting):
-    return np.array([0, 0, accepting, rejecting] + [x for x in tape], dtype=LETTER)
+    def __init__(self, index=None, choice=None):
+        super().__init__()
+        self.index = index
+        self.choice = choice
 
-@cython.boundscheck(False)
-@cython.wraparound(False) 
-def read_state(LETTER_t[:] configuration not None):
-    return (configuration[1], configuration[configuration[0] + 4])
+
+@cython.final
+@cython.trashcan(True)
+cdef class Cell:
+    '''A tape cell in an immutable linked list of cells.
+    '''
+
+    cdef readonly LETTER_t letter
+    # the index of the cell (plus one) while encode_shared_configurations flattens it, which takes the padding after
+    # the letter
+    cdef LETTER_t encoded
+    cdef readonly Cell next
+    cdef readonly Py_ssize_t length
+    cdef size_t hash
+
+    def __iter__(self):
+        cdef Cell cell = self
+        while cell is not None:
+            yield cell.letter
+            cell = cell.next
+
+
+cdef inline Cell push(LETTER_t letter, Cell next):
+    cdef Cell cell = Cell.__new__(Cell)
+    cell.letter = letter
+    cell.next = next
+    if next is None:
+        cell.length = 1
+        cell.hash = letter + 1
+    else:
+        cell.length = next.length + 1
+        cell.hash = next.hash * 1000003 ^ (letter + 1)
+    return cell
+
+
+cdef inline Cell push_right(LETTER_t letter, Cell next):
+    # no blanks at the end of the right part of the tape
+    return None if letter == 0 and next is None else push(letter, next)
+
+
+cdef bint cells_equal(Cell a, Cell b):
+    while a is not b:
+        if a is None or b is None or a.hash != b.hash or a.length != b.length or a.letter != b.letter:
+            return False
+        a = a.next
+        b = b.next
+    return True
+
+
+@cython.final
+@cython.no_gc
+cdef class Configuration:
+    '''A configuration of a nondeterministic machine. Configurations are immutable and can be hashed.
+    '''
+
+    cdef readonly LETTER_t state
+    cdef readonly LETTER_t letter
+    cdef readonly Cell left
+    cdef readonly Cell right
+
+    @property
+    def position(self):
+        return 0 if self.left is None else self.left.length
+
+    @property
+    def tape(self):
+        '''The tape from the first cell to the last non-blank cell (or the head).
+        '''
+
+        tape = [] if self.left is None else list(self.left)[::-1]
+        tape.append(self.letter)
+        if self.right is not None:
+            tape.extend(self.right)
+        return tape
+
+    def __hash__(self):
+        cdef size_t h = <size_t> self.state * 1000003 ^ self.letter
+        h = h * 1000003 ^ (0 if self.left is None else self.left.hash)
+        h = h * 1000003 ^ (0 if self.right is None else self.right.hash)
+        return <Py_hash_t> (h >> 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, Configuration):
+            return NotImplemented
+        cdef Configuration o = other
+        return self.state == o.state and self.letter == o.letter and cells_equal(self.left, o.left) and cells_equal(self.right, o.right)
+
+
+cdef inline Configuration make_configuration(LETTER_t state, LETTER_t letter, Cell left, Cell right):
+    cdef Configuration configuration = Configuration.__new__(Configuration)
+    configuration.state = state
+    configuration.letter = letter
+    configuration.left = left
+    configuration.right = right
+    return configuration
+
+
+@cython.final
+cdef class Profile:
+    '''Counters collected by the simulators while they run, if they are given a profile.
+
+    Every transition that is taken (or, for nondeterministic machines, every configuration that is expanded) is counted
+    by the state and the letter it reads, and by the position of the head. The time spent in a state is measured in
+    steps. Nondeterministic machines also record the width of each level of the breadth-first search.
+    '''
+
+    # the hits of each (state, letter), laid out like the transition table (only the first of the three columns is
+    # used), and of each head position from head_origin onwards
+    cdef np.ndarray transition_hits
+    cdef readonly np.ndarray head_counts
+    cdef readonly Py_ssize_t head_origin
+    # the most cells a tape has used
+    cdef public Py_ssize_t max_tape_length
+    cdef readonly list frontier_widths
+    cdef np.uint64_t[:, :, ::1] transitions
+    cdef np.uint64_t[::1] heads
+
+    def __init__(self, Py_ssize_t num_states, Py_ssize_t num_letters):
+        self.transition_hits = np.zeros((num_states, num_letters, 3), dtype=np.uint64)
+        self.transitions = self.transition_hits
+        self.head_counts = np.zeros(PAGE_SIZE, dtype=np.uint64)
+        self.heads = self.head_counts
+        self.head_origin = 0
+        self.max_tape_length = 0
+        self.frontier_widths = []
+
+    @property
+    def transition_counts(self):
+        return self.transition_hits[:, :, 0]
+
+    @property
+    def state_counts(self):
+        return self.transition_counts.sum(axis=1)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline void count(self, LETTER_t state, LETTER_t letter, Py_ssize_t position):
+        cdef Py_ssize_t i = position - self.head_origin
+        if i < 0 or i >= self.heads.shape[0]:
+            self.grow(position)
+            i = position - self.head_origin
+        self.transitions[state, letter, 0] += 1
+        self.heads[i] += 1
+
+    cdef np.uint64_t* page_hits(self, Py_ssize_t start, Py_ssize_t size):
+        '''Get the hits of the head positions from start onwards, with room for at least size of them.
+        '''
+
+        if start < self.head_origin:
+            self.grow(start)
+        if start + size > self.head_origin + self.heads.shape[0]:
+            self.grow(start + size - 1)
+        return &self.heads[start - self.head_origin]
+
+    def record(self, LETTER_t state, LETTER_t letter, Py_ssize_t position):
+        '''Count a transition taken outside of the compiled simulators.
+        '''
+
+        self.count(state, letter, position)
+
+    cdef void grow(self, Py_ssize_t position):
+        '''Make room for the head at the given position, doubling the histogram towards it.
+        '''
+
+        cdef Py_ssize_t size = self.heads.shape[0]
+        cdef Py_ssize_t new_size = max(2 * size, max(self.head_origin + size, position + 1) - min(self.head_origin, position))
+        cdef Py_ssize_t new_origin = self.head_origin if position >= self.head_origin else self.head_origin + size - new_size
+        head_counts = np.zeros(new_size, dtype=np.uint64)
+        head_counts[self.head_origin - new_origin:self.head_origin - new_origin + size] = self.head_counts
+        self.head_counts = head_counts
+        self.heads = head_counts
+        self.head_origin = new_origin
+
+    def count_configurations(self, list configurations not None):
+        '''Count the configurations of a level of the breadth-first search that are about to be expanded.
+        '''
+
+        cdef Configuration configuration
+        cdef Py_ssize_t position, length
+        self.frontier_widths.append(len(configurations))
+        for configuration in configurations:
+            position = 0 if configuration.left is None else configuration.left.length
+            length = position + 1 + (0 if configuration.right is None else configuration.right.length)
+            if length > self.max_tape_length:
+                self.max_tape_length = length
+            self.count(configuration.state, configuration.letter, position)
+
+
+def create_initial_configuration(tape):
+    cdef Cell right = None
+    for letter in reversed(tape[1:]):
+        right = push_right(letter, right)
+    return make_configuration(0, tape[0], None, right)
+
+def read_state(Configuration configuration not None):
+    return (configuration.state, configuration.letter)
+
+cdef inline Configuration successor(Configuration configuration, LETTER_t to_state, LETTER_t tape_output, LETTER_t move_right):
+    cdef Cell left = configuration.left
+    cdef Cell right = configuration.right
+    if move_right == 1:
+        if right is None:
+            return make_configuration(to_state, 0, push(tape_output, left), None)
+        return make_configuration(to_state, right.letter, push(tape_output, left), right.next)
+    elif left is not None:
+        return make_configuration(to_state, left.letter, left.next, push_right(tape_output, right))
+    return make_configuration(to_state, tape_output, None, right)
 
 @cython.boundscheck(False)
 @cython.wraparound(False) 
-def apply_transitions(np.ndarray configuration not None, LETTER_t[:, :] transitions):
-    cdef LETTER_t position = configuration[0]
-    cdef LETTER_t accepting = configuration[2]
-    cdef LETTER_t rejecting = configuration[3]
+def apply_transitions(Configuration configuration not None, LETTER_t[:, :] transitions, LETTER_t accepting, LETTER_t rejecting):
     cdef ssize_t I = transitions.shape[0]
 
     cdef LETTER_t to_state
-    cdef LETTER_t tape_output
-    cdef LETTER_t move_right
     for i in range(I):
         to_state = transitions[i, 0]
+        # the padding of the dense table
+        if to_state == C_NO_TRANSITION:
+            break
         if to_state == rejecting:
             continue
         if to_state == accepting:
             raise Accept()
-        tape_output = transitions[i, 1]
-        move_right = transitions[i, 2]
-        conf = configuration if i == I - 1 else configuration.copy()
-        conf[position + 4] = tape_output
-        conf[1] = to_state
-        if move_right == 1:
-            conf[0] = position + 1
-            if conf.shape[0] == position + 5:
-                conf.resize(conf.shape[0] * 2, refcheck=False)
-        elif position > 0:
-            conf[0] = position - 1
-        yield conf
-
-def print_configuration(LETTER_t[:] configuration not None, str alphabet, list states):
-    cdef LETTER_t position = configuration[0]
-    cdef LETTER_t state = configuration[1]
-    print(" {:5s} ".format(states[state]), end="")
-    for i in range(configuration.shape[0] - 4):
-        if i == position:
-            print('\033[91m', end="")
-        print(alphabet[configuration[i + 4]], end=" ")
-        if i == position:
-            print('\033[0m', end="")
-    print()
\ No newline at end of file
+        yield successor(configuration, to_state, transitions[i, 1], transitions[i, 2])
+
+# the index of the parent of a configuration in its level, and the choice of the transition that led to it, as kept by
+# a Witness
+PARENT = np.uint32
+ctypedef np.uint32_t PARENT_t
+CHOICE = np.uint16
+ctypedef np.uint16_t CHOICE_t
+
+
+@cython.final
+cdef class Witness:
+    '''The parent and the choice of transition of every configuration of a breadth-first search, in a flat array of
+    each per level, so that the branch that accepted can be followed back to the initial configuration. This takes six
+    bytes per configuration, and no tapes.
+    '''
+
+    # the arrays of every level after the initial one
+    cdef readonly list parents
+    cdef readonly list choices
+
+    def __init__(self):
+        self.parents = []
+        self.choices = []
+
+    def keep(self, kept not None):
+        '''Drop the configurations of the last level that are not kept, given the indices of those that are.
+        '''
+
+        self.parents[-1] = self.parents[-1][kept]
+        self.choices[-1] = self.choices[-1][kept]
+
+    def branch(self, Py_ssize_t index, Py_ssize_t choice):
+        '''Get the choices of the branch that leads to a configuration of the last level, followed by the choice of its
+        next transition.
+        '''
+
+        cdef list choices = [choice]
+        cdef Py_ssize_t level
+        for level in range(len(self.parents) - 1, -1, -1):
+            choices.append(int(self.choices[level][index]))
+            index = self.parents[level][index]
+        choices.reverse()
+        return choices
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def expand_configurations(list configurations not None, LETTER_t[:, :, :, ::1] table not None, LETTER_t accepting, LETTER_t rejecting, Witness witness=None):
+    '''Apply the transitions of the dense table (see TuringMachineDescriptionBuilder.compile_nondeterministic_table)
+    to all configurations, in order. Raises Accept if any transition accepts.
+
+    If a witness is given, the parent and the choice of every new configuration are added to it as a new level.
+    '''
+
+    cdef list new_configurations = []
+    cdef Configuration configuration
+    cdef LETTER_t* transition
+    cdef Py_ssize_t i
+    cdef Py_ssize_t index = 0
+    cdef np.ndarray parent_array, choice_array
+    cdef PARENT_t[::1] parents
+    cdef CHOICE_t[::1] choices
+    if witness is not None:
+        parent_array = np.empty(len(configurations) * table.shape[2], dtype=PARENT)
+        choice_array = np.empty(len(configurations) * table.shape[2], dtype=CHOICE)
+        parents = parent_array
+        choices = choice_array
+    for configuration in configurations:
+        for i in range(table.shape[2]):
+            transition = &table[configuration.state, configuration.letter, i, 0]
+            if transition[0] == C_NO_TRANSITION:
+                break
+            if transition[0] == rejecting:
+                continue
+            if transition[0] == accepting:
+                raise Accept(index, i)
+            if witness is not None:
+                parents[len(new_configurations)] = index
+                choices[len(new_configurations)] = i
+            new_configurations.append(successor(configuration, transition[0], transition[1], transition[2]))
+        index += 1
+    if witness is not None:
+        witness.parents.append(parent_array[:len(new_configurations)].copy())
+        witness.choices.append(choice_array[:len(new_configurations)].copy())
+    return new_configurations
+
+
+def follow_branch(Configuration configuration not None, LETTER_t[:, :, :, ::1] table not None, choices not None):
+    '''Take the given choices of transitions of the dense table from a configuration, one after the other.
+    '''
+
+    cdef LETTER_t* transition
+    for choice in choices:
+        transition = &table[configuration.state, configuration.letter, <Py_ssize_t> choice, 0]
+        configuration = successor(configuration, transition[0], transition[1], transition[2])
+    return configuration
+
+# the move of a head of a multi-tape machine that leaves it where it is, after left (0) and right (1)
+cdef enum:
+    C_STAY = 2
+    C_MAX_TAPES = 16
+STAY = C_STAY
+# the most tapes of a multi-tape machine
+MAX_TAPES = C_MAX_TAPES
+
+def create_initial_multitape_configuration(tape, Py_ssize_t num_tapes):
+    '''Create the initial configuration of a multi-tape machine: a tuple of the state and a Configuration for every
+    tape (whose own state is unused), with the input on the first tape and the others blank.
+    '''
+
+    return (0, (create_initial_configuration(tape),) + (make_configuration(0, 0, None, None),) * (num_tapes - 1))
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def expand_multitape_configurations(list configurations not None, LETTER_t[:, :, :, ::1] table not None, LETTER_t num_letters, LETTER_t accepting, LETTER_t rejecting):
+    '''As expand_configurations, for the configurations of a multi-tape machine (see
+    create_initial_multitape_configuration), whose dense table is indexed by the letters under all heads (see
+    TuringMachineDescriptionBuilder.compile_table).
+    '''
+
+    cdef list new_configurations = []
+    cdef tuple heads
+    cdef list new_heads
+    cdef Configuration head
+    cdef LETTER_t state
+    cdef LETTER_t* transition
+    cdef Py_ssize_t i, t, row
+    cdef Py_ssize_t num_tapes = (table.shape[3] - 1) // 2
+    for state, heads in configurations:
+        row = 0
+        for head in heads:
+            row = row * num_letters + head.letter
+        for i in range(table.shape[2]):
+            transition = &table[state, row, i, 0]
+            if transition[0] == C_NO_TRANSITION:
+                break
+            if transition[0] == rejecting:
+                continue
+            if transition[0] == accepting:
+                raise Accept()
+            new_heads = []
+            for t in range(num_tapes):
+                head = heads[t]
+                if transition[2 * t + 2] == C_STAY:
+                    new_heads.append(make_configuration(0, transition[2 * t + 1], head.left, head.right))
+                else:
+                    new_heads.append(successor(head, 0, transition[2 * t + 1], transition[2 * t + 2]))
+            new_configurations.append((transition[0], tuple(new_heads)))
+    return new_configurations
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def encode_configurations(list configurations not None):
+    '''Flatten configurations into arrays that can be shared with other processes.
+
+    Returns:
+        tuple -- an (n, 3) array with the state, head position and tape length of each configuration, and an array
+            with all the tapes one after the other
+    '''
+
+    cdef Py_ssize_t n = len(configurations)
+    cdef np.ndarray header = np.empty((n, 3), dtype=LETTER)
+    cdef LETTER_t[:, :] h = header
+    cdef Py_ssize_t total = 0
+    cdef Py_ssize_t i, j, position, length
+    cdef Configuration configuration
+    cdef Cell cell
+    for i in range(n):
+        configuration = configurations[i]
+        position = 0 if configuration.left is None else configuration.left.length
+        length = position + 1 + (0 if configuration.right is None else configuration.right.length)
+        h[i, 0] = configuration.state
+        h[i, 1] = position
+        h[i, 2] = length
+        total += length
+    cdef np.ndarray cells = np.empty(total, dtype=LETTER)
+    cdef LETTER_t[:] c = cells
+    total = 0
+    for i in range(n):
+        configuration = configurations[i]
+        position = h[i, 1]
+        cell = configuration.left
+        for j in range(position - 1, -1, -1):
+            c[total + j] = cell.letter
+            cell = cell.next
+        c[total + position] = configuration.letter
+        cell = configuration.right
+        j = total + position + 1
+        while cell is not None:
+            c[j] = cell.letter
+            cell = cell.next
+            j += 1
+        total += h[i, 2]
+    return header, cells
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def decode_configurations(LETTER_t[:, :] header not None, LETTER_t[:] cells not None, Py_ssize_t offset=0):
+    '''Rebuild the configurations from the arrays of encode_configurations. The tapes of the configurations in the
+    header start at the given offset into cells.
+    '''
+
+    cdef list configurations = []
+    cdef Py_ssize_t i, j, position, length
+    cdef Cell left, right
+    for i in range(header.shape[0]):
+        position = header[i, 1]
+        length = header[i, 2]
+        left = None
+        for j in range(offset, offset + position):
+            left = push(cells[j], left)
+        right = None
+        for j in range(offset + length - 1, offset + position, -1):
+            right = push_right(cells[j], right)
+        configurations.append(make_configuration(header[i, 0], cells[offset + position], left, right))
+        offset += length
+    return configurations
+
+def shard_configurations(list configurations not None, Py_ssize_t num_shards):
+    '''Split configurations into num_shards lists by their hash, which is the same in every process, so identical
+    configurations always end up in the same shard.
+    '''
+
+    cdef list shards = [[] for _ in range(num_shards)]
+    cdef Configuration configuration
+    for configuration in configurations:
+        (<list> shards[<size_t> hash(configuration) % <size_t> num_shards]).append(configuration)
+    return shards
+
+@cython.final
+cdef class CellEncoder:
+    # flattens linked cells for encode_shared_configurations, each cell once
+    cdef list cells
+    cdef np.ndarray flat
+    cdef Py_ssize_t size
+
+    def __cinit__(self):
+        self.cells = []
+        self.flat = np.empty((64, 2), dtype=LETTER)
+        self.size = 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef LETTER_t encode(self, Cell first):
+        # the index (plus one) of a cell in the flat cells, flattening it and the cells after it first if they are not
+        # yet; the new cells go after the cells they link to, in reverse
+        cdef Cell cell = first
+        cdef Py_ssize_t length = 0
+        while cell is not None and cell.encoded == 0:
+            length += 1
+            cell = cell.next
+        cdef LETTER_t index = 0 if cell is None else cell.encoded
+        if length == 0:
+            return index
+        if self.size + length > self.flat.shape[0]:
+            self.flat = np.concatenate((self.flat, np.empty((self.flat.shape[0] + length, 2), dtype=LETTER)))
+        cdef LETTER_t[:, ::1] flat = self.flat
+        cdef Py_ssize_t j
+        cell = first
+        for j in range(self.size + length - 1, self.size - 1, -1):
+            flat[j, 0] = cell.letter
+            flat[j, 1] = j if j > self.size else index
+            cell.encoded = j + 1
+            self.cells.append(cell)
+            cell = cell.next
+        self.size += length
+        return first.encoded
+
+    def reset(self):
+        cdef Cell cell
+        for cell in self.cells:
+            cell.encoded = 0
+        self.cells = []
+
+def encode_shared_configurations(list configurations not None):
+    '''Flatten configurations into arrays that can be shared with other processes, like encode_configurations, but
+    keep the cells that their tapes share shared, so that a level takes about as many cells as the search created.
+
+    Returns:
+        tuple -- an (n, 4) array with the state, the letter under the head and the left and right cells of each
+            configuration, and an (m, 2) array with the letter and the next cell of every cell, where a cell is its
+            index plus one (or zero for no cell), and comes after its next cell
+    '''
+
+    cdef Py_ssize_t n = len(configurations)
+    cdef np.ndarray header = np.empty((n, 4), dtype=LETTER)
+    cdef LETTER_t[:, :] h = header
+    cdef CellEncoder encoder = CellEncoder()
+    cdef Py_ssize_t i
+    cdef Configuration configuration
+    try:
+        for i in range(n):
+            configuration = configurations[i]
+            h[i, 0] = configuration.state
+            h[i, 1] = configuration.letter
+            h[i, 2] = encoder.encode(configuration.left)
+            h[i, 3] = encoder.encode(configuration.right)
+    finally:
+        encoder.reset()
+    return header, encoder.flat[:encoder.size]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def decode_shared_configurations(LETTER_t[:, :] header not None, LETTER_t[:, :] cells not None):
+    '''Rebuild the configurations from the arrays of encode_shared_configurations, sharing the same cells.
+    '''
+
+    cdef list built = [None] * (cells.shape[0] + 1)
+    cdef list configurations = []
+    cdef Py_ssize_t i
+    for i in range(cells.shape[0]):
+        built[i + 1] = push(cells[i, 0], <Cell> built[cells[i, 1]])
+    for i in range(header.shape[0]):
+        configurations.append(make_configuration(header[i, 0], header[i, 1], <Cell> built[header[i, 2]],
+                                                 <Cell> built[header[i, 3]]))
+    return configurations
+
+SYMBOL = np.uint8
+ctypedef np.uint8_t SYMBOL_t
+
+# marks a missing transition in the dense transition table
+NO_TRANSITION = np.iinfo(LETTER).max
+cdef LETTER_t C_NO_TRANSITION = NO_TRANSITION
+
+# number of cells in each page of a Tape
+PAGE_SIZE = 4096
+
+
+cdef class Tape:
+    '''A tape of SYMBOL cells for the deterministic simulator, stored as fixed-size pages that are allocated lazily.
+
+    In one-way mode the tape starts at cell 0 and moving left from that cell leaves the head where it is. In two-way
+    mode the tape is infinite in both directions. Only the pages that the head visits are allocated, and lowest and
+    highest keep track of the visited cells.
+    '''
+
+    cdef readonly bint two_way
+    cdef readonly Py_ssize_t page_size
+    cdef readonly Py_ssize_t lowest
+    cdef readonly Py_ssize_t highest
+    cdef list right_pages
+    cdef list left_pages
+
+    def __init__(self, tape, bint two_way=False, Py_ssize_t page_size=PAGE_SIZE):
+        assert page_size > 0, "the page size must be positive"
+        tape = np.asarray(tape, dtype=SYMBOL)
+        self.two_way = two_way
+        self.page_size = page_size
+        self.lowest = 0
+        self.highest = max(tape.shape[0], 1) - 1
+        self.right_pages = []
+        self.left_pages = []
+        for i in range(self.highest // page_size + 1):
+            page = np.zeros(page_size, dtype=SYMBOL)
+            chunk = tape[i * page_size:(i + 1) * page_size]
+            page[:chunk.shape[0]] = chunk
+            self.right_pages.append(page)
+
+    cdef SYMBOL_t[::1] page(self, Py_ssize_t index):
+        '''Get the page with the given index (page i holds cells i * page_size onwards), allocating it if needed.
+        '''
+
+        cdef list pages = self.right_pages if index >= 0 else self.left_pages
+        cdef Py_ssize_t i = index if index >= 0 else -index - 1
+        while len(pages) <= i:
+            pages.append(np.zeros(self.page_size, dtype=SYMBOL))
+        return pages[i]
+
+    cdef void visit(self, Py_ssize_t position):
+        if position > self.highest:
+            self.highest = position
+        elif position < self.lowest:
+            self.lowest = position
+
+    cpdef Py_ssize_t move(self, Py_ssize_t position, bint move_right):
+        '''Move the head one cell from the given position and return the new position.
+        '''
+
+        if move_right:
+            position += 1
+        elif position > 0 or self.two_way:
+            position -= 1
+        self.visit(position)
+        return position
+
+    def __getitem__(self, Py_ssize_t position):
+        return self.page(position // self.page_size)[position % self.page_size]
+
+    def __setitem__(self, Py_ssize_t position, SYMBOL_t letter):
+        self.page(position // self.page_size)[position % self.page_size] = letter
+        self.visit(position)
+
+    def __len__(self):
+        return self.highest - self.lowest + 1
+
+    cdef void write(self, Py_ssize_t start, SYMBOL_t[::1] cells):
+        '''Copy cells onto the tape from position start onwards, without marking them as visited.
+        '''
+
+        cdef Py_ssize_t position = start
+        cdef Py_ssize_t end = start + cells.shape[0]
+        cdef Py_ssize_t index, begin, count
+        while position < end:
+            index = position // self.page_size
+            begin = position - index * self.page_size
+            count = min(self.page_size - begin, end - position)
+            self.page(index)[begin:begin + count] = cells[position - start:position - start + count]
+            position += count
+
+    def to_array(self) -> np.ndarray:
+        '''Copy the visited cells into a contiguous array.
+        '''
+
+        cdef Py_ssize_t first = self.lowest // self.page_size
+        cdef Py_ssize_t last = self.highest // self.page_size
+        cells = np.concatenate([self.page(i) for i in range(first, last + 1)])
+        start = self.lowest - first * self.page_size
+        return cells[start:start + len(self)]
+
+    def read(self, Py_ssize_t start, Py_ssize_t end) -> np.ndarray:
+        '''Copy the visited cells from start up to end into a contiguous array, without copying the rest of the tape.
+        '''
+
+        start = max(start, self.lowest)
+        end = min(end, self.highest + 1)
+        if start >= end:
+            return np.zeros(0, dtype=SYMBOL)
+        cdef Py_ssize_t first = start // self.page_size
+        cdef Py_ssize_t last = (end - 1) // self.page_size
+        cells = np.concatenate([self.page(i) for i in range(first, last + 1)])
+        return cells[start - first * self.page_size:end - first * self.page_size]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def read_letters(const unsigned char[::1] data not None, const np.int16_t[::1] letters not None, bint two_way=False, Py_ssize_t page_size=PAGE_SIZE):
+    '''Create a Tape from the bytes of a tape file, writing the number of the letter of every byte straight into its
+    pages.
+
+    Arguments:
+        data {bytes} -- the contents of the file, for example a memory map
+        letters {np.ndarray} -- the number of the letter of every byte, -1 for bytes that are skipped, and any other
+            negative number for bytes that are not letters (see turing.tapes.letter_table)
+
+    Returns:
+        tuple -- the tape, and the offset of the first byte that is not a letter, or -1 if there is none
+    '''
+
+    assert letters.shape[0] == 256, "the lookup table needs an entry for every byte"
+    cdef Tape tape = Tape([], two_way, page_size)
+    cdef SYMBOL_t[::1] cells = tape.page(0)
+    cdef Py_ssize_t length = 0
+    cdef Py_ssize_t offset = 0
+    cdef Py_ssize_t i
+    cdef np.int16_t letter
+    for i in range(data.shape[0]):
+        letter = letters[data[i]]
+        if letter < 0:
+            if letter == -1:
+                continue
+            return tape, i
+        if offset == page_size:
+            cells = tape.page(length // page_size)
+            offset = 0
+        cells[offset] = <SYMBOL_t> letter
+        offset += 1
+        length += 1
+    tape.highest = max(length, 1) - 1
+    return tape, -1
+
+
+# why a run stopped without halting
+STEP_LIMIT = "step limit reached"
+TIME_LIMIT = "time limit reached"
+LOOP = "loops forever"
+
+# number of steps between two checks of the deadline
+cdef unsigned long long DEADLINE_INTERVAL = 1 << 16
+# base of the rolling hash of the tape, and its inverse modulo 2^64
+cdef unsigned long long HASH_BASE = 0x100000001b3
+cdef unsigned long long HASH_BASE_INVERSE = pow(0x100000001b3, -1, 2 ** 64)
+
+
+def tapes_equal(Py_ssize_t lowest, np.ndarray cells, Py_ssize_t other_lowest, np.ndarray other_cells):
+    '''Check whether two tapes are equal, given their cells from the lowest visited one onwards (all other cells being
+    blank).
+    '''
+
+    start = min(lowest, other_lowest)
+    end = max(lowest + cells.shape[0], other_lowest + other_cells.shape[0])
+    padded = np.zeros(end - start, dtype=cells.dtype)
+    padded[lowest - start:lowest - start + cells.shape[0]] = cells
+    other_padded = np.zeros(end - start, dtype=other_cells.dtype)
+    other_padded[other_lowest - start:other_lowest -
+                 start + other_cells.shape[0]] = other_cells
+    return np.array_equal(padded, other_padded)
+
+
+cdef unsigned long long next_checkpoint(unsigned long long num_steps, long long max_steps, double deadline):
+    cdef unsigned long long checkpoint = <unsigned long long> -1
+    if deadline >= 0:
+        checkpoint = num_steps + DEADLINE_INTERVAL
+    if max_steps >= 0 and <unsigned long long> max_steps < checkpoint:
+        checkpoint = max_steps + 1
+    return checkpoint
+
+
+# the steps of a trace are packed into 32 bits as to_state << TRACE_STATE_SHIFT | tape_output << 1 | move_right
+cdef enum:
+    C_TRACE_STATE_SHIFT = 9
+TRACE_STATE_SHIFT = C_TRACE_STATE_SHIFT
+MAX_TRACE_STATES = 1 << (32 - TRACE_STATE_SHIFT)
+TRACE = np.uint32
+ctypedef np.uint32_t TRACE_t
+
+
+# the moves of the scans in the tables of turing.optimizer.scan_table, which move over a letter without changing it or
+# the state
+cdef enum:
+    C_SCAN_LEFT = 2
+    C_SCAN_RIGHT = 3
+SCAN_LEFT = C_SCAN_LEFT
+SCAN_RIGHT = C_SCAN_RIGHT
+
+
+# deterministic_loop is compiled once for each, so that plain runs do not pay for the counters, the trace or the scans
+ctypedef char plain
+ctypedef short profiled
+ctypedef int traced
+ctypedef long scanning
+ctypedef fused loop_mode:
+    plain
+    profiled
+    traced
+    scanning
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef tuple deterministic_loop(loop_mode mode, LETTER_t[:, :, ::1] table, Tape tape, LETTER_t accepting, LETTER_t rejecting, long long max_steps, double deadline, bint detect_loops, Profile profile, trace):
+    cdef Py_ssize_t page_size = tape.page_size
+    cdef bint two_way = tape.two_way
+    cdef Py_ssize_t lowest = tape.lowest
+    cdef Py_ssize_t highest = tape.highest
+    # the page under the head starts at cell base, the previous page is kept around for heads crossing back and forth
+    cdef SYMBOL_t[::1] cells = tape.page(0)
+    cdef Py_ssize_t base = 0
+    cdef SYMBOL_t[::1] other_cells = cells
+    cdef Py_ssize_t other_base = 0
+    cdef SYMBOL_t[::1] swap_cells
+    cdef Py_ssize_t swap_base
+    cdef Py_ssize_t offset = 0
+    cdef LETTER_t state = 0
+    cdef LETTER_t* transition
+    cdef unsigned long long num_steps = 0
+    stopped = None
+    # the step count at which to check the step limit and deadline next
+    cdef unsigned long long checkpoint = next_checkpoint(0, max_steps, deadline)
+
+    # the hash is the sum of (letter - input letter) * HASH_BASE ** cell over all cells, power is HASH_BASE ** position
+    cdef unsigned long long tape_hash = 0
+    cdef unsigned long long power = 1
+    cdef LETTER_t snapshot_state = 0
+    cdef Py_ssize_t snapshot_position = 0
+    cdef unsigned long long snapshot_hash = 0
+    cdef unsigned long long snapshot_step = 0
+    cdef unsigned long long snapshot_interval = 1
+    cdef Py_ssize_t snapshot_lowest = lowest
+    snapshot_cells = tape.to_array() if detect_loops else None
+    # the hits of each transition at the same offset as its entry in the table, and of each cell of the page under the
+    # head
+    cdef LETTER_t* first_transition = &table[0, 0, 0]
+    cdef np.uint64_t* transition_hits = NULL
+    cdef np.uint64_t* head_hits = NULL
+    if loop_mode is profiled:
+        transition_hits = &profile.transitions[0, 0, 0]
+        head_hits = profile.page_hits(base, page_size)
+    # the steps since the last checkpoint of the trace
+    cdef TRACE_t[::1] trace_steps
+    cdef Py_ssize_t num_trace_steps = 0
+    if loop_mode is traced:
+        trace_array = np.empty(trace.interval, dtype=TRACE)
+        trace_steps = trace_array
+
+    # the entries of the state of a scan, and the cell at which it stops at the latest
+    cdef LETTER_t* scan_entries
+    cdef Py_ssize_t scan_end
+    cdef Py_ssize_t scan_start
+
+    # a local, so that it is not read from memory on every step
+    cdef LETTER_t no_transition = C_NO_TRANSITION
+
+    while True:
+        transition = &table[state, cells[offset], 0]
+        if transition[0] == no_transition:
+            state = rejecting
+            break
+        if loop_mode is profiled:
+            transition_hits[transition - first_transition] += 1
+            head_hits[offset] += 1
+        if loop_mode is traced:
+            trace_steps[num_trace_steps] = transition[0] << C_TRACE_STATE_SHIFT | transition[1] << 1 | transition[2]
+            num_trace_steps += 1
+        if detect_loops:
+            tape_hash += (<unsigned long long> transition[1] - cells[offset]) * power
+        cells[offset] = <SYMBOL_t> transition[1]
+        if loop_mode is scanning:
+            # a scan crosses all following cells of the page that it also scans (up to the next checkpoint) at once,
+            # and leaves the last move to the code below
+            if transition[2] == C_SCAN_RIGHT:
+                scan_entries = &table[state, 0, 0]
+                scan_start = offset
+                scan_end = page_size - 1
+                if <unsigned long long> (scan_end - offset) > checkpoint - 1 - num_steps:
+                    scan_end = offset + <Py_ssize_t> (checkpoint - 1 - num_steps)
+                while offset < scan_end and scan_entries[3 * cells[offset + 1] + 2] == C_SCAN_RIGHT:
+                    offset += 1
+                num_steps += offset - scan_start
+            elif transition[2] == C_SCAN_LEFT:
+                scan_entries = &table[state, 0, 0]
+                scan_start = offset
+                scan_end = 0
+                if <unsigned long long> offset > checkpoint - 1 - num_steps:
+                    scan_end = offset - <Py_ssize_t> (checkpoint - 1 - num_steps)
+                while offset > scan_end and scan_entries[3 * cells[offset - 1] + 2] == C_SCAN_LEFT:
+                    offset -= 1
+                num_steps += scan_start - offset
+        if transition[2] & 1:
+            offset += 1
+            if offset == page_size:
+                swap_cells, swap_base = cells, base
+                base += page_size
+                cells = other_cells if other_base == base else tape.page(base // page_size)
+                other_cells, other_base = swap_cells, swap_base
+                offset = 0
+                if loop_mode is profiled:
+                    head_hits = profile.page_hits(base, page_size)
+            if base + offset > highest:
+                highest = base + offset
+            if detect_loops:
+                power *= HASH_BASE
+        elif offset > 0:
+            offset -= 1
+            if base + offset < lowest:
+                lowest = base + offset
+            if detect_loops:
+                power *= HASH_BASE_INVERSE
+        elif two_way or base > 0:
+            swap_cells, swap_base = cells, base
+            base -= page_size
+            cells = other_cells if other_base == base else tape.page(base // page_size)
+            other_cells, other_base = swap_cells, swap_base
+            offset = page_size - 1
+            if loop_mode is profiled:
+                head_hits = profile.page_hits(base, page_size)
+            if base + offset < lowest:
+                lowest = base + offset
+            if detect_loops:
+                power *= HASH_BASE_INVERSE
+        state = transition[0]
+        if loop_mode is traced:
+            if num_trace_steps == trace_steps.shape[0]:
+                tape.lowest = lowest
+                tape.highest = highest
+                trace.write_steps(trace_array)
+                trace.write_checkpoint(state, base + offset, tape)
+                num_trace_steps = 0
+        if state == accepting or state == rejecting:
+            break
+        num_steps += 1
+        if num_steps == checkpoint:
+            if max_steps >= 0 and num_steps > <unsigned long long> max_steps:
+                num_steps -= 1
+                stopped = STEP_LIMIT
+                break
+            if deadline >= 0 and time.monotonic() > deadline:
+                stopped = TIME_LIMIT
+                break
+            checkpoint = next_checkpoint(num_steps, max_steps, deadline)
+        if detect_loops:
+            if state == snapshot_state and base + offset == snapshot_position and tape_hash == snapshot_hash:
+                tape.lowest = lowest
+                tape.highest = highest
+                if tapes_equal(snapshot_lowest, snapshot_cells, lowest, tape.to_array()):
+                    stopped = LOOP
+                    break
+            if num_steps - snapshot_step == snapshot_interval:
+                tape.lowest = lowest
+                tape.highest = highest
+                snapshot_state = state
+                snapshot_position = base + offset
+                snapshot_hash = tape_hash
+                snapshot_step = num_steps
+                snapshot_interval *= 2
+                snapshot_lowest = lowest
+                snapshot_cells = tape.to_array()
+
+    tape.lowest = lowest
+    tape.highest = highest
+    if loop_mode is profiled:
+        profile.max_tape_length = max(profile.max_tape_length, len(tape))
+    if loop_mode is traced:
+        trace.write_steps(trace_array[:num_trace_steps])
+    return num_steps, state == accepting, stopped
+
+
+def run_deterministic(LETTER_t[:, :, ::1] table not None, Tape tape not None, LETTER_t accepting, LETTER_t rejecting, long long max_steps=-1, double deadline=-1, bint detect_loops=False, Profile profile=None, trace=None, bint scan=False):
+    '''Run a deterministic machine on its dense transition table until it halts.
+
+    Each entry table[state, letter] holds (to_state, tape_output, move_right), or NO_TRANSITION as to_state if there is
+    no such transition. The head starts on cell 0 in state 0. The tape is modified in place.
+
+    The run stops early after max_steps steps, or once time.monotonic() passes the deadline (unless they are negative).
+    If detect_loops is set, it also stops as soon as a configuration repeats. Following Brent's algorithm, each
+    configuration is compared to a single snapshot, which is retaken whenever the number of steps since the previous
+    one reaches the next power of two. The comparison uses the state, the position and a rolling hash of the tape, and
+    only compares the tapes themselves when those match.
+
+    If a profile is given, every transition taken is counted in it. Otherwise, if a trace is given (see
+    turing.trace.TraceWriter), every transition taken is written to it with write_steps as a TRACE_t, and after every
+    trace.interval transitions the configuration is written with write_checkpoint.
+
+    Otherwise, if scan is set (and loops are not detected), the table may mark scans as in turing.optimizer.scan_table.
+    A run of cells that the same scan moves over is then crossed with a search over the page under the head, and
+    counted as one step per cell.
+
+    Returns:
+        tuple -- the number of steps, whether the machine accepted, and why it stopped (STEP_LIMIT, TIME_LIMIT or LOOP)
+            or None if it halted
+    '''
+
+    if profile is not None:
+        return deterministic_loop(<profiled> 0, table, tape, accepting, rejecting, max_steps, deadline, detect_loops, profile, trace)
+    if trace is not None:
+        return deterministic_loop(<traced> 0, table, tape, accepting, rejecting, max_steps, deadline, detect_loops, profile, trace)
+    if scan and not detect_loops:
+        return deterministic_loop(<scanning> 0, table, tape, accepting, rejecting, max_steps, deadline, detect_loops, profile, trace)
+    return deterministic_loop(<plain> 0, table, tape, accepting, rejecting, max_steps, deadline, detect_loops, profile, trace)
+
+
+cdef SYMBOL_t* page_cells(Tape tape, Py_ssize_t base):
+    cdef SYMBOL_t[::1] page = tape.page(base // tape.page_size)
+    return &page[0]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def run_multitape(LETTER_t[:, :, ::1] table not None, list tapes not None, LETTER_t num_letters, LETTER_t accepting, LETTER_t rejecting, long long max_steps=-1, double deadline=-1):
+    '''Run a deterministic multi-tape machine until it halts, as run_deterministic.
+
+    Each entry table[state, row] holds (to_state, tape_output, move) for every tape in turn, where the row combines the
+    letters under the heads as the digits of a number in base num_letters, the first tape being the most significant.
+    The moves are 0 (left), 1 (right) or STAY. All heads start on cell 0 in state 0, and the tapes are modified in
+    place. As in deterministic_loop, each tape keeps the page under its head and the previous one at hand.
+
+    Returns:
+        tuple -- the number of steps, whether the machine accepted, and why it stopped (STEP_LIMIT or TIME_LIMIT) or None
+            if it halted
+    '''
+
+    cdef Py_ssize_t num_tapes = len(tapes)
+    assert 0 < num_tapes <= C_MAX_TAPES, "the number of tapes must be between 1 and {}".format(MAX_TAPES)
+    assert table.shape[2] == 2 * num_tapes + 1, "the table does not match the number of tapes"
+    cdef Tape tape
+    cdef SYMBOL_t* cells[C_MAX_TAPES]
+    cdef SYMBOL_t* other_cells[C_MAX_TAPES]
+    cdef SYMBOL_t* swap_cells
+    cdef Py_ssize_t base[C_MAX_TAPES]
+    cdef Py_ssize_t other_base[C_MAX_TAPES]
+    cdef Py_ssize_t swap_base
+    cdef Py_ssize_t offset[C_MAX_TAPES]
+    cdef Py_ssize_t lowest[C_MAX_TAPES]
+    cdef Py_ssize_t highest[C_MAX_TAPES]
+    cdef Py_ssize_t page_size[C_MAX_TAPES]
+    cdef bint two_way[C_MAX_TAPES]
+    cdef Py_ssize_t t
+    for t in range(num_tapes):
+        tape = tapes[t]
+        cells[t] = other_cells[t] = page_cells(tape, 0)
+        base[t] = other_base[t] = offset[t] = 0
+        lowest[t] = tape.lowest
+        highest[t] = tape.highest
+        page_size[t] = tape.page_size
+        two_way[t] = tape.two_way
+
+    cdef Py_ssize_t width = table.shape[2]
+    cdef Py_ssize_t num_rows = table.shape[1]
+    cdef LETTER_t* first_transition = &table[0, 0, 0]
+    cdef LETTER_t* transition
+    cdef Py_ssize_t row
+    cdef LETTER_t move
+    cdef LETTER_t state = 0
+    cdef unsigned long long num_steps = 0
+    stopped = None
+    cdef unsigned long long checkpoint = next_checkpoint(0, max_steps, deadline)
+    cdef LETTER_t no_transition = C_NO_TRANSITION
+
+    while True:
+        row = 0
+        for t in range(num_tapes):
+            row = row * num_letters + cells[t][offset[t]]
+        transition = first_transition + (state * num_rows + row) * width
+        if transition[0] == no_transition:
+            state = rejecting
+            break
+        for t in range(num_tapes):
+            cells[t][offset[t]] = <SYMBOL_t> transition[2 * t + 1]
+            move = transition[2 * t + 2]
+            if move == 1:
+                offset[t] += 1
+                if offset[t] == page_size[t]:
+                    swap_cells, swap_base = cells[t], base[t]
+                    base[t] += page_size[t]
+                    cells[t] = other_cells[t] if other_base[t] == base[t] else page_cells(tapes[t], base[t])
+                    other_cells[t], other_base[t] = swap_cells, swap_base
+                    offset[t] = 0
+                if base[t] + offset[t] > highest[t]:
+                    highest[t] = base[t] + offset[t]
+            elif move == C_STAY:
+                pass
+            elif offset[t] > 0:
+                offset[t] -= 1
+                if base[t] + offset[t] < lowest[t]:
+                    lowest[t] = base[t] + offset[t]
+            elif two_way[t] or base[t] > 0:
+                swap_cells, swap_base = cells[t], base[t]
+                base[t] -= page_size[t]
+                cells[t] = other_cells[t] if other_base[t] == base[t] else page_cells(tapes[t], base[t])
+                other_cells[t], other_base[t] = swap_cells, swap_base
+                offset[t] = page_size[t] - 1
+                if base[t] + offset[t] < lowest[t]:
+                    lowest[t] = base[t] + offset[t]
+        state = transition[0]
+        if state == accepting or state == rejecting:
+            break
+        num_steps += 1
+        if num_steps == checkpoint:
+            if max_steps >= 0 and num_steps > <unsigned long long> max_steps:
+                num_steps -= 1
+                stopped = STEP_LIMIT
+                break
+            if deadline >= 0 and time.monotonic() > deadline:
+                stopped = TIME_LIMIT
+                break
+            checkpoint = next_checkpoint(num_steps, max_steps, deadline)
+
+    for t in range(num_tapes):
+        tape = tapes[t]
+        tape.lowest = lowest[t]
+        tape.highest = highest[t]
+    return num_steps, state == accepting, stopped
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def replay_steps(const TRACE_t[::1] steps not None, SYMBOL_t[::1] cells not None, LETTER_t state, Py_ssize_t position, bint two_way):
+    '''Apply the steps of a trace (see run_deterministic) to cells, starting with the head on cells[position].
+
+    The cells have to leave room for the head to move len(steps) cells either way, unless the tape is one-way and
+    cells[0] is its first cell.
+
+    Returns:
+        tuple -- the state, the position of the head, and the lowest and highest position it visited
+    '''
+
+    cdef Py_ssize_t i
+    cdef Py_ssize_t lowest = position, highest = position
+    cdef TRACE_t step
+    for i in range(steps.shape[0]):
+        step = steps[i]
+        cells[position] = <SYMBOL_t> (step >> 1)
+        if step & 1:
+            position += 1
+            if position > highest:
+                highest = position
+        elif position > 0 or two_way:
+            position -= 1
+            if position < lowest:
+                lowest = position
+        state = step >> C_TRACE_STATE_SHIFT
+    return state, position, lowest, highest
+
+
+# the largest block of the macro machine, as blocks are packed into 64 bits
+MAX_BLOCK_SIZE = 8
+DEFAULT_BLOCK_SIZE = 8
+DEFAULT_CACHE_SIZE = 1 << 16
+# the number of steps after which a block transition is cut short, so that loops within a block do not hang the run
+cdef unsigned long long BLOCK_STEPS = 1 << 16
+# number of macro steps between two checks of the deadline
+cdef unsigned long long MACRO_DEADLINE_INTERVAL = 1 << 10
+
+
+cdef class MacroMachine:
+    '''A deterministic machine simulated on blocks of block_size cells, as in busy beaver simulators.
+
+    The tape is split into blocks, and the head only stops at the edges of blocks: a macro step simulates the machine
+    from one edge of a block until it leaves the block. Macro steps only depend on the state, the contents of the block
+    and the side on which the head enters, so they are memoized in a bounded LRU cache. The tape is run-length encoded
+    as two stacks of (block, count) runs on either side of the head. Whenever a macro step leaves a block on the other
+    side in the same state, every copy of the block in the run gets the same treatment, so the whole run is crossed in
+    one jump. The number of steps stays exact.
+    '''
+
+    cdef LETTER_t[:, :, ::1] table
+    cdef LETTER_t accepting
+    cdef LETTER_t rejecting
+    cdef readonly Py_ssize_t block_size
+    # the memoized simulate_block
+    cdef readonly object transition
+
+    def __init__(self, LETTER_t[:, :, ::1] table not None, LETTER_t accepting, LETTER_t rejecting, Py_ssize_t block_size=DEFAULT_BLOCK_SIZE, cache_size=DEFAULT_CACHE_SIZE):
+        assert 0 < block_size <= MAX_BLOCK_SIZE, "the block size must be between 1 and {}".format(MAX_BLOCK_SIZE)
+        self.table = table
+        self.accepting = accepting
+        self.rejecting = rejecting
+        self.block_size = block_size
+        self.transition = functools.lru_cache(maxsize=cache_size)(self.simulate_block)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef tuple simulate_block(self, LETTER_t state, unsigned long long block, Py_ssize_t offset, bint leftmost, unsigned long long max_steps):
+        '''Run the machine within a block until the head leaves it, the machine halts or max_steps steps were taken.
+
+        Cell i of the block is byte i of block. If leftmost is set, the block is the first one of a one-way tape.
+
+        Returns:
+            tuple -- the state, the block, the offset of the head (-1 or block_size if it left the block), the number of
+                steps as counted by run_deterministic, and the lowest offset the head visited
+        '''
+
+        cdef SYMBOL_t cells[8]
+        cdef Py_ssize_t i
+        cdef Py_ssize_t lowest = offset
+        cdef unsigned long long num_steps = 0
+        cdef LETTER_t* transition
+        for i in range(self.block_size):
+            cells[i] = (block >> (8 * i)) & 0xff
+        while True:
+            transition = &self.table[state, cells[offset], 0]
+            if transition[0] == C_NO_TRANSITION:
+                state = self.rejecting
+                break
+            cells[offset] = <SYMBOL_t> transition[1]
+            if transition[2]:
+                offset += 1
+            elif offset > 0 or not leftmost:
+                offset -= 1
+                if offset < lowest:
+                    lowest = offset
+            state = transition[0]
+            if state == self.accepting or state == self.rejecting:
+                break
+            num_steps += 1
+            if offset < 0 or offset == self.block_size or num_steps == max_steps:
+                break
+        block = 0
+        for i in range(self.block_size):
+            block |= (<unsigned long long> cells[i]) << (8 * i)
+        return state, block, offset, num_steps, lowest
+
+    def run(self, Tape tape not None, long long max_steps=-1, double deadline=-1):
+        '''Run the machine like run_deterministic (without loop detection), modifying the tape in place.
+        '''
+
+        cdef Py_ssize_t k = self.block_size
+        cdef bint two_way = tape.two_way
+        # the runs left of the head and right of it, nearest last, beyond which all blocks are blank
+        cdef list left_blocks = [], left_counts = []
+        cdef list right_blocks = [], right_counts = []
+        # the head is between the blocks boundary - 1 and boundary, facing one of them, or inside block boundary (which
+        # is then on neither stack) if a macro step was cut short
+        cdef Py_ssize_t boundary = 0
+        cdef Py_ssize_t num_left = 0
+        cdef bint facing_right = True
+        cdef bint inside = False
+        cdef Py_ssize_t lowest = 0
+
+        cdef LETTER_t state = 0, new_state
+        cdef unsigned long long block = 0, new_block
+        cdef Py_ssize_t offset = 0, new_offset, block_lowest
+        cdef bint leftmost
+        cdef unsigned long long count, copies, steps, budget
+        cdef unsigned long long num_steps = 0
+        cdef unsigned long long iterations = 0
+        stopped = None
+
+        cells = tape.to_array()
+        cells = np.concatenate((cells, np.zeros(-len(cells) % k, dtype=SYMBOL)))
+        packed = np.zeros((len(cells) // k, 8), dtype=SYMBOL)
+        packed[:, :k] = cells.reshape(-1, k)
+        blocks = packed.view("<u8")[:, 0].tolist()
+        while blocks and blocks[-1] == 0:
+            blocks.pop()
+        for block in reversed(blocks):
+            push_run(right_blocks, right_counts, block, 1)
+        transition = self.transition
+
+        while True:
+            # the number of steps after which the run stops
+            budget = <unsigned long long> -1 if max_steps < 0 else max_steps + 1 - num_steps
+            stack_blocks, stack_counts = (right_blocks, right_counts) if facing_right else (left_blocks, left_counts)
+            if inside:
+                count = 1
+                leftmost = not two_way and num_left == 0
+            else:
+                if stack_blocks:
+                    block, count = stack_blocks[-1], stack_counts[-1]
+                else:
+                    block, count = 0, 1
+                offset = 0 if facing_right else k - 1
+                leftmost = not two_way and num_left == (0 if facing_right else 1)
+            new_state, new_block, new_offset, steps, block_lowest = transition(
+                state, block, offset, leftmost, BLOCK_STEPS)
+
+            copies = 1
+            if not inside and new_state == state and new_offset == (k if facing_right else -1) and not leftmost:
+                # every block of the run is crossed the same way, except the first block of a one-way tape
+                copies = count
+                if not two_way and not facing_right and num_left == count:
+                    copies -= 1
+                copies = min(copies, budget // steps)
+            if copies <= 1:
+                copies = 1
+                if steps >= budget:
+                    new_state, new_block, new_offset, steps, block_lowest = self.simulate_block(
+                        state, block, offset, leftmost, budget)
+
+            if not inside:
+                if stack_blocks:
+                    pop_run(stack_blocks, stack_counts, copies)
+                    if not facing_right:
+                        num_left -= copies
+                if not facing_right:
+                    boundary -= copies
+            lowest = min(lowest, boundary * k + block_lowest)
+            num_steps += copies * steps
+            state = new_state
+            inside = False
+            if new_offset == k:
+                push_run(left_blocks, left_counts, new_block, copies)
+                boundary += copies
+                num_left += copies
+                facing_right = True
+            elif new_offset == -1:
+                if right_blocks or new_block != 0:
+                    push_run(right_blocks, right_counts, new_block, copies)
+                facing_right = False
+            else:
+                inside, block, offset = True, new_block, new_offset
+
+            if state == self.accepting or state == self.rejecting:
+                break
+            if max_steps >= 0 and num_steps > <unsigned long long> max_steps:
+                num_steps -= 1
+                stopped = STEP_LIMIT
+                break
+            iterations += 1
+            if deadline >= 0 and iterations % MACRO_DEADLINE_INTERVAL == 0 and time.monotonic() > deadline:
+                stopped = TIME_LIMIT
+                break
+
+        if inside:
+            push_run(left_blocks, left_counts, block, 1)
+            boundary += 1
+            num_left += 1
+        runs = np.array(left_blocks + right_blocks[::-1], dtype="<u8")
+        counts = np.array(left_counts + right_counts[::-1], dtype=np.intp)
+        cells = np.ascontiguousarray(np.repeat(runs, counts).view(SYMBOL).reshape(-1, 8)[:, :k]).ravel()
+        start = (boundary - num_left) * k
+        # blank blocks are not pushed onto an empty stack, so they may still hold input on the tape
+        cells = np.concatenate((cells, np.zeros(max(tape.highest + 1 - start - len(cells), 0), dtype=SYMBOL)))
+        tape.write(start, cells)
+        if two_way:
+            tape.lowest = min(tape.lowest, lowest)
+        tape.highest = max(tape.highest, start + len(cells) - 1)
+        return num_steps, state == self.accepting, stopped
+
+
+cdef void push_run(list blocks, list counts, block, count):
+    if blocks and blocks[-1] == block:
+        counts[-1] += count
+    else:
+        blocks.append(block)
+        counts.append(count)
+
+
+cdef void pop_run(list blocks, list counts, count):
+    if counts[-1] == count:
+        blocks.pop()
+        counts.pop()
+    else:
+        counts[-1] -= count
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def search_depth_first(LETTER_t[:, :, :, ::1] table not None, tape, LETTER_t accepting, LETTER_t rejecting, long long max_depth=-1, double deadline=-1, Profile profile=None):
+    '''Search the computation tree of a nondeterministic machine depth-first.
+
+    Each entry table[state, letter, i] holds the i-th choice (to_state, tape_output, move_right), padded with
+    NO_TRANSITION as to_state. There is a single tape: every step records the state, head position and overwritten
+    letter in an undo log, which is replayed backwards when backtracking, so memory grows with the depth instead of the
+    number of configurations. Branches are not followed beyond max_depth steps (unless it is negative), and once an
+    accepting transition is found, only shallower ones are searched for. The search is abandoned once time.monotonic()
+    passes the deadline (unless it is negative). If a profile is given, every configuration is counted in it when it
+    is first reached.
+
+    Returns:
+        tuple -- the depth of the shallowest accepting transition (or -1 if there is none), the depth of the deepest
+            configuration reached, whether any branch was cut off at max_depth and whether the deadline passed
+    '''
+
+    cdef Py_ssize_t num_choices = table.shape[2]
+    cdef Py_ssize_t length = len(tape)
+    cdef np.ndarray tape_buffer = np.zeros(max(length * 2, 64), dtype=LETTER)
+    tape_buffer[:length] = tape
+    cdef LETTER_t[::1] cells = tape_buffer
+    # undo log: the choice to try next, then the state, position and letter before the step taken from each depth
+    cdef np.ndarray log_buffer = np.zeros((64, 4), dtype=np.int64)
+    cdef long long[:, ::1] log = log_buffer
+    cdef long long depth = 0
+    cdef long long deepest = 0
+    cdef long long shallowest = -1
+    cdef bint cut = False
+    cdef LETTER_t state = 0
+    cdef Py_ssize_t position = 0
+    cdef Py_ssize_t choice
+    cdef LETTER_t letter
+    cdef LETTER_t* transition
+    cdef unsigned long long iterations = 0
+    cdef bint timed_out = False
+    if profile is not None:
+        profile.max_tape_length = max(profile.max_tape_length, length)
+
+    while True:
+        iterations += 1
+        if deadline >= 0 and iterations % DEADLINE_INTERVAL == 0 and time.monotonic() > deadline:
+            timed_out = True
+            break
+        choice = log[depth, 0]
+        letter = cells[position]
+        if profile is not None and choice == 0:
+            profile.count(state, letter, position)
+            if position + 1 > profile.max_tape_length:
+                profile.max_tape_length = position + 1
+        if choice < num_choices and table[state, letter, choice, 0] != C_NO_TRANSITION:
+            log[depth, 0] = choice + 1
+            transition = &table[state, letter, choice, 0]
+            if transition[0] == rejecting:
+                continue
+            if transition[0] == accepting:
+                shallowest = depth
+                # only shallower accepting transitions are of interest now
+                max_depth = depth - 1
+                log[depth, 0] = num_choices
+                continue
+            if depth >= max_depth and max_depth >= 0:
+                cut = True
+                continue
+            # take the step
+            log[depth, 1] = state
+            log[depth, 2] = position
+            log[depth, 3] = letter
+            cells[position] = transition[1]
+            if transition[2]:
+                position += 1
+                if position == cells.shape[0]:
+                    tape_buffer = np.concatenate((tape_buffer, np.zeros(cells.shape[0], dtype=LETTER)))
+                    cells = tape_buffer
+            elif position > 0:
+                position -= 1
+            state = transition[0]
+            depth += 1
+            if depth == log.shape[0]:
+                log_buffer = np.concatenate((log_buffer, np.zeros_like(log_buffer)))
+                log = log_buffer
+            log[depth, 0] = 0
+            if depth > deepest:
+                deepest = depth
+        else:
+            # undo the step that led here
+            if depth == 0:
+                break
+            depth -= 1
+            state = <LETTER_t> log[depth, 1]
+            position = log[depth, 2]
+            cells[position] = <LETTER_t> log[depth, 3]
+
+    return shallowest, deepest, cut, timed_out
@@ -0,0 +1,171 @@
+'''Optimize compiled machine descriptions.
+
+optimize drops the states that cannot be reached from the initial state, and merges the states that behave the same
+(see equivalent_states). Both only drop and renumber states: every run of the optimized machine passes through the same
+tapes as the run of the original machine, in the states that the original states were merged into, so it takes exactly
+the same number of steps and has the same result. verify_quotient checks this on the tables themselves, and optimize
+refuses any result that does not pass it.
+
+Scans, the transitions that stay in their state and move over a letter without changing it (such as "move right over
+0, 1, X and Y until #"), are kept in the table. scan_table marks them, so that the deterministic simulator can cross a
+run of them in one go while still counting every step (see optimisations.run_deterministic).
+'''
+
+
+import array
+import numpy as np
+from turing.description import TuringMachineDescription, NO_TRANSITION, TABLE_TYPECODE
+from turing.error import TuringMachineError
+import turing.optimisations as optimisations
+
+
+def transition_rows(description: TuringMachineDescription) -> np.ndarray:
+    # the entries of every state as one row each, whatever the number of choices and tapes
+    table = description.table
+    return table.reshape(table.shape[0], -1, table.shape[-1])
+
+
+def reachable_states(description: TuringMachineDescription) -> np.ndarray:
+    '''Find the states that can be reached from the initial state, whatever the letters on the tape. The accepting and
+    rejecting states are always kept.
+
+    Returns:
+        np.ndarray -- whether each state is reachable
+    '''
+
+    targets = transition_rows(description)[:, :, 0]
+    reached = np.zeros(targets.shape[0], dtype=bool)
+    reached[0] = True
+    stack = [0]
+    while len(stack) > 0:
+        state_targets = targets[stack.pop()]
+        for state in np.unique(state_targets[state_targets != NO_TRANSITION]):
+            if not reached[state]:
+                reached[state] = True
+                stack.append(state)
+    reached[[description.accepting, description.rejecting]] = True
+    return reached
+
+
+def equivalent_states(description: TuringMachineDescription, reached: np.ndarray) -> np.ndarray:
+    '''Partition the reachable states into classes of states that behave the same.
+
+    Starting from the accepting state, the rejecting state and all other states, the classes are split until all states
+    of a class have the same entries, up to the classes of their next states (Moore's algorithm). States of the same
+    class then take the same steps on every tape.
+
+    Arguments:
+        description {TuringMachineDescription} -- the description
+        reached {np.ndarray} -- whether each state is reachable, as reachable_states
+
+    Returns:
+        np.ndarray -- the class of every state, numbered in the order of their first states (so the initial state stays
+            0), or -1 for the unreachable states
+    '''
+
+    rows = transition_rows(description).astype(np.int64)
+    states = np.flatnonzero(reached)
+    halting = np.zeros(len(rows), dtype=np.int64)
+    halting[description.accepting] = 1
+    halting[description.rejecting] = 2
+    classes = np.full(len(rows), -1, dtype=np.int64)
+    classes[states] = numbered(halting[states])
+    while True:
+        targets = rows[states, :, 0]
+        next_classes = np.where(targets == NO_TRANSITION, -1,
+                                classes[np.where(targets == NO_TRANSITION, 0, targets)])
+        signatures = np.concatenate((classes[states, None], next_classes, rows[states, :, 1:].reshape(len(states), -1)),
+                                    axis=1)
+        refined = numbered(signatures)
+        if refined.max() == classes[states].max():
+            return classes
+        classes[states] = refined
+
+
+def numbered(keys: np.ndarray) -> np.ndarray:
+    # the number of the distinct key of every item (or row), in the order in which the keys first appear
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.empty(len(first), dtype=np.int64)
+    order[np.argsort(first)] = np.arange(len(first))
+    return order[inverse.reshape(-1)]
+
+
+def quotient(description: TuringMachineDescription, classes: np.ndarray) -> TuringMachineDescription:
+    '''Build the machine with a state for every class, which has the entries of the first state of the class (with the
+    next states replaced by their classes) and its name.
+    '''
+
+    states = np.flatnonzero(classes >= 0)
+    _, first = np.unique(classes[states], return_index=True)
+    representatives = states[first]
+    num_classes = len(representatives)
+    rows = transition_rows(description)[representatives].copy()
+    targets = rows[:, :, 0]
+    defined = targets != NO_TRANSITION
+    targets[defined] = classes[targets[defined]]
+    entries = array.array(TABLE_TYPECODE)
+    entries.frombytes(rows.astype(optimisations.LETTER).tobytes())
+    return TuringMachineDescription(description.alphabet, [description.states[state] for state in representatives],
+                                    None, int(classes[description.accepting]), int(classes[description.rejecting]),
+                                    entries, (num_classes,) + description.shape[1:])
+
+
+def verify_quotient(original: TuringMachineDescription, optimized: TuringMachineDescription, classes: np.ndarray):
+    '''Check that the optimized machine simulates the original one step by step, given the state of the optimized
+    machine of every reachable state (or -1).
+
+    The initial, accepting and rejecting states have to be those of the optimized machine, the next states of the
+    reachable states have to be reachable, and every reachable state has to have the entries of its state in the
+    optimized machine, up to the states of its next states. Then both machines take the same steps on every tape.
+
+    Raises:
+        TuringMachineError -- if the optimized machine does not simulate the original one
+    '''
+
+    rows = transition_rows(original)
+    optimized_rows = transition_rows(optimized)
+    states = np.flatnonzero(classes >= 0)
+    targets = rows[states, :, 0]
+    defined = targets != NO_TRANSITION
+    expected = rows[states].astype(np.int64)
+    expected[:, :, 0][defined] = classes[targets[defined]]
+    if classes[0] != 0 or classes[original.accepting] != optimized.accepting or \
+            classes[original.rejecting] != optimized.rejecting or (expected[:, :, 0][defined] < 0).any() or \
+            rows.shape[1:] != optimized_rows.shape[1:] or original.alphabet != optimized.alphabet or \
+            not np.array_equal(expected, optimized_rows[classes[states]]):
+        raise TuringMachineError(
+            "the optimized machine does not simulate the original machine")
+
+
+def optimize(description: TuringMachineDescription) -> TuringMachineDescription:
+    '''Drop the unreachable states of a machine and merge its equivalent states, as verified by verify_quotient.
+
+    Arguments:
+        description {TuringMachineDescription} -- the description, of a deterministic or nondeterministic machine
+            with any number of tapes
+
+    Returns:
+        TuringMachineDescription -- the optimized description, whose states are named after the first state they
+            were merged from
+    '''
+
+    classes = equivalent_states(description, reachable_states(description))
+    optimized = quotient(description, classes)
+    verify_quotient(description, optimized, classes)
+    return optimized
+
+
+def scan_table(description: TuringMachineDescription) -> np.ndarray:
+    '''Mark the scans of a single-tape deterministic machine in a copy of its table: the moves of the transitions that
+    stay in their state and write the letter they read become optimisations.SCAN_LEFT or SCAN_RIGHT.
+
+    Returns:
+        np.ndarray -- the table, for optimisations.run_deterministic with scan set
+    '''
+
+    table = description.table.copy()
+    num_states, num_letters = table.shape[:2]
+    scans = (table[:, :, 0] == np.arange(num_states)[:, None]) & (
+        table[:, :, 1] == np.arange(num_letters)[None, :])
+    table[:, :, 2][scans] += optimisations.SCAN_LEFT
+    return table
@@ -0,0 +1,208 @@
+'''Expand the frontier of nondeterministic Turing machines on multiple processes.
+
+Once the frontier is wide enough, it is split into shards that are handed to worker processes through shared memory.
+Every configuration belongs to the shard of its hash, so identical configurations always end up on the same worker,
+which merges them (and remembers them, if visited configurations are remembered) as the serial simulation does. The
+workers expand their shards one level at a time, in lockstep, and send every new configuration to the worker of its
+hash, so the level at which the first branch accepts (and hence the number of steps) is the same as in the serial
+simulation, and so is the width of every level. As the hashes are spread evenly, so are the shards.
+'''
+
+
+import gc
+import multiprocessing
+import time
+from multiprocessing import shared_memory, resource_tracker
+from multiprocessing.connection import Connection
+import typing
+import numpy as np
+import turing.optimisations as optimisations
+
+# the smallest frontier that is worth splitting across processes
+MIN_FRONTIER = 4096
+# the number of configurations a worker expands before checking whether another worker has accepted
+CHUNK_SIZE = 1024
+
+
+def write_shared(header: np.ndarray, cells: np.ndarray) -> shared_memory.SharedMemory:
+    '''Copy encoded configurations into a new block of shared memory.
+
+    Arguments:
+        header {np.ndarray} -- the header from optimisations.encode_shared_configurations
+        cells {np.ndarray} -- the cells from optimisations.encode_shared_configurations
+
+    Returns:
+        shared_memory.SharedMemory -- the block, which the caller has to close and unlink
+    '''
+
+    memory = shared_memory.SharedMemory(
+        create=True, size=max(header.nbytes + cells.nbytes, 1))
+    shared_header, shared_cells = read_shared(
+        memory, header.shape[0], cells.shape[0])
+    shared_header[:] = header
+    shared_cells[:] = cells
+    return memory
+
+
+def read_shared(memory: shared_memory.SharedMemory, num_configurations: int, num_cells: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+    '''View the encoded configurations in a block of shared memory. The views must be released before the block is
+    closed.
+    '''
+
+    header = np.ndarray((num_configurations, 4), dtype=optimisations.LETTER,
+                        buffer=memory.buf)
+    cells = np.ndarray((num_cells, 2), dtype=optimisations.LETTER,
+                       buffer=memory.buf, offset=header.nbytes)
+    return header, cells
+
+
+def send_shards(shards: typing.List[list], own: int = None) -> list:
+    '''Copy shards into blocks of shared memory for the workers they belong to, except the shard of the worker with
+    the index own, if given, which keeps it.
+
+    Returns:
+        list -- the name of the block, the number of configurations and the number of cells of each shard, or None if
+            it is empty; the worker that reads a block unlinks it
+    '''
+
+    blocks = []
+    for i, configurations in enumerate(shards):
+        if len(configurations) == 0 or i == own:
+            blocks.append(None)
+            continue
+        header, cells = optimisations.encode_shared_configurations(
+            configurations)
+        memory = write_shared(header, cells)
+        blocks.append((memory.name, header.shape[0], cells.shape[0]))
+        memory.close()
+    return blocks
+
+
+def receive_shards(blocks: list) -> typing.List[optimisations.Configuration]:
+    # the configurations in the blocks of send_shards, which are unlinked
+    configurations = []
+    for block in blocks:
+        if block is None:
+            continue
+        name, num_configurations, num_cells = block
+        memory = shared_memory.SharedMemory(name=name)
+        header, cells = read_shared(memory, num_configurations, num_cells)
+        configurations.extend(
+            optimisations.decode_shared_configurations(header, cells))
+        del header, cells
+        memory.close()
+        memory.unlink()
+    return configurations
+
+
+def work(connection: Connection, machine, index: int, accepted: multiprocessing.Event):
+    '''Main loop of a worker process, which answers the commands sent by process_frontier.
+    '''
+
+    # the configurations cannot form reference cycles, and the garbage collector would otherwise spend most of the time
+    # of a worker going over the cells it receives
+    gc.disable()
+    configurations = []
+    visited = set()
+    while True:
+        command, *args = connection.recv()
+        if command == "load":
+            # the configurations of the shard of this worker, from all workers
+            if not machine.remember_visited:
+                visited.clear()
+            configurations.extend(receive_shards(args[0]))
+            if machine.deduplicate:
+                configurations = [c for c in configurations
+                                  if not (c in visited or visited.add(c))]
+            connection.send(len(configurations))
+        elif command == "step":
+            # the duplicates are merged by the workers of their shards
+            description = machine.description
+            next_configurations = []
+            try:
+                for start in range(0, len(configurations), CHUNK_SIZE):
+                    if accepted.is_set():
+                        break
+                    next_configurations.extend(optimisations.expand_configurations(
+                        configurations[start:start + CHUNK_SIZE], description.table, description.accepting,
+                        description.rejecting))
+            except optimisations.Accept:
+                accepted.set()
+            shards = optimisations.shard_configurations(
+                next_configurations, machine.processes)
+            # the shard of this worker stays here until the load
+            configurations = shards[index]
+            connection.send(send_shards(shards, index))
+        elif command == "stop":
+            return
+
+
+def exchange(connections: typing.List[Connection], blocks: typing.List[list]) -> typing.List[int]:
+    '''Hand every worker the blocks of its shard, where blocks[i][j] is the block from worker i (or the main process)
+    for worker j, and return the sizes of the shards.
+    '''
+
+    for j, connection in enumerate(connections):
+        connection.send(("load", [sent[j] for sent in blocks]))
+    return [connection.recv() for connection in connections]
+
+
+def process_frontier(machine, configurations: list, num_steps: int, deadline: float = -1) -> typing.Tuple[int, bool, str]:
+    '''Continue the breadth-first search of a nondeterministic machine on machine.processes worker processes.
+
+    Arguments:
+        machine {NondeterministicTuringMachine} -- the machine
+        configurations {list} -- the current level of the search
+        num_steps {int} -- the number of steps taken to reach the current level
+
+    Keyword Arguments:
+        deadline {float} -- the time.monotonic() time at which to stop, if not negative (default: {-1})
+
+    Returns:
+        typing.Tuple[int, bool, str] -- the number of steps, whether the machine accepted and why the search stopped
+            early, if it did, as for the serial search
+    '''
+
+    context = multiprocessing.get_context()
+    accepted = context.Event()
+    # the workers have to share the tracker of the shared memory blocks with this process
+    resource_tracker.ensure_running()
+    connections, workers = [], []
+    try:
+        for index in range(machine.processes):
+            connection, child_connection = context.Pipe()
+            worker = context.Process(target=work, args=(
+                child_connection, machine, index, accepted), daemon=True)
+            worker.start()
+            child_connection.close()
+            connections.append(connection)
+            workers.append(worker)
+        exchange(connections, [send_shards(
+            optimisations.shard_configurations(configurations, machine.processes))])
+        del configurations
+        while True:
+            for connection in connections:
+                connection.send(("step",))
+            # the blocks are handed on even once a branch accepted, as the workers unlink them
+            sizes = exchange(connections, [connection.recv()
+                                           for connection in connections])
+            if accepted.is_set():
+                return num_steps, True, None
+            total = sum(sizes)
+            if total == 0:
+                return num_steps, False, None
+            if num_steps == machine.max_steps:
+                return num_steps, False, optimisations.STEP_LIMIT
+            num_steps += 1
+            if deadline >= 0 and time.monotonic() > deadline:
+                return num_steps, False, optimisations.TIME_LIMIT
+    finally:
+        for connection, worker in zip(connections, workers):
+            try:
+                connection.send(("stop",))
+            except (BrokenPipeError, EOFError):
+                pass
+            connection.close()
+            worker.join(1)
+            if worker.is_alive():
+                worker.terminate()
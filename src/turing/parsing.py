@@ -2,9 +2,15 @@
 '''
 
 
+import io
+import typing
 from turing.machine import NondeterministicTuringMachine, DeterministicTuringMachine
-from turing.description import TuringMachineDescription, TuringMachineDescriptionBuilder
+from turing.description import TuringMachineDescription, TuringMachineDescriptionBuilder, MOVES
 from turing.error import SyntaxError
+from turing.lazy import LazyModule
+import turing.cache as cache
+
+optimizer = LazyModule("turing.optimizer")
 
 
 def assert_syntax(cond: bool, message: str):
@@ -19,65 +25,143 @@ def assert_cast(var, t: type, message: str):
         raise SyntaxError(message)
 
 
-def parse_machine(encoded_machine_file: str, deterministic: bool = True):
-    with open(encoded_machine_file, "r") as f:
-        description = TuringMachineDescriptionBuilder(
-            deterministic=deterministic)
+def parse_machine(encoded_machine_file: str, deterministic: bool = True, use_cache: bool = True, optimize: bool = False, jit: bool = False, **options):
+    '''Parse a machine file into a simulator.
+
+    Arguments:
+        encoded_machine_file {str} -- the name of the *.tm file
+
+    Keyword Arguments:
+        deterministic {bool} -- whether to build a deterministic simulator (default: {True})
+        use_cache {bool} -- whether to load the compiled machine from the cache (see turing.cache), and to compile it
+            there if it is not yet (default: {True})
+        optimize {bool} -- whether to optimize the machine with turing.optimizer, and to let the deterministic
+            simulator cross scans in one go (its scan_loops option); neither changes the steps or the result of a run
+            (default: {False})
+        jit {bool} -- whether the deterministic simulator runs an engine generated for the machine (see turing.jit),
+            which is cached next to the compiled machines (its jit_directory option) (default: {False})
+
+    Any other keyword arguments are passed on to the simulator.
+    '''
+
+    with open(encoded_machine_file, "rb") as f:
+        source = f.read()
+    description = None
+    if use_cache:
+        path = cache.cache_path(
+            encoded_machine_file, source, deterministic, optimize)
+        description = cache.load_description(path, deterministic)
+    if description is None:
+        description = parse_description(
+            io.StringIO(source.decode()), deterministic)
+        if optimize:
+            description = optimizer.optimize(description)
+        if use_cache:
+            try:
+                cache.save_description(path, description, deterministic)
+            except OSError:
+                # the cache is only an optimisation
+                pass
+    if deterministic and optimize:
+        options.setdefault("scan_loops", True)
+    if deterministic and jit:
+        options.setdefault("jit_directory", cache.cache_directory(
+            encoded_machine_file))
+    return DeterministicTuringMachine(description, **options) if deterministic else NondeterministicTuringMachine(description, **options)
+
+
+def parse_description(f: typing.TextIO, deterministic: bool = True) -> TuringMachineDescription:
+    '''Parse the contents of a machine file.
+
+    A machine with more than one tape starts with a "tapes k" heading. Each of its transitions is a line with the state,
+    the letters under the k heads, the next state, the k letters written and the k moves (L, R or S to stay).
 
-        # states heading
+    Arguments:
+        f {typing.TextIO} -- the *.tm file
+
+    Keyword Arguments:
+        deterministic {bool} -- whether to build a description for the deterministic simulator (default: {True})
+
+    Returns:
+        TuringMachineDescription -- the description
+    '''
+
+    # optional tapes heading
+    line = f.readline().strip().split(" ")
+    num_tapes = 1
+    if line[0] == "tapes":
+        assert_syntax(len(line) == 2, "tapes heading not properly defined")
+        num_tapes = assert_cast(
+            line[1], int, "the number of tapes must be an integer")
+        assert_syntax(num_tapes > 0, "the machine needs at least one tape")
         line = f.readline().strip().split(" ")
-        assert_syntax(len(line) == 2, "states heading not properly defined")
-        states_str, num_states = line
-        assert_syntax(states_str == "states",
-                      "expected states heading, got {}".format(states_str))
-        num_states = assert_cast(
-            num_states, int, "the number of states must be an integer")
-
-        # process states
-        for i in range(num_states):
-            line = f.readline().strip().split(" ")
-            assert_syntax(len(line) <= 2,
-                          "too many arguments to define the state")
-            state_name = line[0]
-            assert_syntax(state_name != "alphabet",
-                          "more states defined than expected")
-            description.add_state(state_name)
-            if len(line) == 2:
-                accept_or_reject = line[1]
-                assert_syntax(accept_or_reject in ("+", "-"),
-                              "second argument must be + or -")
-                if accept_or_reject == "+":
-                    description.set_accepting(state_name)
-                else:
-                    description.set_rejecting(state_name)
-            if i == 0:
-                description.set_initial(state_name)
-
-        # process alphabet
+    description = TuringMachineDescriptionBuilder(
+        deterministic=deterministic, num_tapes=num_tapes)
+
+    # states heading
+    assert_syntax(len(line) == 2, "states heading not properly defined")
+    states_str, num_states = line
+    assert_syntax(states_str == "states",
+                  "expected states heading, got {}".format(states_str))
+    num_states = assert_cast(
+        num_states, int, "the number of states must be an integer")
+
+    # process states
+    for i in range(num_states):
         line = f.readline().strip().split(" ")
-        assert_syntax(len(line) >= 2, "too few arguments to define alphabet")
-        assert_syntax(line[0] == "alphabet", "expected alphabet heading")
-        num_letters = assert_cast(
-            line[1], int, "the number of letters in the alphabet must be an integer")
-        assert_syntax(num_letters > 0,
-                      "the alphabet needs at least one letter")
-        alphabet = line[2::]
-        assert_syntax(len(alphabet) == num_letters,
-                      "the actual number of letters needs to match the number of letters provided")
-        for letter in alphabet:
-            description.add_letter(letter)
-
-        while True:
-            line = f.readline().strip()
-            if not line:
-                break
-            line = line.split(" ")
-            assert_syntax(len(line) == 5, "the line requires five arguments")
-            from_state, tape_input, to_state, tape_output, action = line
-            assert_syntax(action in ["L", "R"],
-                          "the action must either be L or R")
-            move_right = action == "R"
-            description.add_transition(
-                from_state, tape_input, to_state, tape_output, move_right)
-        description.verify_validity()
-        return DeterministicTuringMachine(description.build()) if deterministic else NondeterministicTuringMachine(description.build())
+        assert_syntax(len(line) <= 2,
+                      "too many arguments to define the state")
+        state_name = line[0]
+        assert_syntax(state_name != "alphabet",
+                      "more states defined than expected")
+        description.add_state(state_name)
+        if len(line) == 2:
+            accept_or_reject = line[1]
+            assert_syntax(accept_or_reject in ("+", "-"),
+                          "second argument must be + or -")
+            if accept_or_reject == "+":
+                description.set_accepting(state_name)
+            else:
+                description.set_rejecting(state_name)
+        if i == 0:
+            description.set_initial(state_name)
+
+    # process alphabet
+    line = f.readline().strip().split(" ")
+    assert_syntax(len(line) >= 2, "too few arguments to define alphabet")
+    assert_syntax(line[0] == "alphabet", "expected alphabet heading")
+    num_letters = assert_cast(
+        line[1], int, "the number of letters in the alphabet must be an integer")
+    assert_syntax(num_letters > 0,
+                  "the alphabet needs at least one letter")
+    alphabet = line[2::]
+    assert_syntax(len(alphabet) == num_letters,
+                  "the actual number of letters needs to match the number of letters provided")
+    for letter in alphabet:
+        description.add_letter(letter)
+
+    while True:
+        line = f.readline().strip()
+        if not line:
+            break
+        line = line.split(" ")
+        if num_tapes > 1:
+            assert_syntax(len(line) == 3 * num_tapes + 2,
+                          "the line requires {} arguments".format(3 * num_tapes + 2))
+            from_state, to_state = line[0], line[num_tapes + 1]
+            actions = line[2 * num_tapes + 2:]
+            assert_syntax(all(action in MOVES for action in actions),
+                          "the actions must be L, R or S")
+            description.add_multitape_transition(from_state, tuple(line[1:num_tapes + 1]), to_state,
+                                                 tuple(line[num_tapes + 2:2 * num_tapes + 2]),
+                                                 tuple(MOVES.index(action) for action in actions))
+            continue
+        assert_syntax(len(line) == 5, "the line requires five arguments")
+        from_state, tape_input, to_state, tape_output, action = line
+        assert_syntax(action in ["L", "R"],
+                      "the action must either be L or R")
+        move_right = action == "R"
+        description.add_transition(
+            from_state, tape_input, to_state, tape_output, move_right)
+    description.verify_validity()
+    return description.build()
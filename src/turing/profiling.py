@@ -0,0 +1,88 @@
+'''Turn the counters of a profiled run (see optimisations.Profile) into JSON and into a readable report.
+'''
+
+
+from __future__ import annotations
+import typing
+from turing.description import TuringMachineDescription
+from turing.lazy import LazyModule
+
+np = LazyModule("numpy")
+optimisations = LazyModule("turing.optimisations")
+
+# the number of rows of the transitions table and of the head histogram in the report
+TOP_TRANSITIONS = 10
+HISTOGRAM_BUCKETS = 10
+BAR_WIDTH = 40
+
+
+def summarize(profile: optimisations.Profile, description: TuringMachineDescription) -> dict:
+    '''Summarize the counters with the names of the states and letters, as a JSON-serializable dictionary.
+
+    Arguments:
+        profile {optimisations.Profile} -- the counters of the run
+        description {TuringMachineDescription} -- the machine that was run
+
+    Returns:
+        dict -- the hits of each transition (most frequent first), the steps in each state, the hits of every head
+            position from the lowest one onwards, the largest tape and the width of each level of the search
+    '''
+
+    states, letters = np.nonzero(profile.transition_counts)
+    transitions = [{"state": description.states[state], "letter": description.alphabet[letter],
+                    "count": int(profile.transition_counts[state, letter])} for state, letter in zip(states, letters)]
+    transitions.sort(key=lambda transition: -transition["count"])
+    positions = np.flatnonzero(profile.head_counts)
+    head_counts = profile.head_counts[positions[0]:positions[-1] + 1] if len(positions) > 0 else positions
+    return {
+        "num_transitions": int(profile.transition_counts.sum()),
+        "transitions": transitions,
+        "states": {description.states[state]: int(count) for state, count in enumerate(profile.state_counts) if count > 0},
+        "head_positions": {
+            "lowest": int(profile.head_origin + positions[0]) if len(positions) > 0 else 0,
+            "counts": head_counts.tolist()
+        },
+        "max_tape_length": profile.max_tape_length,
+        "frontier_widths": list(profile.frontier_widths)
+    }
+
+
+def format_report(summary: dict) -> str:
+    '''Format a summary from summarize for reading.
+    '''
+
+    total = max(summary["num_transitions"], 1)
+    head_counts = summary["head_positions"]["counts"]
+    lowest = summary["head_positions"]["lowest"]
+    lines = ["{} transitions taken, tape of up to {} cells, head between cells {} and {}".format(
+        summary["num_transitions"], summary["max_tape_length"], lowest, lowest + max(len(head_counts) - 1, 0))]
+
+    lines.append("Steps in each state:")
+    for state, count in sorted(summary["states"].items(), key=lambda item: -item[1]):
+        lines.append("  {:12s} {:>16d} {:6.1%}".format(state, count, count / total))
+
+    lines.append("Most frequent transitions:")
+    for transition in summary["transitions"][:TOP_TRANSITIONS]:
+        lines.append("  {:12s} {:3s} {:>16d} {:6.1%}".format(
+            transition["state"], transition["letter"], transition["count"], transition["count"] / total))
+
+    lines.append("Head positions:")
+    for start, counts in histogram(head_counts):
+        end = start + len(counts) - 1
+        count = sum(counts)
+        lines.append("  {:>10s} {:<{}s} {}".format("{}-{}".format(lowest + start, lowest + end) if end > start else
+                                                   str(lowest + start), "#" * round(BAR_WIDTH * count / total),
+                                                   BAR_WIDTH, count))
+
+    widths = summary["frontier_widths"]
+    if widths:
+        widest = max(range(len(widths)), key=widths.__getitem__)
+        lines.append("Frontier: {} levels, {} configurations, at most {} at level {}".format(
+            len(widths), sum(widths), widths[widest], widest))
+    return "\n".join(lines)
+
+
+def histogram(counts: typing.List[int]) -> typing.List[typing.Tuple[int, typing.List[int]]]:
+    # split the counts into at most HISTOGRAM_BUCKETS consecutive buckets
+    size = max(-(-len(counts) // HISTOGRAM_BUCKETS), 1)
+    return [(start, counts[start:start + size]) for start in range(0, len(counts), size)]
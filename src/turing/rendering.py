@@ -0,0 +1,137 @@
+'''Print the configurations of a verbose run.
+
+Every configuration is formatted into a single line, and the lines are written in batches instead of one print call
+per cell. A window limits each line to the cells around the head, and the configurations can be sampled: every k-th
+step, or only the steps that change the state. The frontier of a nondeterministic run can be cut off after a number of
+configurations.
+'''
+
+
+from __future__ import annotations
+import sys
+import typing
+from turing.description import TuringMachineDescription
+from turing.error import assert_property
+from turing.lazy import LazyModule
+
+optimisations = LazyModule("turing.optimisations")
+
+# the head is shown in red
+HEAD = "\033[91m{} \033[0m"
+# the number of characters after which the buffered lines are written
+BUFFER_SIZE = 1 << 16
+
+
+class Renderer:
+    '''Formats configurations and writes them to a stream, as the verbose argument of process_input.
+    '''
+
+    def __init__(self, description: TuringMachineDescription, window: int = None, every: int = 1, state_changes: bool = False, max_configurations: int = None, out: typing.TextIO = None):
+        '''Create a renderer.
+
+        Arguments:
+            description {TuringMachineDescription} -- the machine description
+
+        Keyword Arguments:
+            window {int} -- the number of cells shown on either side of the head, or None for the whole tape
+                (default: {None})
+            every {int} -- only show every k-th step, or every k-th level of the search (default: {1})
+            state_changes {bool} -- only show the steps that enter another state; cannot be combined with every
+                (default: {False})
+            max_configurations {int} -- the number of configurations shown of each level of the search, or None for
+                all of them (default: {None})
+            out {typing.TextIO} -- the stream to write to (default: {sys.stdout})
+        '''
+
+        assert_property(window is None or window >= 0,
+                        "the window cannot be negative")
+        assert_property(every >= 1, "the sampling interval must be positive")
+        assert_property(every == 1 or not state_changes,
+                        "steps cannot be sampled both by interval and by state changes")
+        assert_property(max_configurations is None or max_configurations >= 0,
+                        "the number of configurations cannot be negative")
+        self.states = [" {:5s} ".format(state) for state in description.states]
+        self.letters = [letter + " " for letter in description.alphabet]
+        self.heads = [HEAD.format(letter) for letter in description.alphabet]
+        self.window = window
+        self.every = every
+        self.state_changes = state_changes
+        self.max_configurations = max_configurations
+        self.out = sys.stdout if out is None else out
+        # sampled lines are numbered, as their steps can no longer be counted
+        self.numbered = every > 1 or state_changes
+        self.previous_state = None
+        self.lines = []
+        self.size = 0
+
+    def sampled(self, step: int, state: int) -> bool:
+        changed = state != self.previous_state
+        self.previous_state = state
+        if self.state_changes:
+            return changed
+        return step % self.every == 0
+
+    def format(self, step: int, state: int, cells: typing.Sequence[int], position: int, cut_left: bool, cut_right: bool) -> str:
+        '''Format a configuration, given the shown cells and the position of the head among them.
+        '''
+
+        parts = ["{:>10d}".format(step)] if self.numbered else []
+        parts.append(self.states[state])
+        if cut_left:
+            parts.append("... ")
+        letters = self.letters
+        parts.extend(letters[letter] for letter in cells[:position])
+        if position < len(cells):
+            parts.append(self.heads[cells[position]])
+            parts.extend(letters[letter] for letter in cells[position + 1:])
+        if cut_right:
+            parts.append("...")
+        parts.append("\n")
+        return "".join(parts)
+
+    def show_tape(self, step: int, state: int, tape: optimisations.Tape, position: int, last: bool = False):
+        '''Show a configuration of the deterministic simulator, if it is sampled or the last one.
+        '''
+
+        if not self.sampled(step, state) and not last:
+            return
+        if self.window is None:
+            start, end = tape.lowest, tape.highest + 1
+        else:
+            start = max(position - self.window, tape.lowest)
+            end = min(position + self.window + 1, tape.highest + 1)
+        self.write(self.format(step, state, tape.read(start, end).tolist(), position - start,
+                               start > tape.lowest, end <= tape.highest))
+
+    def show_frontier(self, step: int, configurations: typing.List[optimisations.Configuration]):
+        '''Show a level of the nondeterministic search, if it is sampled, followed by an empty line.
+        '''
+
+        if step % self.every != 0:
+            return
+        shown = configurations if self.max_configurations is None else configurations[:self.max_configurations]
+        for configuration in shown:
+            cells = configuration.tape
+            position = configuration.position
+            start, end = 0, len(cells)
+            if self.window is not None:
+                start = max(position - self.window, 0)
+                end = min(position + self.window + 1, len(cells))
+            self.write(self.format(step, configuration.state, cells[start:end], position - start,
+                                   start > 0, end < len(cells)))
+        if len(shown) < len(configurations):
+            self.write("  ... {} more configurations\n".format(
+                len(configurations) - len(shown)))
+        self.write("\n")
+
+    def write(self, line: str):
+        self.lines.append(line)
+        self.size += len(line)
+        if self.size >= BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        self.out.write("".join(self.lines))
+        self.out.flush()
+        self.lines.clear()
+        self.size = 0
@@ -0,0 +1,217 @@
+'''Turn the contents of tape files into the numbers of their letters.
+
+A tape file is mapped into memory instead of read, and every byte is turned into the number of its letter with a lookup
+table of 256 entries, without building a string or a list of letters first. Newlines and spaces are skipped, as in the
+tapes of runtm.py. For the deterministic simulator, the letters are written straight into the pages of its tape (see
+optimisations.read_letters).
+
+The lookup table needs every letter to be a single byte. The tapes of machines with other letters are decoded as text
+instead.
+
+Output tapes (see OutputTape) are kept as the numbers of their letters, and only turned into text, the same way in
+reverse, when they are printed.
+'''
+
+
+from __future__ import annotations
+import array
+import mmap
+import typing
+from turing.error import TuringMachineError
+from turing.lazy import LazyModule
+
+np = LazyModule("numpy")
+optimisations = LazyModule("turing.optimisations")
+
+# the entries of the lookup table for the bytes that are not letters
+SKIP = -1
+INVALID = -2
+SKIPPED = b"\n "
+# tapes up to this many bytes are decoded in pure Python, which saves loading NumPy
+MAX_PURE_TAPE = 1 << 12
+# the number of cells that are searched for the last non-blank cell, and turned into text, at a time
+CHUNK_SIZE = 1 << 20
+
+
+def open_tape(filename: str) -> typing.Union[mmap.mmap, bytes]:
+    '''Map a tape file into memory.
+
+    Arguments:
+        filename {str} -- the name of the file
+
+    Returns:
+        typing.Union[mmap.mmap, bytes] -- the contents of the file, which are read instead if it is empty (as empty
+            files cannot be mapped)
+    '''
+
+    with open(filename, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return f.read()
+
+
+def letter_table(alphabet: str) -> typing.Union[array.array, None]:
+    '''Build the lookup table from bytes to the numbers of the letters, SKIP or INVALID.
+
+    Returns:
+        typing.Union[array.array, None] -- the 256 int16 entries, or None if some letter is not a single byte
+    '''
+
+    table = array.array("h", [INVALID]) * 256
+    for byte in SKIPPED:
+        table[byte] = SKIP
+    for i, letter in enumerate(alphabet):
+        encoded = letter.encode()
+        if len(encoded) != 1:
+            return None
+        table[encoded[0]] = i
+    return table
+
+
+def invalid_character(offset: int) -> TuringMachineError:
+    return TuringMachineError("input contains an invalid character at byte {}".format(offset))
+
+
+def decode_letters(data: typing.ByteString, alphabet: str) -> typing.List[int]:
+    '''Turn the contents of a tape file into the numbers of its letters. An empty tape is a single blank.
+
+    Arguments:
+        data {typing.ByteString} -- the contents of the file
+        alphabet {str} -- the letters of the machine
+
+    Raises:
+        TuringMachineError -- with the offset of the first byte that is not a letter
+
+    Returns:
+        typing.List[int] -- the numbers of the letters
+    '''
+
+    table = letter_table(alphabet)
+    if table is None:
+        letters = decode_text(data, alphabet)
+    elif len(data) <= MAX_PURE_TAPE:
+        letters = [table[byte] for byte in memoryview(data)]
+        if INVALID in letters:
+            raise invalid_character(letters.index(INVALID))
+        letters = [letter for letter in letters if letter != SKIP]
+    else:
+        codes = np.frombuffer(table, dtype=np.int16)[
+            np.frombuffer(data, dtype=np.uint8)]
+        invalid = np.flatnonzero(codes == INVALID)
+        if len(invalid) > 0:
+            raise invalid_character(int(invalid[0]))
+        letters = codes[codes != SKIP].tolist()
+    return letters if len(letters) > 0 else [0]
+
+
+def decode_text(data: typing.ByteString, alphabet: str) -> typing.List[int]:
+    # the slow path for letters of more than one byte
+    letters = []
+    offset = 0
+    for character in bytes(data).decode(errors="replace"):
+        if character not in "\n ":
+            i = alphabet.find(character)
+            if i < 0:
+                raise invalid_character(offset)
+            letters.append(i)
+        offset += len(character.encode())
+    return letters
+
+
+def read_tape(data: typing.ByteString, alphabet: str, two_way: bool = False) -> optimisations.Tape:
+    '''Turn the contents of a tape file into a tape for the deterministic simulator, as decode_letters.
+    '''
+
+    table = letter_table(alphabet)
+    if table is None:
+        return optimisations.Tape(decode_text(data, alphabet), two_way=two_way)
+    tape, offset = optimisations.read_letters(data, table, two_way)
+    if offset >= 0:
+        raise invalid_character(offset)
+    return tape
+
+
+def trimmed_length(cells: typing.Union[np.ndarray, bytes, bytearray]) -> int:
+    '''Get the number of cells up to the last non-blank one, searching backwards a chunk at a time.
+    '''
+
+    if isinstance(cells, (bytes, bytearray)):
+        return len(cells.rstrip(b"\0"))
+    end = len(cells)
+    while end > 0:
+        start = max(end - CHUNK_SIZE, 0)
+        nonblank = np.flatnonzero(cells[start:end])
+        if len(nonblank) > 0:
+            return start + int(nonblank[-1]) + 1
+        end = start
+    return 0
+
+
+class OutputTape:
+    '''The output tape of a run, as the numbers of its letters up to the last non-blank one (or a single blank). It is
+    only turned into text when that is asked for, and can be written to a file a chunk at a time.
+
+    Iterating over it gives the letters, so it can stand in for the list of letters of TuringMachineResult.
+    '''
+
+    def __init__(self, cells: typing.Union[np.ndarray, bytes, bytearray], alphabet: str):
+        '''Create an output tape.
+
+        Arguments:
+            cells {typing.Union[np.ndarray, bytes, bytearray]} -- the numbers of the letters on the tape, from the
+                lowest visited cell onwards (in an array of optimisations.LETTER if the alphabet has more than 256
+                letters)
+            alphabet {str} -- the letters of the machine
+        '''
+
+        self.cells = cells[:max(trimmed_length(cells), 1)]
+        if len(self.cells) == 0:
+            self.cells = bytes(1)
+        self.alphabet = alphabet
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.text())
+
+    def __eq__(self, other):
+        if isinstance(other, OutputTape):
+            return self.text() == other.text()
+        return list(self) == other
+
+    def __str__(self):
+        return self.text()
+
+    def translation(self, encoding: str) -> typing.Union[bytes, None]:
+        # the table for bytes.translate, if every letter is a single byte in the encoding
+        if len(self.alphabet) > 256:
+            return None
+        table = bytearray(256)
+        for i, letter in enumerate(self.alphabet):
+            encoded = letter.encode(encoding)
+            if len(encoded) != 1:
+                return None
+            table[i] = encoded[0]
+        return bytes(table)
+
+    def chunks(self, encoding: str) -> typing.Iterator[bytes]:
+        table = self.translation(encoding)
+        for start in range(0, len(self.cells), CHUNK_SIZE):
+            chunk = self.cells[start:start + CHUNK_SIZE]
+            if table is not None:
+                # the letters are below 256 if there is a table, also in an array of wider numbers
+                yield bytes(chunk if isinstance(chunk, (bytes, bytearray)) else chunk.astype(np.uint8)).translate(table)
+            else:
+                yield "".join(self.alphabet[x] for x in chunk).encode(encoding)
+
+    def text(self) -> str:
+        return b"".join(self.chunks("utf-8")).decode("utf-8")
+
+    def write(self, f: typing.BinaryIO, encoding: str = "utf-8"):
+        '''Write the letters to a binary file, without building the whole text first.
+        '''
+
+        for chunk in self.chunks(encoding):
+            f.write(chunk)
@@ -0,0 +1,204 @@
+'''Record runs of the deterministic simulator in a compact binary trace, and replay them.
+
+A trace is a HEADER with the alphabet and state names, followed by chunks. A STEPS chunk holds the transitions taken
+(see optimisations.run_deterministic), four bytes each, and a CHECKPOINT chunk holds the complete configuration. There
+is a checkpoint before the first step and after every interval steps. The END chunk lists the checkpoints, and the
+last eight bytes of the file point to it. A trace that was cut short has no END chunk, and its checkpoints are found by
+scanning the chunks instead.
+
+Step k of a trace is the configuration after k transitions. As the last transition of a halting run enters the
+accepting or rejecting state, a trace has one step more than the result of its run.
+'''
+
+
+from __future__ import annotations
+import bisect
+import mmap
+import struct
+import typing
+from turing.description import TuringMachineDescription
+from turing.error import assert_property, TuringMachineError
+from turing.lazy import LazyModule
+
+np = LazyModule("numpy")
+optimisations = LazyModule("turing.optimisations")
+
+VERSION = 1
+# magic, version, whether the tape is two-way, the interval between checkpoints, and the sizes of the alphabet and
+# state names in bytes
+HEADER = struct.Struct("<4s5I")
+MAGIC = b"TMT\0"
+# kind, the first step and the size of the payload
+CHUNK = struct.Struct("<4sQQ")
+STEPS = b"STEP"
+CHECKPOINT = b"CHKP"
+END = b"END\0"
+# the state, the position of the head and the lowest visited cell, followed by the visited cells
+CONFIGURATION = struct.Struct("<Iqq")
+FOOTER = struct.Struct("<Q")
+# the number of steps between two checkpoints, which bounds the work of replaying a step
+DEFAULT_INTERVAL = 1 << 20
+
+
+class TraceConfiguration(typing.NamedTuple):
+    step: int
+    state: int
+    position: int
+    # the visited cells, from the lowest one onwards
+    lowest: int
+    cells: np.ndarray
+
+
+class TraceWriter:
+    '''Writes a trace while the simulator runs, as the trace argument of optimisations.run_deterministic.
+    '''
+
+    def __init__(self, path: str, description: TuringMachineDescription, two_way: bool = False, interval: int = DEFAULT_INTERVAL):
+        assert_property(len(description.states) <= optimisations.MAX_TRACE_STATES,
+                        "machines with more than {} states cannot be traced".format(optimisations.MAX_TRACE_STATES))
+        assert_property(interval > 0, "the checkpoint interval must be positive")
+        self.interval = interval
+        self.num_steps = 0
+        # the step and file offset of every checkpoint
+        self.checkpoints = []
+        alphabet = description.alphabet.encode()
+        states = "\n".join(description.states).encode()
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, two_way,
+                                    interval, len(alphabet), len(states)))
+        self.file.write(alphabet)
+        self.file.write(states)
+
+    def write_steps(self, steps: np.ndarray):
+        if len(steps) == 0:
+            return
+        self.file.write(CHUNK.pack(STEPS, self.num_steps, steps.nbytes))
+        self.file.write(steps)
+        self.num_steps += len(steps)
+
+    def write_checkpoint(self, state: int, position: int, tape: optimisations.Tape):
+        cells = tape.to_array()
+        self.checkpoints.append((self.num_steps, self.file.tell()))
+        self.file.write(CHUNK.pack(CHECKPOINT, self.num_steps,
+                                   CONFIGURATION.size + cells.nbytes))
+        self.file.write(CONFIGURATION.pack(state, position, tape.lowest))
+        self.file.write(cells)
+
+    def close(self):
+        index = np.array(self.checkpoints, dtype="<u8").reshape(-1, 2)
+        end = self.file.tell()
+        self.file.write(CHUNK.pack(END, self.num_steps, index.nbytes))
+        self.file.write(index)
+        self.file.write(FOOTER.pack(end))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class Trace:
+    '''A recorded trace, which reconstructs the configuration at any step from the nearest checkpoint before it.
+    '''
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            raise TuringMachineError("not a trace")
+        magic, version, two_way, self.interval, alphabet_size, states_size = HEADER.unpack_from(
+            self.buffer)
+        if magic != MAGIC or version != VERSION:
+            raise TuringMachineError("not a trace, or of another version")
+        self.two_way = bool(two_way)
+        self.alphabet = self.buffer[HEADER.size:HEADER.size +
+                                    alphabet_size].decode()
+        self.states = self.buffer[HEADER.size + alphabet_size:HEADER.size +
+                                  alphabet_size + states_size].decode().split("\n")
+        self.start = HEADER.size + alphabet_size + states_size
+        if not self.read_index():
+            self.scan()
+        self.checkpoint_steps = [step for step, _ in self.checkpoints]
+
+    def read_index(self) -> bool:
+        if len(self.buffer) < self.start + FOOTER.size:
+            return False
+        end, = FOOTER.unpack_from(self.buffer, len(self.buffer) - FOOTER.size)
+        if end < self.start or end + CHUNK.size > len(self.buffer):
+            return False
+        kind, self.num_steps, size = CHUNK.unpack_from(self.buffer, end)
+        if kind != END or end + CHUNK.size + size + FOOTER.size != len(self.buffer):
+            return False
+        index = np.frombuffer(self.buffer, dtype="<u8", count=size // 8,
+                              offset=end + CHUNK.size).reshape(-1, 2)
+        self.checkpoints = [(int(step), int(offset)) for step, offset in index]
+        return True
+
+    def scan(self):
+        '''Find the checkpoints of a trace without an END chunk, up to the last complete chunk.
+        '''
+
+        self.checkpoints = []
+        self.num_steps = 0
+        offset = self.start
+        while offset + CHUNK.size <= len(self.buffer):
+            kind, step, size = CHUNK.unpack_from(self.buffer, offset)
+            if offset + CHUNK.size + size > len(self.buffer) or kind not in (STEPS, CHECKPOINT):
+                break
+            if kind == CHECKPOINT:
+                self.checkpoints.append((step, offset))
+            else:
+                self.num_steps = step + size // 4
+            offset += CHUNK.size + size
+
+    def configuration(self, step: int) -> TraceConfiguration:
+        '''Reconstruct the configuration after the given number of steps.
+        '''
+
+        assert_property(len(self.checkpoints) > 0 and 0 <= step <= self.num_steps,
+                        "the trace has steps 0 to {}".format(self.num_steps))
+        checkpoint_step, offset = self.checkpoints[bisect.bisect_right(
+            self.checkpoint_steps, step) - 1]
+        _, _, size = CHUNK.unpack_from(self.buffer, offset)
+        state, position, lowest = CONFIGURATION.unpack_from(
+            self.buffer, offset + CHUNK.size)
+        cells = np.frombuffer(self.buffer, dtype=optimisations.SYMBOL, count=size - CONFIGURATION.size,
+                              offset=offset + CHUNK.size + CONFIGURATION.size)
+        count = step - checkpoint_step
+        if count == 0:
+            return TraceConfiguration(step, state, position, lowest, cells.copy())
+
+        # the steps since the checkpoint are at the start of the chunk that follows it
+        offset += CHUNK.size + size
+        _, _, size = CHUNK.unpack_from(self.buffer, offset)
+        steps = np.frombuffer(self.buffer, dtype=optimisations.TRACE, count=count,
+                              offset=offset + CHUNK.size)
+        # room for the head to move count cells either way
+        start = min(lowest, position - count) if self.two_way else 0
+        end = max(lowest + len(cells), position + count + 1)
+        tape = np.zeros(end - start, dtype=optimisations.SYMBOL)
+        tape[lowest - start:lowest - start + len(cells)] = cells
+        state, position, visited_lowest, visited_highest = optimisations.replay_steps(
+            steps, tape, state, position - start, self.two_way)
+        highest = max(lowest + len(cells) - 1, start + visited_highest)
+        lowest = min(lowest, start + visited_lowest)
+        return TraceConfiguration(step, state, start + position, lowest, tape[lowest - start:highest - start + 1])
+
+    def format_configuration(self, configuration: TraceConfiguration) -> str:
+        '''Show a configuration like the verbose mode of the simulator, with the head in brackets.
+        '''
+
+        cells = ["[{}]".format(self.alphabet[letter]) if i == configuration.position else self.alphabet[letter]
+                 for i, letter in enumerate(configuration.cells, start=configuration.lowest)]
+        return " {:5s} {}".format(self.states[configuration.state], " ".join(cells))
+
+    def close(self):
+        self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()